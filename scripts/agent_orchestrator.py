@@ -23,18 +23,39 @@ Usage:
   python3 scripts/agent_orchestrator.py list-prs
   python3 scripts/agent_orchestrator.py enforce-tests --pr 39
   python3 scripts/agent_orchestrator.py batch-create --file scripts/agent_tasks.json
+  python3 scripts/agent_orchestrator.py --jobs 16 status   # per-PR lookups run concurrently
+  python3 scripts/agent_orchestrator.py --backend graphql enforce-tests   # one query, not N+1
+
+Read-only REST calls are cached on disk (AC_GH_CACHE_DIR, default
+~/.cache/adaptivecards-mobile/gh) and revalidated with ETags, so a cron loop
+re-running status costs 304s rather than rate limit. --no-cache disables it.
+
+Requests go through the gh CLI unless --api-url points at another
+GitHub-compatible endpoint, such as the local stand-in in fake_github.py
+(see bench_orchestrator.py).
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
+import re
 import subprocess
 import sys
+import random
+import tempfile
 import textwrap
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
 
 # ──────────────────────────────────────────────────────────────
 # Configuration
@@ -43,6 +64,13 @@ from pathlib import Path
 UPSTREAM_REPO = "VikrantSingh01/AdaptiveCards-Mobile"
 FORK_REPO = "hggz/AdaptiveCards-Mobile-1"
 
+# Max gh calls in flight for per-PR fan-out (status, enforce-tests)
+GH_CONCURRENCY = 8
+
+# Conditional-request cache for read-only gh api calls (see ResponseCache)
+GH_CACHE_TTL = 0                      # seconds to trust a response without revalidating
+GH_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
 # Agent identifiers — how GitHub recognizes each agent
 AGENTS = {
     "copilot": {
@@ -113,56 +141,734 @@ If you modify rendering code, re-record baselines:
 # GitHub API helpers (via gh CLI)
 # ──────────────────────────────────────────────────────────────
 
-def gh(args: list[str], input_data: str | None = None) -> dict | list | str:
-    """Run a gh CLI command and return parsed JSON or raw output."""
-    cmd = ["gh"] + args
+def _parse_output(output: str) -> dict | list | str:
+    output = output.strip()
+    if not output:
+        return {}
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            input=input_data,
-            timeout=30,
-        )
-        if result.returncode != 0:
-            print(f"  ✗ gh error: {result.stderr.strip()}", file=sys.stderr)
-            return {}
-        output = result.stdout.strip()
-        if not output:
-            return {}
+        return json.loads(output)
+    except json.JSONDecodeError:
+        return output
+
+
+def _typed_field(value: str):
+    """gh api -F semantics: true/false/null and integers are sent as JSON values."""
+    if value in ("true", "false", "null"):
+        return json.loads(value)
+    if re.fullmatch(r"-?\d+", value):
+        return int(value)
+    return value
+
+
+def _parse_api_args(args: list[str], input_data: str | None = None) -> tuple[str, str, dict, str | None]:
+    """Turn a `gh api` argument list into (method, path, headers, body).
+
+    Supports the flags this script uses: -X/--method, -H/--header,
+    -f/--raw-field, -F/--field and --input -. Fields become a JSON body
+    (for graphql: {"query": ..., "variables": {...}}), and a request with a
+    body defaults to POST, as in gh.
+    """
+    if len(args) < 2 or args[0] != "api":
+        raise ValueError(f"only `gh api` calls are supported: {args}")
+    path = args[1]
+    method = None
+    headers = {}
+    fields = {}
+    body = None
+    flags = iter(args[2:])
+    for flag in flags:
+        value = next(flags)
+        if flag in ("-X", "--method"):
+            method = value
+        elif flag in ("-H", "--header"):
+            name, _, header_value = value.partition(":")
+            headers[name.strip()] = header_value.strip()
+        elif flag in ("-f", "--raw-field"):
+            key, _, field = value.partition("=")
+            fields[key] = field
+        elif flag in ("-F", "--field"):
+            key, _, field = value.partition("=")
+            fields[key] = _typed_field(field)
+        elif flag == "--input" and value == "-":
+            body = input_data
+        else:
+            raise ValueError(f"unsupported gh api flag: {flag}")
+    if fields:
+        if path == "graphql":
+            fields = {"query": fields.pop("query"), "variables": fields}
+        body = json.dumps(fields)
+    method = (method or ("POST" if body is not None else "GET")).upper()
+    return method, path, headers, body
+
+
+class GhCliTransport:
+    """Sends API requests through `gh api`, reusing the gh CLI's auth and host."""
+
+    def request(self, method: str, path: str, headers: dict,
+                body: str | None) -> tuple[int | None, dict, str]:
+        cmd = ["gh", "api", path, "--include", "--method", method]
+        for name, value in headers.items():
+            cmd += ["-H", f"{name}: {value}"]
+        if body is not None:
+            cmd += ["--input", "-"]
         try:
-            return json.loads(output)
-        except json.JSONDecodeError:
-            return output
-    except subprocess.TimeoutExpired:
-        print("  ✗ gh command timed out", file=sys.stderr)
+            result = subprocess.run(cmd, capture_output=True, text=True, input=body,
+                                    timeout=30)
+        except subprocess.TimeoutExpired:
+            print("  ✗ gh command timed out", file=sys.stderr)
+            return None, {}, ""
+
+        # Status line and headers, a blank line, then the body. gh exits
+        # non-zero for non-2xx responses (including 304), so the status line
+        # is parsed rather than the exit code.
+        parts = re.split(r"\r?\n\r?\n", result.stdout, maxsplit=1)
+        response_body = parts[1] if len(parts) > 1 else ""
+        lines = parts[0].splitlines()
+        m = re.match(r"HTTP/\S+ (\d{3})", lines[0]) if lines else None
+        if not m:
+            if result.stderr.strip():
+                print(f"  ✗ gh error: {result.stderr.strip()}", file=sys.stderr)
+            return None, {}, ""
+        response_headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                response_headers[name.strip().lower()] = value.strip()
+        return int(m.group(1)), response_headers, response_body
+
+
+class HttpTransport:
+    """Sends API requests straight to a GitHub-compatible REST/GraphQL endpoint.
+
+    Used with --api-url, e.g. to point the orchestrator at fake_github.py.
+    """
+
+    def __init__(self, base_url: str, token: str | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.base_path = urlsplit(self.base_url).path.strip("/")
+        self.token = token
+
+    def request(self, method: str, path: str, headers: dict,
+                body: str | None) -> tuple[int | None, dict, str]:
+        # Link headers carry the full path, including any base path prefix
+        if self.base_path and path.startswith(self.base_path + "/"):
+            path = path[len(self.base_path) + 1:]
+        req = urllib.request.Request(
+            f"{self.base_url}/{path}", method=method,
+            data=body.encode() if body is not None else None,
+            headers={"Accept": "application/vnd.github+json",
+                     **({"Authorization": f"Bearer {self.token}"} if self.token else {}),
+                     **({"Content-Type": "application/json"} if body is not None else {}),
+                     **headers})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                status, response_headers, data = resp.status, resp.headers, resp.read()
+        except urllib.error.HTTPError as e:
+            status, response_headers, data = e.code, e.headers, e.read()
+        except (urllib.error.URLError, TimeoutError) as e:
+            print(f"  ✗ API request failed: {e}", file=sys.stderr)
+            return None, {}, ""
+        return (status, {k.lower(): v for k, v in response_headers.items()},
+                data.decode("utf-8", errors="replace"))
+
+
+# Set from --api-url in main(); the gh CLI by default
+TRANSPORT: GhCliTransport | HttpTransport = GhCliTransport()
+
+
+def gh(args: list[str], input_data: str | None = None) -> dict | list | str:
+    """Run a `gh api` call and return parsed JSON or raw output ({} on error).
+
+    Read-only calls go through RESPONSE_CACHE when it is enabled.
+    """
+    if RESPONSE_CACHE is not None and input_data is None and _cacheable(args):
+        return RESPONSE_CACHE.fetch(args)
+
+    status, _, body = gh_response(args, input_data)
+    if status is None:
+        return {}
+    if status >= 300:
+        print(f"  ✗ gh error: HTTP {status} for {args[1]}: {body.strip()[:200]}", file=sys.stderr)
         return {}
+    return _parse_output(body)
+
+
+def gh_response(args: list[str], input_data: str | None = None) -> tuple[int | None, dict, str]:
+    """Send a `gh api` call through TRANSPORT and return (HTTP status, headers, body).
+
+    Headers are keyed in lowercase. The status is None if no HTTP response
+    was received (gh missing, timeout, connection error).
+    """
+    return TRANSPORT.request(*_parse_api_args(args, input_data))
+
+
+def _cacheable(args: list[str]) -> bool:
+    """True for `gh api <REST path>` GETs — no request body, no other method."""
+    if len(args) < 2 or args[0] != "api" or args[1] == "graphql":
+        return False
+    write_flags = {"-f", "-F", "--field", "--raw-field", "--input"}
+    for i, arg in enumerate(args):
+        if arg in write_flags:
+            return False
+        if arg in ("-X", "--method") and args[i + 1].upper() != "GET":
+            return False
+    return True
+
+
+def default_gh_cache_dir() -> Path:
+    """AC_GH_CACHE_DIR, else $XDG_CACHE_HOME (or ~/.cache)/adaptivecards-mobile/gh."""
+    if os.environ.get("AC_GH_CACHE_DIR"):
+        return Path(os.environ["AC_GH_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "adaptivecards-mobile" / "gh"
+
+
+class ResponseCache:
+    """On-disk cache of gh api responses, revalidated with ETag / Last-Modified.
+
+    Entries are keyed by the API host and the full gh argument list. A cached response younger than ttl seconds is served without a
+    request; an older one is revalidated with If-None-Match /
+    If-Modified-Since, and a 304 is answered from disk. GitHub does not count
+    304 responses to conditional requests against the primary rate limit.
+    The cache is capped at max_bytes, evicting least-recently-used entries.
+
+    An entry file's mtime is when it was last fetched or revalidated (the
+    TTL clock) and its atime when it was last used (the LRU order), so a
+    304 or a fresh hit only touches the file instead of rewriting it.
+    """
+
+    def __init__(self, cache_dir=None, ttl: float = GH_CACHE_TTL,
+                 max_bytes: int = GH_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_gh_cache_dir()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"fresh": 0, "not_modified": 0, "fetched": 0}
+        # Running estimate of the cache size, so _store() doesn't rescan the
+        # directory every time; other processes' writes are picked up on the
+        # next full scan in evict().
+        self._approx_bytes = None
+
+    def _entry(self, args: list[str]) -> Path:
+        scope = getattr(TRANSPORT, "base_url", "")
+        key = hashlib.blake2b(json.dumps([scope] + args).encode(), digest_size=16).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, path: Path) -> dict | None:
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("version") == 2 else None
+
+    def _store(self, path: Path, entry: dict):
+        """Write entry atomically, then evict old entries if over the size cap."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entry).encode()
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Same clock as _touch(), so a new entry never looks older than a touched one
+            now = time.time()
+            os.utime(tmp, (now, now))
+            os.replace(tmp, path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan()[1]
+        else:
+            self._approx_bytes += len(data) - replaced
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def response(self, args: list[str]) -> tuple[int | None, dict, str]:
+        """(status, headers, body) like gh_response, answered from disk when possible.
+
+        A response served from the cache reports status 200 with its stored
+        ETag, Last-Modified and Link headers.
+        """
+        path = self._entry(args)
+        entry = self._load(path)
+        if entry:
+            try:
+                validated = path.stat().st_mtime
+            except OSError:
+                entry = None
+
+        if entry and time.time() - validated < self.ttl:
+            self.stats["fresh"] += 1
+            self._touch(path, validated)
+            return 200, entry["headers"], entry["body"]
+
+        conditional = []
+        if entry and entry["headers"].get("etag"):
+            conditional += ["-H", f"If-None-Match: {entry['headers']['etag']}"]
+        if entry and entry["headers"].get("last-modified"):
+            conditional += ["-H", f"If-Modified-Since: {entry['headers']['last-modified']}"]
+
+        status, headers, body = gh_response(args + conditional)
+        if status == 304 and entry:
+            self.stats["not_modified"] += 1
+            self._touch(path, time.time())
+            return 200, entry["headers"], entry["body"]
+        if status != 200:
+            return status, headers, body
+
+        self.stats["fetched"] += 1
+        if headers.get("etag") or headers.get("last-modified"):
+            kept = {k: headers[k] for k in ("etag", "last-modified", "link") if k in headers}
+            self._store(path, {"version": 2, "args": args, "headers": kept, "body": body})
+        return status, headers, body
+
+    def fetch(self, args: list[str]) -> dict | list | str:
+        """Parsed response body, as gh() would return it."""
+        status, _, body = self.response(args)
+        if status is None or status >= 300:
+            if status is not None:
+                print(f"  ✗ gh error: HTTP {status} for {args[1]}", file=sys.stderr)
+            return {}
+        return _parse_output(body)
 
+    @staticmethod
+    def _touch(path: Path, validated: float):
+        """Mark an entry as used now and validated at `validated`."""
+        try:
+            os.utime(path, (time.time(), validated))
+        except OSError:
+            pass  # concurrently evicted
+
+    def _scan(self) -> tuple[list, int]:
+        """(entries as (last used, size, path), total bytes) for everything on disk."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_atime, st.st_size, path))
+            total += st.st_size
+        return entries, total
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        entries, total = self._scan()
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._approx_bytes = total
+
+
+# Set from --no-cache / --cache-ttl / --cache-max-mb in main()
+RESPONSE_CACHE: ResponseCache | None = None
+
+REST_PAGE_SIZE = 100  # GitHub's maximum per_page
+
+
+def _next_link(link_header: str) -> str | None:
+    """The rel="next" target of a Link header, as a gh api endpoint path."""
+    m = re.search(r'<([^>]+)>;\s*rel="next"', link_header or "")
+    if not m:
+        return None
+    url = urlsplit(m.group(1))
+    return url.path.lstrip("/") + (f"?{url.query}" if url.query else "")
+
+
+def gh_paginate(path: str, predicate=None, limit: int | None = None) -> Iterator[dict]:
+    """Yield items of a REST list endpoint one at a time, across every page.
+
+    Pages are requested lazily by following the Link rel="next" header, so a
+    consumer that stops iterating stops the requests. With predicate, only
+    matching items are yielded; with limit, iteration ends after that many.
+    """
+    if "per_page=" not in path:
+        path += f"{'&' if '?' in path else '?'}per_page={REST_PAGE_SIZE}"
+    yielded = 0
+    while path:
+        args = ["api", path]
+        status, headers, body = (RESPONSE_CACHE.response(args) if RESPONSE_CACHE is not None
+                                 else gh_response(args))
+        if status != 200:
+            if status is not None:
+                print(f"  ✗ gh error: HTTP {status} for {path}", file=sys.stderr)
+            return
+        page = _parse_output(body)
+        for item in page if isinstance(page, list) else []:
+            if predicate is None or predicate(item):
+                yield item
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+        path = _next_link(headers.get("link"))
+
+
+def gh_many(calls: list[list[str]], jobs: int = GH_CONCURRENCY) -> list:
+    """Run independent gh calls concurrently; results are in the same order as calls.
 
-def gh_raw(args: list[str], input_data: str | None = None) -> str:
-    """Run gh and return raw string output."""
-    cmd = ["gh"] + args
-    result = subprocess.run(cmd, capture_output=True, text=True, input=input_data, timeout=30)
-    return result.stdout.strip()
+    Each call is a gh() argument list. Calls are I/O-bound (a gh subprocess
+    or an HTTP request), so threads are enough — the wall time is roughly
+    that of the slowest call.
+    """
+    if len(calls) <= 1 or jobs <= 1:
+        return [gh(call) for call in calls]
+    with ThreadPoolExecutor(max_workers=min(jobs, len(calls))) as pool:
+        return list(pool.map(gh, calls))
 
 
 def ensure_label(repo: str, label: str, color: str = "0366d6"):
     """Create a label if it doesn't exist."""
-    existing = gh(["api", f"repos/{repo}/labels/{label}", "--jq", ".name"])
+    existing = gh(["api", f"repos/{repo}/labels/{label}"])
     if not existing:
         gh(["api", f"repos/{repo}/labels", "-X", "POST",
             "-f", f"name={label}", "-f", f"color={color}",
             "-f", f"description=Assigned to {label} agent"])
 
 
+# ──────────────────────────────────────────────────────────────
+# PR data access (REST fan-out or one batched GraphQL query)
+# ──────────────────────────────────────────────────────────────
+#
+# Both backends return PRs in the REST pull shape (number, title, state,
+# draft, mergeable, user.login, head.ref, head.sha) with three extra lists
+# for the head commit:
+#   check_runs  [{name, status, conclusion}]
+#   statuses    [{context, state}]
+#   comments    [{user, body}]   — test-related issue comments only
+# Enum values are lowercased to match REST.
+
+AGENT_AUTHORS = {"copilot-swe-agent", "copilot[bot]", "github-copilot[bot]", "claude"}
+
+TEST_COMMENT_RE = re.compile(r"test|pass|fail|snapshot", re.IGNORECASE)
+
+GRAPHQL_PAGE_SIZE = 50
+
+GRAPHQL_PR_FIELDS = """
+fragment PullFields on PullRequest {
+  number title state isDraft mergeable headRefName
+  author { __typename login }
+  commits(last: 1) {
+    nodes {
+      commit {
+        oid
+        checkSuites(first: 20) {
+          nodes { checkRuns(first: 50) { nodes { name status conclusion } } }
+        }
+        status { contexts { context state } }
+      }
+    }
+  }
+  comments(last: 50) { nodes { author { __typename login } body } }
+}
+"""
+
+GRAPHQL_OPEN_PRS = GRAPHQL_PR_FIELDS + """
+query($owner: String!, $name: String!, $pageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: OPEN, first: $pageSize, after: $cursor,
+                 orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...PullFields }
+    }
+  }
+}
+"""
+
+GRAPHQL_ONE_PR = GRAPHQL_PR_FIELDS + """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) { ...PullFields }
+  }
+}
+"""
+
+
+def _test_comments(comments: list[dict]) -> list[dict]:
+    return [{"user": c["user"], "body": (c["body"] or "")[:100]}
+            for c in comments if TEST_COMMENT_RE.search(c["body"] or "")]
+
+
+class RestBackend:
+    """One REST call per PR resource, fanned out concurrently with gh_many."""
+
+    def __init__(self, repo: str, jobs: int = GH_CONCURRENCY):
+        self.repo = repo
+        self.jobs = jobs
+
+    def _attach(self, prs: list[dict], details: bool):
+        """Fetch check runs (and, with details, statuses and comments) for each PR."""
+        calls = []
+        for pr in prs:
+            sha = pr["head"]["sha"]
+            calls.append(["api", f"repos/{self.repo}/commits/{sha}/check-runs"])
+            if details:
+                calls.append(["api", f"repos/{self.repo}/commits/{sha}/status"])
+                calls.append(["api", f"repos/{self.repo}/issues/{pr['number']}/comments"])
+        results = iter(gh_many(calls, self.jobs))
+        for pr in prs:
+            pr["check_runs"] = [{"name": c.get("name"), "status": c.get("status"),
+                                 "conclusion": c.get("conclusion")}
+                                for c in (next(results) or {}).get("check_runs", [])]
+            pr["statuses"] = []
+            pr["comments"] = []
+            if details:
+                pr["statuses"] = [{"context": st["context"], "state": st["state"]}
+                                  for st in (next(results) or {}).get("statuses", [])]
+                pr["comments"] = _test_comments([{"user": c["user"]["login"], "body": c["body"]}
+                                                 for c in next(results) or []])
+        return prs
+
+    def open_pull_requests(self, details: bool = False, authors: set[str] | None = None) -> list[dict]:
+        """Every open PR (optionally only by authors), across all pages."""
+        prs = gh_paginate(f"repos/{self.repo}/pulls?state=open",
+                          predicate=authors and (lambda pr: pr["user"]["login"] in authors))
+        return self._attach(list(prs), details)
+
+    def pull_request(self, number: int) -> dict | None:
+        pr = gh(["api", f"repos/{self.repo}/pulls/{number}"])
+        if not pr:
+            return None
+        return self._attach([pr], details=True)[0]
+
+
+class GraphQLBackend:
+    """Every PR with its head commit's checks, statuses and comments in one paginated query."""
+
+    def __init__(self, repo: str, jobs: int = GH_CONCURRENCY):
+        self.repo = repo
+        self.owner, self.name = repo.split("/", 1)
+
+    def _query(self, query: str, **variables) -> dict:
+        args = ["api", "graphql", "-f", f"query={query}"]
+        for key, value in variables.items():
+            if value is not None:
+                # -F sends numbers as numbers; -f keeps strings as strings
+                args += ["-F" if isinstance(value, int) else "-f", f"{key}={value}"]
+        response = gh(args)
+        if not isinstance(response, dict) or response.get("errors") or not response.get("data"):
+            if isinstance(response, dict) and response.get("errors"):
+                print(f"  ✗ GraphQL error: {response['errors'][0].get('message')}",
+                      file=sys.stderr)
+            return {}
+        return response["data"]
+
+    @staticmethod
+    def _login(actor: dict | None) -> str:
+        if not actor:
+            return "ghost"
+        # REST reports app accounts as "<slug>[bot]"; GraphQL drops the suffix
+        suffix = "[bot]" if actor.get("__typename") == "Bot" else ""
+        return actor["login"] + suffix
+
+    @classmethod
+    def _normalize(cls, node: dict) -> dict:
+        commits = node["commits"]["nodes"]
+        commit = commits[0]["commit"] if commits else {}
+        check_runs = [
+            {"name": run["name"], "status": run["status"].lower(),
+             "conclusion": run["conclusion"].lower() if run["conclusion"] else None}
+            for suite in (commit.get("checkSuites") or {}).get("nodes", [])
+            for run in suite["checkRuns"]["nodes"]
+        ]
+        statuses = [{"context": ctx["context"], "state": ctx["state"].lower()}
+                    for ctx in (commit.get("status") or {}).get("contexts", [])]
+        comments = [{"user": cls._login(c["author"]), "body": c["body"]}
+                    for c in node["comments"]["nodes"]]
+        return {
+            "number": node["number"],
+            "title": node["title"],
+            "state": node["state"].lower(),
+            "draft": node["isDraft"],
+            "mergeable": {"MERGEABLE": True, "CONFLICTING": False}.get(node["mergeable"]),
+            "user": {"login": cls._login(node["author"])},
+            "head": {"ref": node["headRefName"], "sha": commit.get("oid")},
+            "check_runs": check_runs,
+            "statuses": statuses,
+            "comments": _test_comments(comments),
+        }
+
+    def open_pull_requests(self, details: bool = False, authors: set[str] | None = None) -> list[dict]:
+        """Every open PR (optionally only by authors), across all pages."""
+        prs = []
+        cursor = None
+        while True:
+            data = self._query(GRAPHQL_OPEN_PRS, owner=self.owner, name=self.name,
+                               pageSize=GRAPHQL_PAGE_SIZE, cursor=cursor)
+            page = (data.get("repository") or {}).get("pullRequests")
+            if not page:
+                break
+            prs.extend(pr for pr in map(self._normalize, page["nodes"])
+                       if not authors or pr["user"]["login"] in authors)
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            cursor = page["pageInfo"]["endCursor"]
+        return prs
+
+    def pull_request(self, number: int) -> dict | None:
+        data = self._query(GRAPHQL_ONE_PR, owner=self.owner, name=self.name, number=number)
+        node = (data.get("repository") or {}).get("pullRequest")
+        return self._normalize(node) if node else None
+
+
+BACKENDS = {"rest": RestBackend, "graphql": GraphQLBackend}
+
+
+def make_backend(args) -> RestBackend | GraphQLBackend:
+    repo = args.repo or UPSTREAM_REPO
+    return BACKENDS[getattr(args, "backend", "rest")](repo, getattr(args, "jobs", GH_CONCURRENCY))
+
+
+# ──────────────────────────────────────────────────────────────
+# Batch issue creation
+# ──────────────────────────────────────────────────────────────
+#
+# GitHub's secondary rate limits cap content-creating requests at roughly
+# 80/minute and 500/hour and penalize bursts, so issue creation runs on a
+# few workers that share one token bucket. A 403/429 with Retry-After (or
+# an exhausted primary limit) pauses the whole bucket, not just one worker.
+
+BATCH_WORKERS = 4
+ISSUE_CREATE_RATE = 1.0   # issues per second (60/min, under the ~80/min limit)
+ISSUE_CREATE_BURST = 3
+CREATE_MAX_ATTEMPTS = 5
+CREATE_BACKOFF_BASE = 2.0  # seconds; doubles per attempt, plus jitter
+
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate: float, capacity: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        """Hold every caller for at least seconds (e.g. after a Retry-After)."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self.tokens = 0.0
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                if now >= self.paused_until:
+                    self.tokens = min(self.capacity,
+                                      self.tokens + (now - max(self.updated, self.paused_until)) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.paused_until - now
+            self.sleep(wait)
+
+
+class IssueJournal:
+    """Append-only JSONL record of issues created by batch-create.
+
+    Entries are keyed by repo + title, so a re-run after a crash or partial
+    failure skips tasks whose issue already exists.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.entries = {}
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash
+                self.entries[entry["key"]] = entry
+
+    @staticmethod
+    def key(repo: str, title: str) -> str:
+        return f"{repo}#{title}"
+
+    def get(self, repo: str, title: str) -> dict | None:
+        return self.entries.get(self.key(repo, title))
+
+    def record(self, repo: str, title: str, number: int, url: str, source: str = "created"):
+        entry = {"key": self.key(repo, title), "repo": repo, "title": title,
+                 "number": number, "url": url, "source": source,
+                 "at": datetime.now().isoformat(timespec="seconds")}
+        with self.lock:
+            self.entries[entry["key"]] = entry
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def ensure_labels(repo: str, labels: set[str], dry_run: bool = False) -> list[str]:
+    """Create whichever of labels don't exist yet, with one listing call; returns the created ones."""
+    existing = {l["name"].lower() for l in gh_paginate(f"repos/{repo}/labels")}
+    missing = sorted(l for l in labels if l.lower() not in existing)
+    if not dry_run:
+        for label in missing:
+            gh(["api", f"repos/{repo}/labels", "-X", "POST",
+                "-f", f"name={label}", "-f", "color=0366d6",
+                "-f", f"description=Assigned to {label} agent"])
+    return missing
+
+
+def _retry_delay(status: int | None, headers: dict, attempt: int) -> float | None:
+    """Seconds to wait before retrying a failed create, or None if it shouldn't be retried."""
+    if status in (403, 429):
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+        if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset"):
+            return max(float(headers["x-ratelimit-reset"]) - time.time(), 1.0)
+        if status == 403 and "x-ratelimit-remaining" not in headers:
+            return None  # plain permission error
+    elif status is not None and status < 500:
+        return None  # 4xx validation errors won't succeed on retry
+    return CREATE_BACKOFF_BASE * 2 ** attempt + random.uniform(0, 1)
+
+
+def create_issue_with_retry(repo: str, title: str, body: str, labels: list[str],
+                            bucket: TokenBucket) -> dict:
+    """POST one issue under the rate limiter; returns the created issue or {}."""
+    payload = json.dumps({"title": title, "body": body, "labels": labels})
+    for attempt in range(CREATE_MAX_ATTEMPTS):
+        bucket.acquire()
+        status, headers, out = gh_response(["api", f"repos/{repo}/issues", "-X", "POST",
+                                            "--input", "-"], input_data=payload)
+        if status == 201:
+            return _parse_output(out)
+        delay = _retry_delay(status, headers, attempt)
+        if delay is None or attempt == CREATE_MAX_ATTEMPTS - 1:
+            print(f"  ✗ HTTP {status} creating '{title}': {out.strip()[:200]}", file=sys.stderr)
+            return {}
+        if status in (403, 429):
+            bucket.pause(delay)  # secondary limit: every worker backs off
+        else:
+            time.sleep(delay)
+    return {}
+
+
 # ──────────────────────────────────────────────────────────────
 # Commands
 # ──────────────────────────────────────────────────────────────
 
-def cmd_create_issue(args):
-    """Create a GitHub issue with test requirements and assign to an agent."""
+def build_issue(args) -> tuple[str, list[str]]:
+    """Issue body (with test requirements and agent mention) and deduplicated labels."""
     agent = AGENTS[args.agent]
-    repo = args.repo or UPSTREAM_REPO
 
     # Build issue body
     body_parts = []
@@ -196,6 +902,14 @@ def cmd_create_issue(args):
     if args.labels:
         labels.extend(args.labels)
     labels = list(dict.fromkeys(labels))  # Deduplicate preserving order
+    return full_body, labels
+
+
+def cmd_create_issue(args):
+    """Create a GitHub issue with test requirements and assign to an agent."""
+    agent = AGENTS[args.agent]
+    repo = args.repo or UPSTREAM_REPO
+    full_body, labels = build_issue(args)
 
     print(f"Creating issue on {repo}...")
     print(f"  Title: {args.title}")
@@ -211,24 +925,17 @@ def cmd_create_issue(args):
     for label in labels:
         ensure_label(repo, label)
 
-    # Create issue via gh CLI
-    label_args = []
-    for l in labels:
-        label_args.extend(["-l", l])
-
-    result = gh_raw(
-        ["issue", "create", "-R", repo,
-         "--title", args.title,
-         "--body", full_body] + label_args
-    )
+    # Create issue via the REST API
+    payload = json.dumps({"title": args.title, "body": full_body, "labels": labels})
+    status, _, text = gh_response(["api", f"repos/{repo}/issues", "-X", "POST", "--input", "-"],
+                                  input_data=payload)
+    issue = _parse_output(text) if status == 201 else {}
 
-    if result and "github.com" in result:
-        print(f"  ✓ Created: {result}")
-        # Extract issue number
-        issue_num = result.rstrip("/").split("/")[-1]
-        print(f"  Issue #{issue_num} assigned to {agent['description']}")
+    if isinstance(issue, dict) and issue.get("html_url"):
+        print(f"  ✓ Created: {issue['html_url']}")
+        print(f"  Issue #{issue['number']} assigned to {agent['description']}")
     else:
-        print(f"  ✗ Failed to create issue: {result}")
+        print(f"  ✗ Failed to create issue: HTTP {status} {text.strip()[:200]}")
 
 
 def cmd_list_issues(args):
@@ -238,37 +945,35 @@ def cmd_list_issues(args):
     if args.agent:
         label_filter = AGENTS[args.agent]["label"]
 
-    api_url = f"repos/{repo}/issues?state=open&per_page=50"
+    api_url = f"repos/{repo}/issues?state=open"
     if label_filter:
         api_url += f"&labels={label_filter}"
 
-    issues = gh(["api", api_url])
-    if not issues:
-        print("No open issues found.")
-        return
-
-    print(f"\nOpen issues on {repo}:")
-    print(f"{'#':<6} {'Labels':<20} {'Title'}")
-    print("-" * 70)
+    # The issues endpoint also returns PRs — skip them while streaming
+    issues = gh_paginate(api_url, predicate=lambda i: not i.get("pull_request"),
+                         limit=args.limit)
+    shown = 0
     for issue in issues:
-        if issue.get("pull_request"):
-            continue  # Skip PRs
+        if not shown:
+            print(f"\nOpen issues on {repo}:")
+            print(f"{'#':<6} {'Labels':<20} {'Title'}")
+            print("-" * 70)
         labels = ", ".join(l["name"] for l in issue.get("labels", []))
         print(f"#{issue['number']:<5} {labels:<20} {issue['title'][:50]}")
+        shown += 1
+    if not shown:
+        print("No open issues found.")
 
 
 def cmd_list_prs(args):
     """List open PRs, showing which are from agents."""
     repo = args.repo or UPSTREAM_REPO
-    prs = gh(["api", f"repos/{repo}/pulls?state=open&per_page=50"])
-    if not prs:
-        print("No open PRs found.")
-        return
-
-    print(f"\nOpen PRs on {repo}:")
-    print(f"{'#':<6} {'Author':<20} {'Branch':<40} {'Title'}")
-    print("-" * 100)
-    for pr in prs:
+    shown = 0
+    for pr in gh_paginate(f"repos/{repo}/pulls?state=open", limit=args.limit):
+        if not shown:
+            print(f"\nOpen PRs on {repo}:")
+            print(f"{'#':<6} {'Author':<20} {'Branch':<40} {'Title'}")
+            print("-" * 100)
         author = pr["user"]["login"]
         # Highlight agent PRs
         marker = ""
@@ -278,15 +983,17 @@ def cmd_list_prs(args):
             marker = " 🧠"
         branch = pr["head"]["ref"][:38]
         print(f"#{pr['number']:<5} {author + marker:<20} {branch:<40} {pr['title'][:40]}")
+        shown += 1
+    if not shown:
+        print("No open PRs found.")
 
 
 def cmd_check_pr(args):
     """Check a PR's test/CI status and report."""
-    repo = args.repo or UPSTREAM_REPO
     pr_num = args.pr
 
-    # Get PR details
-    pr = gh(["api", f"repos/{repo}/pulls/{pr_num}"])
+    # PR details, check runs, commit statuses and test-related comments
+    pr = make_backend(args).pull_request(pr_num)
     if not pr:
         print(f"PR #{pr_num} not found.")
         return
@@ -297,9 +1004,7 @@ def cmd_check_pr(args):
     print(f"  State:  {pr['state']} {'(draft)' if pr.get('draft') else ''}")
     print(f"  Merge:  {'mergeable' if pr.get('mergeable') else 'not mergeable / unknown'}")
 
-    # Get check runs
-    sha = pr["head"]["sha"]
-    checks = gh(["api", f"repos/{repo}/commits/{sha}/check-runs", "--jq", ".check_runs"])
+    checks = pr["check_runs"]
     if checks:
         print(f"\n  CI Status ({len(checks)} checks):")
         for check in checks:
@@ -309,17 +1014,14 @@ def cmd_check_pr(args):
     else:
         print("\n  No CI checks found.")
 
-    # Get commit statuses
-    statuses = gh(["api", f"repos/{repo}/commits/{sha}/status", "--jq", ".statuses"])
+    statuses = pr["statuses"]
     if statuses:
         print(f"\n  Commit Statuses:")
         for s in statuses:
             icon = {"success": "✓", "failure": "✗", "pending": "⏳"}.get(s["state"], "?")
             print(f"    {icon} {s['context']}: {s['state']}")
 
-    # Check for test-related comments
-    comments = gh(["api", f"repos/{repo}/issues/{pr_num}/comments", "--jq",
-                    '[.[] | select(.body | test("test|pass|fail|snapshot"; "i")) | {user: .user.login, body: .body[:100]}]'])
+    comments = pr["comments"]
     if comments:
         print(f"\n  Test-related comments:")
         for c in comments:
@@ -393,30 +1095,21 @@ def cmd_enforce_tests(args):
     """Check agent PRs and post enforcement comments if tests aren't passing."""
     repo = args.repo or UPSTREAM_REPO
 
+    backend = make_backend(args)
+
     if args.pr:
-        prs_to_check = [args.pr]
+        pr = backend.pull_request(args.pr)
+        prs_to_check = [pr] if pr else []
     else:
-        # Find all open agent PRs
-        all_prs = gh(["api", f"repos/{repo}/pulls?state=open&per_page=50"])
-        if not all_prs:
-            print("No open PRs found.")
-            return
-        agent_authors = {"copilot-swe-agent", "copilot[bot]", "github-copilot[bot]", "claude"}
-        prs_to_check = [
-            pr["number"] for pr in all_prs
-            if pr["user"]["login"] in agent_authors
-        ]
+        # Every open agent PR across all pages, with its head commit's check runs
+        prs_to_check = backend.open_pull_requests(authors=AGENT_AUTHORS)
         if not prs_to_check:
-            print("No agent PRs found.")
+            print("No open agent PRs found.")
             return
 
-    for pr_num in prs_to_check:
-        pr = gh(["api", f"repos/{repo}/pulls/{pr_num}"])
-        if not pr:
-            continue
-
-        sha = pr["head"]["sha"]
-        checks = gh(["api", f"repos/{repo}/commits/{sha}/check-runs", "--jq", ".check_runs"])
+    for pr in prs_to_check:
+        pr_num = pr["number"]
+        checks = pr["check_runs"]
 
         has_failure = False
         has_pending = False
@@ -455,7 +1148,12 @@ def cmd_enforce_tests(args):
 
 
 def cmd_batch_create(args):
-    """Create multiple issues from a JSON task file."""
+    """Create multiple issues from a JSON task file.
+
+    Labels are resolved once for the whole batch, issues are created
+    concurrently under a shared rate limiter, and every created issue is
+    journaled so a re-run skips it.
+    """
     task_file = Path(args.file)
     if not task_file.exists():
         print(f"Task file not found: {args.file}")
@@ -464,23 +1162,91 @@ def cmd_batch_create(args):
     tasks = json.loads(task_file.read_text())
     if not isinstance(tasks, list):
         tasks = tasks.get("tasks", [])
+    repo = args.repo or UPSTREAM_REPO
 
-    print(f"Creating {len(tasks)} issues...")
-    for i, task in enumerate(tasks, 1):
-        print(f"\n[{i}/{len(tasks)}] {task['title']}")
-        # Build args namespace
+    issues = []
+    for task in tasks:
         ns = argparse.Namespace(
             agent=task.get("agent", "copilot"),
-            title=task["title"],
             body=task.get("body", ""),
             body_file=None,
             platform=task.get("platform"),
             acceptance=task.get("acceptance", []),
             labels=task.get("labels", []),
-            repo=args.repo,
-            dry_run=args.dry_run,
         )
-        cmd_create_issue(ns)
+        body, labels = build_issue(ns)
+        issues.append({"title": task["title"], "agent": ns.agent, "body": body, "labels": labels})
+
+    journal = IssueJournal(args.journal or task_file.with_name(task_file.name + ".journal.jsonl"))
+
+    # Open issues with the same title count as already created (e.g. a crash
+    # between the POST and the journal write)
+    existing = {i["title"]: journal.get(repo, i["title"])["number"]
+                for i in issues if journal.get(repo, i["title"])}
+    pending_titles = {i["title"] for i in issues} - existing.keys()
+    if pending_titles:
+        for issue in gh_paginate(f"repos/{repo}/issues?state=open",
+                                 predicate=lambda i: i["title"] in pending_titles):
+            if not args.dry_run:
+                journal.record(repo, issue["title"], issue["number"], issue["html_url"],
+                               source="existing")
+            existing[issue["title"]] = issue["number"]
+            pending_titles.discard(issue["title"])
+            if not pending_titles:
+                break
+    # A title repeated in the task file is created once
+    todo = list({i["title"]: i for i in reversed(issues) if i["title"] in pending_titles}.values())[::-1]
+
+    print(f"Creating {len(todo)} of {len(issues)} issues on {repo} "
+          f"({len(issues) - len(todo)} already exist)...")
+    for issue in issues:
+        if issue["title"] in existing:
+            print(f"  skip #{existing[issue['title']]} {issue['title']}")
+
+    missing = ensure_labels(repo, {l for i in todo for l in i["labels"]}, args.dry_run)
+    if missing:
+        print(f"  {'Would create' if args.dry_run else 'Created'} labels: {', '.join(missing)}")
+
+    if args.dry_run:
+        for issue in todo:
+            print(f"  [DRY RUN] {AGENTS[issue['agent']]['description']}: {issue['title']} "
+                  f"[{', '.join(issue['labels'])}]")
+        return
+
+    bucket = TokenBucket(args.rate, ISSUE_CREATE_BURST)
+
+    def create(issue):
+        created = create_issue_with_retry(repo, issue["title"], issue["body"],
+                                          issue["labels"], bucket)
+        if created.get("number"):
+            journal.record(repo, issue["title"], created["number"], created["html_url"])
+        return issue, created
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for issue, created in pool.map(create, todo):
+            if created.get("number"):
+                print(f"  ✓ #{created['number']} {issue['title']} → "
+                      f"{AGENTS[issue['agent']]['description']}")
+            else:
+                failed += 1
+                print(f"  ✗ Failed: {issue['title']}")
+
+    print(f"\nCreated {len(todo) - failed}, failed {failed}. Journal: {journal.path}")
+    if failed:
+        sys.exit(1)
+
+
+def _count_issues(repo: str) -> tuple[int, int, int]:
+    """(open issues, labelled copilot, labelled claude), streamed across all pages."""
+    total = copilot = claude = 0
+    for issue in gh_paginate(f"repos/{repo}/issues?state=open",
+                             predicate=lambda i: not i.get("pull_request")):
+        labels = {l["name"] for l in issue.get("labels", [])}
+        total += 1
+        copilot += "copilot" in labels
+        claude += "claude" in labels
+    return total, copilot, claude
 
 
 def cmd_status(args):
@@ -488,31 +1254,23 @@ def cmd_status(args):
     repo = args.repo or UPSTREAM_REPO
     print(f"=== Agent Orchestrator Status for {repo} ===\n")
 
-    # Issues
-    issues = gh(["api", f"repos/{repo}/issues?state=open&per_page=100"])
-    issue_count = sum(1 for i in (issues or []) if not i.get("pull_request"))
-
-    copilot_issues = sum(1 for i in (issues or [])
-                         if not i.get("pull_request")
-                         and any(l["name"] == "copilot" for l in i.get("labels", [])))
-    claude_issues = sum(1 for i in (issues or [])
-                        if not i.get("pull_request")
-                        and any(l["name"] == "claude" for l in i.get("labels", [])))
+    # Issues and PRs (with check runs) are independent listings
+    backend = make_backend(args)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        issues_future = pool.submit(_count_issues, repo)
+        prs = backend.open_pull_requests()
+        issue_count, copilot_issues, claude_issues = issues_future.result()
 
     print(f"Open Issues: {issue_count} total")
     print(f"  🤖 Copilot: {copilot_issues}")
     print(f"  🧠 Claude:  {claude_issues}")
 
     # PRs
-    prs = gh(["api", f"repos/{repo}/pulls?state=open&per_page=50"])
     if prs:
-        agent_prs = [pr for pr in prs if pr["user"]["login"] in
-                     {"copilot-swe-agent", "copilot[bot]", "github-copilot[bot]", "claude", "hggz"}]
+        agent_prs = [pr for pr in prs if pr["user"]["login"] in AGENT_AUTHORS | {"hggz"}]
         print(f"\nOpen PRs: {len(prs)} total ({len(agent_prs)} from agents/us)")
         for pr in prs:
-            sha = pr["head"]["sha"]
-            checks = gh(["api", f"repos/{repo}/commits/{sha}/check-runs",
-                         "--jq", "[.check_runs[].conclusion]"])
+            checks = [c["conclusion"] for c in pr["check_runs"]]
             if checks:
                 if all(c == "success" for c in checks if c):
                     ci = "✓ passing"
@@ -567,6 +1325,22 @@ def build_parser():
                         help=f"Target repo (default: {UPSTREAM_REPO})")
     parser.add_argument("--dry-run", action="store_true",
                         help="Preview actions without executing")
+    parser.add_argument("--backend", choices=BACKENDS.keys(), default="rest",
+                        help="PR data access: 'rest' (one call per resource) or 'graphql' "
+                             "(PRs with checks, statuses and comments in one query)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always refetch; don't read or write the gh response cache")
+    parser.add_argument("--cache-ttl", type=float, default=GH_CACHE_TTL,
+                        help="Seconds to serve a cached response without revalidating "
+                             f"(default: {GH_CACHE_TTL}, always send a conditional request)")
+    parser.add_argument("--cache-max-mb", type=int, default=GH_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="Response cache size cap before LRU eviction (default: %(default)s)")
+    parser.add_argument("--api-url", default=os.environ.get("AC_GITHUB_API_URL"),
+                        help="Send API requests to this GitHub-compatible base URL over HTTP "
+                             "instead of through the gh CLI (token from GH_TOKEN/GITHUB_TOKEN); "
+                             "e.g. a local scripts/fake_github.py server")
+    parser.add_argument("--jobs", type=int, default=GH_CONCURRENCY,
+                        help=f"Max concurrent gh calls for per-PR lookups (default: {GH_CONCURRENCY})")
 
     sub = parser.add_subparsers(dest="command", required=True)
 
@@ -585,9 +1359,11 @@ def build_parser():
     # list-issues
     li = sub.add_parser("list-issues", help="List open issues")
     li.add_argument("--agent", choices=AGENTS.keys(), help="Filter by agent")
+    li.add_argument("--limit", type=int, help="Stop after this many issues (default: all)")
 
     # list-prs
-    sub.add_parser("list-prs", help="List open PRs")
+    lp = sub.add_parser("list-prs", help="List open PRs")
+    lp.add_argument("--limit", type=int, help="Stop after this many PRs (default: all)")
 
     # check-pr
     cp = sub.add_parser("check-pr", help="Check PR test status")
@@ -607,6 +1383,11 @@ def build_parser():
     # batch-create
     bc = sub.add_parser("batch-create", help="Create issues from task file")
     bc.add_argument("--file", required=True, help="JSON task file path")
+    bc.add_argument("--journal", help="Created-issue journal (default: <file>.journal.jsonl)")
+    bc.add_argument("--rate", type=float, default=ISSUE_CREATE_RATE,
+                    help=f"Max issues created per second (default: {ISSUE_CREATE_RATE})")
+    bc.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                    help=f"Concurrent create requests (default: {BATCH_WORKERS})")
 
     # status
     sub.add_parser("status", help="Dashboard: issues, PRs, CI health")
@@ -614,9 +1395,16 @@ def build_parser():
     return parser
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    global RESPONSE_CACHE, TRANSPORT
+    TRANSPORT = (HttpTransport(args.api_url,
+                               os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN"))
+                 if args.api_url else GhCliTransport())
+    RESPONSE_CACHE = None if args.no_cache else ResponseCache(
+        ttl=args.cache_ttl, max_bytes=args.cache_max_mb * 1024 * 1024)
 
     commands = {
         "create-issue": cmd_create_issue,
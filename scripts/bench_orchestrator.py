@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Benchmark agent_orchestrator.py against a local fake GitHub
+===========================================================
+Runs orchestrator commands in process against fake_github.py servers seeded
+with synthetic repos of each size, and records per command and backend:
+API requests (by route), 304s, wall time and peak Python memory
+(tracemalloc). No network or gh CLI is needed.
+
+API request counts are deterministic, so they are the regression gate:
+with --baseline, any case that makes more requests than the baseline fails.
+Wall time and memory are reported for trend-watching only.
+
+Usage:
+  python3 scripts/bench_orchestrator.py                      # sizes 10, 100, 1000
+  python3 scripts/bench_orchestrator.py --sizes 10000 --latency 0.005
+  python3 scripts/bench_orchestrator.py --output bench.json \\
+      --baseline scripts/bench_orchestrator_baseline.json
+
+Exit codes:
+  0 - done (and no request-count regressions against --baseline)
+  1 - at least one case makes more API requests than the baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import agent_orchestrator as ao
+from fake_github import FakeGitHub, FakeGitHubServer
+
+DEFAULT_SIZES = [10, 100, 1000]
+BACKENDS = ["rest", "graphql"]
+
+# (case name, orchestrator arguments, run once per backend?); {pr} is an open PR
+CASES = [
+    ("status", ["status"], True),
+    ("list-prs", ["list-prs"], False),
+    ("list-issues", ["list-issues"], False),
+    ("enforce-tests", ["--dry-run", "enforce-tests"], True),
+    ("check-pr", ["check-pr", "--pr", "{pr}"], True),
+]
+
+
+def run_case(fake: FakeGitHub, url: str, repo: str, argv: list[str],
+             cache_dir: str | None = None) -> dict:
+    """Run one orchestrator command and measure it; output is discarded."""
+    cache_args = ["--no-cache"] if cache_dir is None else []
+    fake.reset_stats()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        ao.main(["--api-url", url, "--repo", repo] + cache_args + argv)
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = fake.stats()
+    return {
+        "api_calls": stats["requests"],
+        "not_modified": stats["not_modified"],
+        "routes": stats["routes"],
+        "wall_s": round(wall, 4),
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def run_size(size: int, latency: float, seed: int) -> list[dict]:
+    """Every case against one repo with `size` PRs and `size` issues."""
+    repo = f"bench/repo-{size}"
+    fake = FakeGitHub(latency=latency)
+    data = fake.add_repo(repo, prs=size, issues=size, seed=seed)
+    pr = str(max(data["pulls"]))
+    results = []
+    with FakeGitHubServer(fake) as server:
+        for name, argv, per_backend in CASES:
+            argv = [arg.format(pr=pr) for arg in argv]
+            for backend in BACKENDS if per_backend else ["rest"]:
+                result = run_case(fake, server.url, repo, ["--backend", backend] + argv)
+                results.append({"size": size, "case": name, "backend": backend, **result})
+                print(f"  {size:>6} {name:<17} {backend:<8} {result['api_calls']:>7} calls "
+                      f"{result['wall_s']:>8.3f}s {result['peak_mb']:>8.2f} MB", file=sys.stderr)
+
+        # A repeat status with a warm ETag cache: every REST call should be a 304
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                _env("AC_GH_CACHE_DIR", cache_dir):
+            run_case(fake, server.url, repo, ["status"], cache_dir)
+            result = run_case(fake, server.url, repo, ["status"], cache_dir)
+        results.append({"size": size, "case": "status-warm-cache", "backend": "rest", **result})
+        print(f"  {size:>6} {'status-warm-cache':<17} {'rest':<8} {result['api_calls']:>7} calls "
+              f"({result['not_modified']} x 304) {result['wall_s']:>8.3f}s", file=sys.stderr)
+    return results
+
+
+@contextlib.contextmanager
+def _env(name: str, value: str):
+    old = os.environ.get(name)
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = old
+
+
+def _key(result: dict) -> tuple:
+    return result["size"], result["case"], result["backend"]
+
+
+def compare(results: list[dict], baseline: list[dict]) -> list[str]:
+    """Cases whose API request count grew past the baseline's."""
+    expected = {_key(r): r["api_calls"] for r in baseline}
+    regressions = []
+    for result in results:
+        limit = expected.get(_key(result))
+        if limit is not None and result["api_calls"] > limit:
+            size, case, backend = _key(result)
+            regressions.append(f"{case} ({backend}, {size} PRs/issues): "
+                               f"{result['api_calls']} API calls, baseline {limit} "
+                               f"— {result['routes']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark agent_orchestrator.py request fan-out against a local fake GitHub")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="PRs (and issues) per synthetic repo (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated seconds per request, to make concurrency visible "
+                             "in wall time (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed (default: %(default)s)")
+    parser.add_argument("--output", "-o", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Fail if any case makes more API calls than in this JSON")
+    args = parser.parse_args()
+
+    print(f"  {'size':>6} {'case':<17} {'backend':<8} {'calls':>13} {'wall':>9} {'peak':>11}",
+          file=sys.stderr)
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.latency, args.seed))
+
+    report = {
+        "version": 1,
+        "python": platform.python_version(),
+        "latency": args.latency,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Results: {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline)
+        if regressions:
+            print("\n✗ API request fan-out regressed:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("\n✓ No API request regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,86 +8,574 @@
 Cross-platform snapshot parity comparison.
 
 Compares iOS and Android snapshot baselines for the same card names,
-generating an HTML report with side-by-side visual comparison.
+generating an HTML report with side-by-side visual comparison. Every matched
+pair is scored with the compare-screenshots.py engine (1 - SSIM by default)
+in parallel, and cards are listed worst parity first with a diff heat map.
 
 Usage:
     python3 scripts/compare-snapshots.py \
         --ios-dir ios/Tests/VisualTests/Snapshots/Baselines \
         --android-dir android/ac-rendering/src/test/snapshots \
-        --output parity-report.html
+        --output parity-report.html \
+        [--manifest parity-pairs.jsonl] [--threshold 0.20] [--workers 0] [--no-scores]
+
+The report is self-contained: downscaled thumbnails (WebP where Pillow
+supports it), diff heat maps and full-size copies are written to
+<output stem>_assets/ next to it, so the pair can be published as a CI
+artifact. Thumbnails are cached by content hash under the compare cache
+directory; full-size images are hard-linked when possible and only load
+when a thumbnail is clicked. --link-full-size references the local PNGs
+instead of copying them.
+
+Re-runs are incremental: <output stem>_assets/report-state.json keeps each
+image's mtime, size and content hash plus the last score per pair, so only
+pairs whose inputs changed are re-diffed and only their cards re-rendered.
+Scores from an older comparison engine (ENGINE_VERSIONS) are all redone.
+--full ignores the saved state.
+
+Exit codes:
+    0 = report written (mismatches are shown, not failed on)
+    1 = error writing the report
+
+Snapshots are indexed by (card, device, theme, a11y size) using per-platform
+filename regexes, and every variant of a card is paired with its counterpart
+of the same theme and a11y size on the other platform. Variants without one
+(e.g. iOS dark or XXXL when Android only records light) are shown unscored.
 """
 
 import argparse
+import hashlib
+import html as html_lib
+import importlib.util
+import json
 import os
+import re
+import shutil
 import sys
 from pathlib import Path
 
+# The comparison engine lives in shared/scripts/compare-screenshots.py. It is
+# registered under an importable name at module load so process-pool workers
+# (which re-import this script under spawn) can unpickle its functions.
+SHARED_SCRIPTS = Path(__file__).resolve().parent.parent / "shared" / "scripts"
+sys.path.insert(0, str(SHARED_SCRIPTS))
+_spec = importlib.util.spec_from_file_location(
+    "compare_screenshots", SHARED_SCRIPTS / "compare-screenshots.py")
+compare_screenshots = importlib.util.module_from_spec(_spec)
+sys.modules["compare_screenshots"] = compare_screenshots
+_spec.loader.exec_module(compare_screenshots)
+
+from PIL import Image, features  # noqa: E402
+
+from image_cache import default_cache_dir, file_digest  # noqa: E402
+
+THUMB_WIDTH = 240   # px; report rows show these, full size loads on click
+PAGE_SIZE = 25      # cards per report page
+
+# ──────────────────────────────────────────────────────────────
+# Naming schemes
+# ──────────────────────────────────────────────────────────────
+#
+# Each platform has an ordered list of (compiled regex, defaults). The first
+# regex that matches a file stem wins; named groups card / device / theme /
+# a11y override the defaults. Earlier patterns take precedence when two files
+# resolve to the same (card, device, theme, a11y) variant.
+
+BASE_VARIANT = {"device": "default", "theme": "light", "a11y": "default"}
+
+IOS_PATTERNS = [
+    # accordion_iPhone_15_Pro, table_iPhone_15_Pro_Dark, list_iPhone_15_Pro_A11y_XXXL,
+    # parity_parity-table_iPhone_15_Pro_iPhone_15_Pro (device repeated by the test helper)
+    # The device group is lazy: a greedy one swallows the repeat as well
+    (re.compile(r"^(?P<card>.+?)_(?P<device>iP(?:hone|ad)(?:_(?!Dark$|Light$|A11y_)[A-Za-z0-9]+)*?)"
+                r"(?=(?:_(?P=device))?(?:_(?:Dark|Light))?(?:_A11y_\w+)?$)"
+                r"(?:_(?P=device))?(?:_(?P<theme>Dark|Light))?(?:_A11y_(?P<a11y>\w+))?$"), {}),
+]
+
+ANDROID_PATTERNS = [
+    # <pkg>_AllCardsDiscoveryTests_snapshot_defaultConfig[official-samples_agenda]_official-samples_agenda
+    (re.compile(r"^[\w.]+_AllCardsDiscoveryTests_snapshot_(?P<theme>[A-Za-z]+)Config"
+                r"\[(?P<card>[^\]]+)\]_.*$"), {"device": "phone"}),
+    # <pkg>_TeamsCardSnapshotTests_teamsSnapshot_workItem_teams_teams-official-samples_work-item
+    (re.compile(r"^[\w.]+_TeamsCardSnapshotTests_teamsSnapshot_[A-Za-z0-9]+_teams_(?P<card>.+)$"),
+     {"device": "phone", "theme": "teams"}),
+    # <pkg>_CardElementSnapshotTests_snapshot_officialAgenda_official-samples_agenda
+    (re.compile(r"^[\w.]+_CardElementSnapshotTests_snapshot_[A-Za-z0-9]+_(?P<card>.+)$"),
+     {"device": "phone"}),
+]
+
+# Anything unrecognized indexes under its own stem as the base variant
+FALLBACK_PATTERN = (re.compile(r"^(?P<card>.+)$"), {})
+
+THEME_ALIASES = {"default": "light", "Dark": "dark", "Light": "light"}
 
-def find_snapshots(directory: str, extension: str = ".png") -> dict:
-    """Find all snapshot images and index by card name."""
+
+def normalize_card(card: str) -> str:
+    """Canonical card key shared by both platforms: lowercase, '/' -> '_'."""
+    return card.replace("/", "_").lower()
+
+
+def parse_snapshot_name(stem: str, patterns: list) -> tuple | None:
+    """Return (card, (device, theme, a11y), priority) for a file stem."""
+    for priority, (regex, defaults) in enumerate(patterns + [FALLBACK_PATTERN]):
+        m = regex.match(stem)
+        if not m:
+            continue
+        fields = dict(BASE_VARIANT, **defaults)
+        fields.update({k: v for k, v in m.groupdict().items() if v})
+        theme = THEME_ALIASES.get(fields["theme"], fields["theme"].lower())
+        variant = (fields["device"], theme, fields["a11y"])
+        return normalize_card(fields["card"]), variant, priority
+    return None
+
+
+def list_images(directory: str, extension: str = ".png", listings: dict | None = None,
+                previous: dict | None = None) -> list:
+    """Every file under directory ending in extension, sorted.
+
+    A directory whose mtime matches its entry in previous is not re-read
+    (adding, removing or renaming a file changes the directory's mtime).
+    Each visited directory's listing is recorded in listings.
+    """
+    listings = {} if listings is None else listings
+    previous = previous or {}
+    files = []
+    stack = [str(directory)]
+    while stack:
+        d = stack.pop()
+        try:
+            mtime_ns = os.stat(d).st_mtime_ns
+        except OSError:
+            continue
+        entry = previous.get(d)
+        if not entry or entry["mtime_ns"] != mtime_ns:
+            names, subdirs = [], []
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir():
+                        subdirs.append(e.name)
+                    elif e.name.endswith(extension):
+                        names.append(e.name)
+            entry = {"mtime_ns": mtime_ns, "files": sorted(names), "dirs": sorted(subdirs)}
+        listings[d] = entry
+        files.extend(os.path.join(d, name) for name in entry["files"])
+        stack.extend(os.path.join(d, name) for name in entry["dirs"])
+    return sorted(files)
+
+
+def find_snapshots(directory: str, patterns: list, extension: str = ".png",
+                   listings: dict | None = None, previous: dict | None = None) -> dict:
+    """Index every snapshot in one pass: {card: {(device, theme, a11y): path}}."""
     snapshots = {}
+    priorities = {}
     path = Path(directory)
     if not path.exists():
         print(f"Warning: Directory not found: {directory}")
         return snapshots
 
-    for img_path in path.rglob(f"*{extension}"):
-        # Extract card name from filename (strip config suffixes)
-        name = img_path.stem
-        # Normalize: remove device/config suffixes like _iPhone_15_Pro, _phone_light
-        for suffix in ["_iPhone_15_Pro", "_iPad", "_Dark", "_Light",
-                        "_phone", "_tablet", "_dark", "_light"]:
-            name = name.replace(suffix, "")
-        name = name.strip("_")
-
-        if name not in snapshots:
-            snapshots[name] = []
-        snapshots[name].append(str(img_path))
+    for img_path in map(Path, list_images(directory, extension, listings, previous)):
+        parsed = parse_snapshot_name(img_path.stem, patterns)
+        if parsed is None:
+            continue
+        card, variant, priority = parsed
+        if priorities.get((card, variant), len(patterns) + 1) <= priority:
+            continue
+        priorities[(card, variant)] = priority
+        snapshots.setdefault(card, {})[variant] = str(img_path)
 
     return snapshots
 
 
+def variant_label(variant: tuple) -> str:
+    device, theme, a11y = variant
+    parts = [device, theme]
+    if a11y != "default":
+        parts.append(f"a11y {a11y}")
+    return " · ".join(parts)
+
+
+def _counterparts(variant: tuple, candidates) -> list:
+    """Candidates with the same theme and a11y size, same device first.
+
+    Device names never match across platforms, so they only break ties.
+    """
+    same = [c for c in candidates if c[1:] == variant[1:]]
+    return sorted(same, key=lambda c: (c[0] != variant[0], c))
+
+
+def pair_variants(ios_variants: dict, android_variants: dict) -> list:
+    """Pair every variant of a card with its counterpart on the other platform.
+
+    Only variants with the same theme and a11y size are paired: a dark or
+    XXXL snapshot compared against a light / default one is a guaranteed
+    mismatch that says nothing about parity. Each iOS variant gets its
+    closest Android counterpart, and any Android variant left unused is
+    paired the same way in reverse. Variants with no counterpart are left
+    out (see unpaired_variants).
+    """
+    pairs = []
+    used_android = set()
+    for iv in sorted(ios_variants, key=str):
+        matches = _counterparts(iv, android_variants)
+        if matches:
+            used_android.add(matches[0])
+            pairs.append((iv, matches[0]))
+    for av in sorted(android_variants, key=str):
+        if av not in used_android:
+            matches = _counterparts(av, ios_variants)
+            if matches:
+                pairs.append((matches[0], av))
+    return pairs
+
+
+def unpaired_variants(ios_variants: dict, android_variants: dict) -> tuple:
+    """(iOS variants, Android variants) of a card that pair_variants left out."""
+    pairs = pair_variants(ios_variants, android_variants)
+    ios_paired = {iv for iv, _ in pairs}
+    android_paired = {av for _, av in pairs}
+    return (sorted((v for v in ios_variants if v not in ios_paired), key=str),
+            sorted((v for v in android_variants if v not in android_paired), key=str))
+
+
+def build_pairs(ios_snapshots: dict, android_snapshots: dict) -> list:
+    """Every cross-platform variant pair as compare-screenshots manifest entries."""
+    pairs = []
+    for card in sorted(ios_snapshots.keys() & android_snapshots.keys()):
+        for iv, av in pair_variants(ios_snapshots[card], android_snapshots[card]):
+            pairs.append({
+                "name": f"{card} [{variant_label(iv)} | {variant_label(av)}]",
+                "card": card,
+                "ios_variant": variant_label(iv),
+                "android_variant": variant_label(av),
+                "ios": ios_snapshots[card][iv],
+                "android": android_snapshots[card][av],
+            })
+    return pairs
+
+
+class ReportAssets:
+    """Thumbnails, full-size copies and diff heat maps for one report.
+
+    Everything lives under <output stem>_assets/ and is named by content
+    hash, so unchanged images are neither re-encoded nor re-copied.
+    """
+
+    def __init__(self, output_path: str, copy_full_size: bool = True, cache_dir=None):
+        output = Path(output_path).resolve()
+        self.report_dir = output.parent
+        self.root = self.report_dir / f"{output.stem}_assets"
+        self.diffs_dir = self.root / "diffs"
+        self.copy_full_size = copy_full_size
+        self.thumb_cache = Path(cache_dir or default_cache_dir()) / "thumbs"
+        self.thumb_ext = ".webp" if features.check("webp") else ".png"
+        self._digests = {}
+
+    @property
+    def state_path(self) -> Path:
+        return self.root / "report-state.json"
+
+    def seed_digests(self, images: dict):
+        """Reuse content hashes from fingerprint_images instead of re-reading files."""
+        self._digests.update({path: info["digest"] for path, info in images.items()})
+
+    def rel(self, path) -> str:
+        return os.path.relpath(Path(path).resolve(), self.report_dir)
+
+    def _digest(self, src: str) -> str:
+        if src not in self._digests:
+            self._digests[src] = file_digest(src)
+        return self._digests[src]
+
+    def thumbnail(self, src: str) -> str:
+        """Report-relative path of a THUMB_WIDTH-wide thumbnail of src."""
+        name = f"{self._digest(src)}-{THUMB_WIDTH}{self.thumb_ext}"
+        dest = self.root / "thumbs" / name
+        if not dest.exists():
+            cached = self.thumb_cache / name
+            if not cached.exists():
+                img = Image.open(src).convert("RGB")
+                height = max(1, round(img.height * THUMB_WIDTH / img.width))
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+                img.resize((THUMB_WIDTH, height), Image.LANCZOS).save(
+                    tmp, format="WEBP" if self.thumb_ext == ".webp" else "PNG")
+                os.replace(tmp, cached)
+            _place(cached, dest)
+        return self.rel(dest)
+
+    def full_size(self, src: str) -> str:
+        """Report-relative path of the full-size image (a copy unless linking)."""
+        if not self.copy_full_size:
+            return self.rel(src)
+        dest = self.root / "full" / f"{self._digest(src)}{Path(src).suffix}"
+        if not dest.exists():
+            _place(src, dest)
+        return self.rel(dest)
+
+
+def _place(src, dest):
+    """Hard-link src to dest, falling back to a copy across filesystems."""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dest)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+# ──────────────────────────────────────────────────────────────
+# Incremental state
+# ──────────────────────────────────────────────────────────────
+#
+# <output stem>_assets/report-state.json records, from the previous run:
+#   listings  directory -> {mtime_ns, files, dirs}   (skips re-reading unchanged dirs)
+#   images    path -> {mtime_ns, size, digest}       (skips re-hashing unchanged files)
+#   pairs     pair name -> {ios_digest, android_digest, result}
+#   rows      card -> {key, html}                    (skips re-rendering unchanged cards)
+#   settings  render settings the cached rows depend on
+#   engine    compare-screenshots ENGINE_VERSIONS the pair results were scored with
+
+STATE_VERSION = 1
+
+
+def load_state(path: Path) -> dict:
+    """Previous run's state, or an empty one if missing, unreadable or outdated.
+
+    Pair results scored by another engine version (content detection or
+    SSIM changed since) are dropped, so every pair is re-diffed.
+    """
+    empty = {"version": STATE_VERSION, "listings": {}, "images": {}, "pairs": {},
+             "rows": {}, "settings": {}, "engine": compare_screenshots.ENGINE_VERSIONS}
+    try:
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return empty
+    if state.get("version") != STATE_VERSION:
+        return empty
+    if state.get("engine") != compare_screenshots.ENGINE_VERSIONS:
+        state["pairs"] = {}
+    return {**empty, **state, "engine": compare_screenshots.ENGINE_VERSIONS}
+
+
+def save_state(path: Path, state: dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def fingerprint_images(paths, previous: dict) -> dict:
+    """{path: {mtime_ns, size, digest}}; files whose mtime and size are unchanged keep their digest."""
+    images = {}
+    for path in paths:
+        st = os.stat(path)
+        old = previous.get(path)
+        if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+            images[path] = old
+        else:
+            images[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                            "digest": file_digest(path)}
+    return images
+
+
+def reusable_results(pairs: list, images: dict, previous: dict, threshold: float,
+                     metric: str, crop: str = compare_screenshots.DEFAULT_CROP) -> tuple:
+    """Split pairs into (results reused from the previous run, pairs to re-diff).
+
+    A result is reused when both inputs have the same content hash, the
+    threshold, metric and crop mode are unchanged, and its diff thumbnail
+    still exists.
+    """
+    reused = {}
+    todo = []
+    for pair in pairs:
+        old = previous.get(pair["name"])
+        result = old and old["result"]
+        if (result
+                and old["ios_digest"] == images[pair["ios"]]["digest"]
+                and old["android_digest"] == images[pair["android"]]["digest"]
+                and result.get("threshold") == threshold
+                and result.get("metric") == metric
+                and result.get("crop") == crop
+                and Path(result.get("diff_image", "")).is_file()):
+            reused[pair["name"]] = dict(result, ios=pair["ios"], android=pair["android"])
+        else:
+            todo.append(pair)
+    return reused, todo
+
+
+def score_pairs(pairs: list, threshold: float, metric: str, workers: int,
+                diff_dir: str, cache=None, crop: str = compare_screenshots.DEFAULT_CROP) -> dict:
+    """Run the compare-screenshots engine over every pair: {pair name: result}."""
+    results = {}
+    done = 0
+    for record in compare_screenshots.iter_results(pairs, threshold, workers,
+                                                   metric=metric, cache=cache,
+                                                   diff_dir=diff_dir, crop=crop):
+        results[record["name"]] = record
+        done += 1
+        if done % 100 == 0 or done == len(pairs):
+            print(f"  Scored {done}/{len(pairs)} variant pairs", file=sys.stderr)
+    return results
+
+
+def _worst_diff(row: dict) -> float:
+    return max((p["result"]["diff"] for p in row["pairs"] if p.get("result")), default=-1.0)
+
+
+def _image_cell(platform: str, label: str | None, src: str | None, assets) -> str:
+    label_html = f"{platform} — {html_lib.escape(label)}" if label else platform
+    if not src:
+        content = f'<span class="missing">No {platform} snapshot</span>'
+    elif assets is None:
+        content = f'<img src="{html_lib.escape(src)}" loading="lazy" />'
+    else:
+        content = (f'<a href="{html_lib.escape(assets.full_size(src))}" target="_blank">'
+                   f'<img src="{html_lib.escape(assets.thumbnail(src))}" loading="lazy" /></a>')
+    return f"""
+        <div class="snapshot">
+            <div class="label">{label_html}</div>
+            {content}
+        </div>"""
+
+
+def render_card(row: dict, assets=None) -> str:
+    """HTML for one card: a row per variant pair, with its score if scored."""
+    css_status = row["status"]
+    if any(p.get("result") and p["result"]["status"] != "PASS" for p in row["pairs"]):
+        css_status = "mismatch"
+    out = f"""
+<div class="card status-{css_status}">
+    <div class="card-name">{html_lib.escape(row['card'])}</div>"""
+    for pair in row["pairs"]:
+        diff_content = ""
+        result = pair.get("result")
+        if result:
+            thumb = ""
+            if result.get("diff_image"):
+                src = assets.rel(result["diff_image"]) if assets else result["diff_image"]
+                thumb = f'<img src="{html_lib.escape(src)}" loading="lazy" />'
+            detail = (f'<div class="label">{html_lib.escape(result["error"])}</div>'
+                      if "error" in result else "")
+            diff_content = f"""
+        <div class="diff">
+            <div class="score">{result['diff']:.3f}</div>
+            <span class="verdict verdict-{result['status']}">{result['status']}</span>
+            <div class="label">{result.get('metric', '')} diff, threshold {result.get('threshold', '')}</div>
+            {detail}{thumb}
+        </div>"""
+
+        out += f"""
+    <div class="card-row">{diff_content}{_image_cell("iOS", pair.get("ios_variant"), pair.get("ios"), assets)}{_image_cell("Android", pair.get("android_variant"), pair.get("android"), assets)}
+    </div>"""
+    out += """
+</div>"""
+    return out
+
+
+def _row_key(row: dict, images: dict) -> str:
+    """Hash of everything render_card output depends on for a row."""
+    def digest(path):
+        return images[path]["digest"] if path in images else path
+    content = [row["card"], row["status"]]
+    for pair in row["pairs"]:
+        content.append([pair.get("ios_variant"), pair.get("android_variant"),
+                        pair.get("ios") and digest(pair["ios"]),
+                        pair.get("android") and digest(pair["android"]),
+                        pair.get("result") and {k: v for k, v in pair["result"].items()
+                                                if k not in ("ios", "android")}])
+    return hashlib.blake2b(json.dumps(content, sort_keys=True).encode(),
+                           digest_size=20).hexdigest()
+
+
 def generate_html_report(ios_snapshots: dict, android_snapshots: dict,
-                          output_path: str):
-    """Generate HTML report with side-by-side comparison."""
+                          output_path: str, results: dict | None = None,
+                          assets: ReportAssets | None = None,
+                          row_cache: dict | None = None, images: dict | None = None):
+    """Generate HTML report with side-by-side comparison of every variant pair.
+
+    With results (from score_pairs), each matched pair shows its diff score,
+    threshold status and diff thumbnail, and cards are sorted worst first.
+    With assets, rows show lazily loaded thumbnails linking to full-size
+    copies, so the report directory is portable. Cards are paginated
+    PAGE_SIZE at a time.
+
+    With row_cache ({card: {key, html}} from the previous run), cards whose
+    inputs are unchanged reuse their HTML; row_cache is updated in place to
+    hold exactly the current cards.
+    """
     all_cards = sorted(set(list(ios_snapshots.keys()) + list(android_snapshots.keys())))
+    results = results or {}
 
     ios_only = 0
     android_only = 0
     both = 0
 
+    pairs_by_card = {}
+    for pair in build_pairs(ios_snapshots, android_snapshots):
+        pair["result"] = results.get(pair["name"])
+        pairs_by_card.setdefault(pair["card"], []).append(pair)
+
     rows = []
     for card in all_cards:
-        has_ios = card in ios_snapshots
-        has_android = card in android_snapshots
+        ios_variants = ios_snapshots.get(card, {})
+        android_variants = android_snapshots.get(card, {})
 
-        if has_ios and has_android:
+        if ios_variants and android_variants:
             status = "matched"
             both += 1
-        elif has_ios:
+            pairs = pairs_by_card.get(card, [])
+            pairs.sort(key=lambda p: p["result"]["diff"] if p["result"] else -1.0, reverse=True)
+            # Variants without a same-theme / same-size counterpart: shown, not scored
+            ios_extra, android_extra = unpaired_variants(ios_variants, android_variants)
+            pairs += [{"ios_variant": variant_label(v), "ios": ios_variants[v]}
+                      for v in ios_extra]
+            pairs += [{"android_variant": variant_label(v), "android": android_variants[v]}
+                      for v in android_extra]
+        elif ios_variants:
             status = "ios-only"
             ios_only += 1
+            pairs = [{"ios_variant": variant_label(v), "ios": p}
+                     for v, p in sorted(ios_variants.items())]
         else:
             status = "android-only"
             android_only += 1
-
-        ios_img = ios_snapshots.get(card, [None])[0]
-        android_img = android_snapshots.get(card, [None])[0]
+            pairs = [{"android_variant": variant_label(v), "android": p}
+                     for v, p in sorted(android_variants.items())]
 
         rows.append({
             "card": card,
             "status": status,
-            "ios_img": ios_img,
-            "android_img": android_img
+            "pairs": pairs,
         })
 
+    # Worst parity first; unmatched cards keep alphabetical order after them
+    rows.sort(key=lambda r: (r["status"] != "matched", -_worst_diff(r)))
+
+    variant_pairs = sum(1 for r in rows for p in r["pairs"] if p.get("ios") and p.get("android"))
+    verdicts = {"PASS": 0, "MISMATCH": 0, "ERROR": 0}
+    for result in results.values():
+        verdicts[result["status"]] += 1
+    pages = max(1, -(-len(rows) // PAGE_SIZE))
+
+    rendered = len(rows)
+    previous_rows = {}
+    if row_cache is not None:
+        previous_rows = dict(row_cache)
+        row_cache.clear()
+        rendered = 0
+
+    note = ("" if assets else """
+<!-- NOTE: Image paths are local filesystem references. Open this report
+     on the same machine where snapshots were recorded. -->""")
     html = f"""<!DOCTYPE html>
 <html>
 <head>
 <title>Cross-Platform Parity Report</title>
-<meta charset="utf-8">
-<!-- NOTE: Image paths are local filesystem references. Open this report
-     on the same machine where snapshots were recorded. -->
+<meta charset="utf-8">{note}
 <style>
 body {{ font-family: -apple-system, system-ui, sans-serif; margin: 20px; background: #f5f5f5; }}
 h1 {{ color: #333; }}
@@ -96,15 +584,31 @@ h1 {{ color: #333; }}
 .stat-both {{ background: #4CAF50; }}
 .stat-ios {{ background: #007AFF; }}
 .stat-android {{ background: #3DDC84; }}
-.card-row {{ display: flex; gap: 20px; margin: 15px 0; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
-.card-name {{ font-weight: bold; min-width: 200px; padding-top: 10px; }}
+.stat-mismatch {{ background: #F44336; }}
+.stat-error {{ background: #9E9E9E; }}
+.card {{ margin: 15px 0; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
+.card-row {{ display: flex; gap: 20px; margin: 10px 0; }}
+.card-name {{ font-weight: bold; }}
 .snapshot {{ max-width: 400px; }}
 .snapshot img {{ max-width: 100%; border: 1px solid #ddd; border-radius: 4px; }}
+.diff {{ width: 180px; }}
+.diff img {{ width: 180px; border: 1px solid #ddd; border-radius: 4px; }}
+.score {{ font-size: 20px; font-weight: bold; margin-bottom: 5px; }}
+.verdict {{ display: inline-block; padding: 2px 8px; border-radius: 4px; color: white; font-size: 12px; }}
+.verdict-PASS {{ background: #4CAF50; }}
+.verdict-MISMATCH {{ background: #F44336; }}
+.verdict-ERROR {{ background: #9E9E9E; }}
 .label {{ font-size: 12px; color: #666; margin-bottom: 5px; }}
 .missing {{ color: #999; font-style: italic; padding: 20px; }}
 .status-matched {{ border-left: 4px solid #4CAF50; }}
+.status-mismatch {{ border-left: 4px solid #F44336; }}
 .status-ios-only {{ border-left: 4px solid #007AFF; }}
 .status-android-only {{ border-left: 4px solid #3DDC84; }}
+.page {{ display: none; }}
+.page.current {{ display: block; }}
+.pager {{ display: flex; flex-wrap: wrap; gap: 6px; margin: 15px 0; }}
+.pager a {{ padding: 4px 10px; border-radius: 4px; background: white; color: #333; text-decoration: none; }}
+.pager a.current {{ background: #333; color: white; }}
 </style>
 </head>
 <body>
@@ -112,29 +616,51 @@ h1 {{ color: #333; }}
 <div class="stats">
     <div class="stat stat-both">Both Platforms: {both}</div>
     <div class="stat stat-ios">iOS Only: {ios_only}</div>
-    <div class="stat stat-android">Android Only: {android_only}</div>
+    <div class="stat stat-android">Android Only: {android_only}</div>"""
+    if results:
+        html += f"""
+    <div class="stat stat-mismatch">Mismatch: {verdicts['MISMATCH']}</div>
+    <div class="stat stat-error">Error: {verdicts['ERROR']}</div>"""
+    html += f"""
 </div>
-<p>Total cards: {len(all_cards)}</p>
+<p>Total cards: {len(all_cards)} &middot; Variant pairs compared: {variant_pairs}</p>
+<div class="pager">{''.join(f'<a href="#page-{n}">{n}</a>' for n in range(1, pages + 1))}</div>
 """
 
-    for row in rows:
-        ios_content = f'<img src="{row["ios_img"]}" />' if row["ios_img"] else '<span class="missing">No iOS snapshot</span>'
-        android_content = f'<img src="{row["android_img"]}" />' if row["android_img"] else '<span class="missing">No Android snapshot</span>'
-
+    for start in range(0, len(rows), PAGE_SIZE):
+        page = start // PAGE_SIZE + 1
         html += f"""
-<div class="card-row status-{row['status']}">
-    <div class="card-name">{row['card']}</div>
-    <div class="snapshot">
-        <div class="label">iOS</div>
-        {ios_content}
-    </div>
-    <div class="snapshot">
-        <div class="label">Android</div>
-        {android_content}
-    </div>
+<div class="page" id="page-{page}">"""
+        for row in rows[start:start + PAGE_SIZE]:
+            if row_cache is None:
+                html += render_card(row, assets)
+                continue
+            key = _row_key(row, images or {})
+            cached = previous_rows.get(row["card"])
+            if cached and cached["key"] == key:
+                row_cache[row["card"]] = cached
+            else:
+                row_cache[row["card"]] = {"key": key, "html": render_card(row, assets)}
+                rendered += 1
+            html += row_cache[row["card"]]["html"]
+        html += """
 </div>"""
 
     html += """
+<script>
+// Only the current page is displayed, so lazy images on other pages never load
+function showPage() {
+  var n = (location.hash.match(/^#page-(\\d+)$/) || [0, '1'])[1];
+  document.querySelectorAll('.page').forEach(function (p) {
+    p.classList.toggle('current', p.id === 'page-' + n);
+  });
+  document.querySelectorAll('.pager a').forEach(function (a) {
+    a.classList.toggle('current', a.getAttribute('href') === '#page-' + n);
+  });
+}
+window.addEventListener('hashchange', showPage);
+showPage();
+</script>
 </body>
 </html>"""
 
@@ -146,10 +672,33 @@ h1 {{ color: #333; }}
         print(f"Error writing report to {output_path}: {e}", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Report generated: {output_path}")
-    print(f"  Both platforms: {both}")
+    print(f"Report generated: {output_path} ({rendered} of {len(rows)} cards re-rendered)")
+    print(f"  Both platforms: {both} ({variant_pairs} variant pairs)")
     print(f"  iOS only: {ios_only}")
     print(f"  Android only: {android_only}")
+    if results:
+        print(f"  Pass / mismatch / error: {verdicts['PASS']} / {verdicts['MISMATCH']} / {verdicts['ERROR']}")
+    return verdicts
+
+
+def write_manifest(pairs: list, manifest_path: str):
+    """Write variant pairs as a JSONL manifest for compare-screenshots.py --manifest.
+
+    Image paths are written absolute: compare-screenshots.py resolves relative
+    manifest paths against the manifest's directory, not the working directory.
+    """
+    try:
+        output = Path(manifest_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as f:
+            for pair in pairs:
+                entry = dict(pair, ios=str(Path(pair["ios"]).resolve()),
+                             android=str(Path(pair["android"]).resolve()))
+                f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        print(f"Error writing manifest to {manifest_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Manifest written: {manifest_path} ({len(pairs)} pairs)")
 
 
 def main():
@@ -160,10 +709,51 @@ def main():
                         help="Android baselines directory")
     parser.add_argument("--output", default="parity-report.html",
                         help="Output HTML report path")
+    parser.add_argument("--manifest",
+                        help="Also write every variant pair as JSONL for compare-screenshots.py")
+    parser.add_argument("--ios-pattern", action="append", default=[],
+                        help="Extra iOS filename regex (named groups: card, device, theme, a11y); "
+                             "tried before the built-in patterns")
+    parser.add_argument("--android-pattern", action="append", default=[],
+                        help="Extra Android filename regex, as --ios-pattern")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Max diff before a pair is flagged MISMATCH "
+                             "(default: the metric's, see compare-screenshots.py)")
+    parser.add_argument("--metric", choices=compare_screenshots.METRICS,
+                        default=compare_screenshots.DEFAULT_METRIC,
+                        help="Diff metric (default: %(default)s)")
+    parser.add_argument("--crop", choices=compare_screenshots.CROP_MODES,
+                        default=compare_screenshots.DEFAULT_CROP,
+                        help="Card-region detection or fixed chrome ratios (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="Worker processes for scoring (0 = one per CPU, default: 0)")
+    parser.add_argument("--no-scores", action="store_true",
+                        help="Only lay out the images side by side; skip scoring")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the normalized-image cache")
+    parser.add_argument("--link-full-size", action="store_true",
+                        help="Link full-size images at their local paths instead of "
+                             "copying them into the report assets")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the previous run's state and rebuild everything")
     args = parser.parse_args()
+    if args.threshold is None:
+        args.threshold = compare_screenshots.DEFAULT_THRESHOLDS[args.metric]
 
-    ios_snapshots = find_snapshots(args.ios_dir)
-    android_snapshots = find_snapshots(args.android_dir)
+    ios_patterns = [(re.compile(p), {}) for p in args.ios_pattern] + IOS_PATTERNS
+    android_patterns = [(re.compile(p), {}) for p in args.android_pattern] + ANDROID_PATTERNS
+
+    assets = ReportAssets(args.output, copy_full_size=not args.link_full_size)
+    state = load_state(assets.state_path) if not args.full else load_state(Path(os.devnull))
+    settings = {"thumb_width": THUMB_WIDTH, "copy_full_size": assets.copy_full_size}
+    if state["settings"] != settings:
+        state["rows"] = {}
+
+    listings = {}
+    ios_snapshots = find_snapshots(args.ios_dir, ios_patterns,
+                                   listings=listings, previous=state["listings"])
+    android_snapshots = find_snapshots(args.android_dir, android_patterns,
+                                       listings=listings, previous=state["listings"])
 
     if not ios_snapshots and not android_snapshots:
         print("No snapshots found on either platform.")
@@ -172,7 +762,43 @@ def main():
         print("  Android: cd android && ./gradlew :ac-rendering:recordPaparazziDebug")
         sys.exit(0)
 
-    generate_html_report(ios_snapshots, android_snapshots, args.output)
+    images = fingerprint_images(
+        sorted(p for snapshots in (ios_snapshots, android_snapshots)
+               for variants in snapshots.values() for p in variants.values()),
+        state["images"])
+    assets.seed_digests(images)
+
+    results = None
+    pair_state = {}
+    if not args.no_scores:
+        pairs = build_pairs(ios_snapshots, android_snapshots)
+        results, todo = reusable_results(pairs, images, state["pairs"],
+                                         args.threshold, args.metric, args.crop)
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        cache = None if args.no_cache else compare_screenshots.ImageCache()
+        print(f"Scoring {len(todo)} of {len(pairs)} variant pairs with {workers} worker(s) "
+              f"({len(results)} unchanged)...", file=sys.stderr)
+        results.update(score_pairs(todo, args.threshold, args.metric, workers,
+                                   str(assets.diffs_dir), cache, args.crop))
+        pair_state = {
+            pair["name"]: {"ios_digest": images[pair["ios"]]["digest"],
+                           "android_digest": images[pair["android"]]["digest"],
+                           "result": results[pair["name"]]}
+            for pair in pairs
+        }
+
+    rows = state["rows"]
+    generate_html_report(ios_snapshots, android_snapshots, args.output, results, assets,
+                         row_cache=rows, images=images)
+    try:
+        save_state(assets.state_path, {"version": STATE_VERSION, "listings": listings,
+                                       "images": images, "pairs": pair_state,
+                                       "rows": rows, "settings": settings,
+                                       "engine": compare_screenshots.ENGINE_VERSIONS})
+    except OSError as e:
+        print(f"Warning: could not save report state: {e}", file=sys.stderr)
+    if args.manifest:
+        write_manifest(build_pairs(ios_snapshots, android_snapshots), args.manifest)
 
 
 if __name__ == "__main__":
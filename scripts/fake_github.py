@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Local GitHub API stand-in for agent_orchestrator.py
+====================================================
+An in-memory fake of the slice of the GitHub REST and GraphQL APIs the
+orchestrator uses, seeded with synthetic repos (10 to 10,000+ PRs and
+issues). It counts every request, so tests and bench_orchestrator.py can
+assert on the orchestrator's request fan-out with no network.
+
+Two ways to use it:
+  - In process: FakeGitHub has the transport interface
+    (request(method, path, headers, body) -> (status, headers, body)), so it
+    can be installed directly as agent_orchestrator.TRANSPORT.
+  - Over HTTP: FakeGitHubServer (or this script) serves it on localhost for
+    agent_orchestrator.py --api-url.
+
+Served endpoints (under repos/{owner}/{name}/ unless noted):
+  pulls, pulls/{n}, issues (GET/POST), issues/{n}/comments (GET/POST),
+  commits/{sha}/check-runs, commits/{sha}/status, labels (GET/POST),
+  labels/{name}, and POST graphql (pullRequests / pullRequest queries).
+List endpoints paginate with per_page/page and Link headers; GETs carry an
+ETag and answer a matching If-None-Match with 304.
+
+Usage:
+  python3 scripts/fake_github.py --prs 1000 --issues 1000 --port 8787
+  python3 scripts/agent_orchestrator.py --api-url http://127.0.0.1:8787 \\
+      --repo fake/repo --no-cache status
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+# ──────────────────────────────────────────────────────────────
+# Synthetic data
+# ──────────────────────────────────────────────────────────────
+
+AGENT_LOGINS = ["copilot[bot]", "copilot-swe-agent", "claude"]
+HUMAN_LOGINS = ["VikrantSingh01", "hggz", "octocat"]
+LABELS = ["copilot", "claude", "bug", "enhancement", "ios", "android", "shared", "ci"]
+CHECK_NAMES = ["iOS Build & Test", "Android Build & Test", "Validate Test Cards", "Code Style Check"]
+COMMENT_BODIES = [
+    "Snapshot tests pass on iOS",
+    "Tests failing on Android — please fix",
+    "LGTM",
+    "Can you rebase on main?",
+]
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+
+
+def seed_repo(prs: int, issues: int, seed: int = 0) -> dict:
+    """Build a synthetic repo with `prs` open PRs and `issues` open issues.
+
+    PRs and issues share one number sequence, as on GitHub. About half of
+    the PRs are from agent accounts; each PR head commit gets check runs and
+    statuses, and most PRs get a few comments. The same seed always gives
+    the same repo.
+    """
+    rng = random.Random(seed)
+    repo = {"pulls": {}, "issues": {}, "check_runs": {}, "statuses": {}, "comments": {},
+            "labels": {name: {"name": name, "color": "0366d6", "description": ""}
+                       for name in LABELS}}
+    kinds = ["pr"] * prs + ["issue"] * issues
+    rng.shuffle(kinds)
+    for number, kind in enumerate(kinds, start=1):
+        login = rng.choice(AGENT_LOGINS if rng.random() < 0.5 else HUMAN_LOGINS)
+        user = {"login": login, "type": "Bot" if login.endswith("[bot]") else "User"}
+        title = f"{'Fix' if kind == 'pr' else 'Investigate'} synthetic task {number}"
+        issue = {"number": number, "title": title, "state": "open", "user": user,
+                 "labels": [{"name": name} for name in rng.sample(LABELS, rng.randint(0, 2))],
+                 "body": f"Synthetic {kind} {number}"}
+        if kind == "pr":
+            sha = hashlib.sha1(f"{seed}:{number}".encode()).hexdigest()
+            issue["pull_request"] = {"url": f"pulls/{number}"}
+            repo["pulls"][number] = {
+                "number": number, "title": title, "state": "open",
+                "draft": rng.random() < 0.2,
+                "mergeable": rng.choice([True, False, None]),
+                "user": user,
+                "head": {"ref": f"task/{number}", "sha": sha},
+            }
+            repo["check_runs"][sha] = [
+                {"name": name, "status": "completed" if conclusion else "in_progress",
+                 "conclusion": conclusion}
+                for name in CHECK_NAMES
+                for conclusion in [rng.choice(["success", "success", "failure", None])]
+            ]
+            repo["statuses"][sha] = [{"context": "ci/snapshots",
+                                      "state": rng.choice(["success", "failure", "pending"])}]
+        repo["issues"][number] = issue
+        repo["comments"][number] = [
+            {"id": number * 100 + i,
+             "user": {"login": login, "type": "Bot" if login.endswith("[bot]") else "User"},
+             "body": rng.choice(COMMENT_BODIES)}
+            for i, login in enumerate(rng.choices(AGENT_LOGINS + HUMAN_LOGINS, k=rng.randint(0, 3)))
+        ]
+    return repo
+
+
+# ──────────────────────────────────────────────────────────────
+# Fake API
+# ──────────────────────────────────────────────────────────────
+
+class FakeGitHub:
+    """In-memory GitHub API. Thread-safe; records every request it serves."""
+
+    def __init__(self, base_url: str = "https://api.github.invalid", latency: float = 0.0):
+        self.base_url = base_url
+        self.latency = latency
+        self.repos: dict[str, dict] = {}
+        self.requests: list[tuple[str, str, int]] = []
+        self._lock = threading.Lock()
+
+    def add_repo(self, full_name: str, prs: int = 10, issues: int = 10, seed: int = 0) -> dict:
+        self.repos[full_name] = seed_repo(prs, issues, seed)
+        return self.repos[full_name]
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests.clear()
+
+    def stats(self) -> dict:
+        """Request counts: total, 304s, and per route (e.g. "GET check-runs")."""
+        with self._lock:
+            requests = list(self.requests)
+        return {
+            "requests": len(requests),
+            "not_modified": sum(1 for _, _, status in requests if status == 304),
+            "routes": dict(sorted(Counter(route for _, route, _ in requests).items())),
+        }
+
+    # ── transport interface ──
+
+    def request(self, method: str, path: str, headers: dict,
+                body: str | None) -> tuple[int, dict, str]:
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlsplit(path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        payload = json.loads(body) if body else {}
+        with self._lock:
+            route, status, response_headers, data = self._dispatch(
+                method.upper(), url.path.strip("/"), query, payload)
+        text = json.dumps(data)
+        response_headers = {"content-type": "application/json; charset=utf-8", **response_headers}
+        if method.upper() == "GET" and status == 200:
+            etag = 'W/"' + hashlib.blake2b(text.encode(), digest_size=16).hexdigest() + '"'
+            response_headers["etag"] = etag
+            inm = {k.lower(): v for k, v in headers.items()}.get("if-none-match")
+            if inm == etag:
+                status, text = 304, ""
+        with self._lock:
+            self.requests.append((method.upper(), route, status))
+        return status, response_headers, text
+
+    # ── routing ──
+
+    def _dispatch(self, method: str, path: str, query: dict, payload: dict):
+        if path == "graphql" and method == "POST":
+            return ("POST graphql",) + self._graphql(payload.get("query", ""),
+                                                     payload.get("variables") or {})
+        m = re.fullmatch(r"repos/([^/]+/[^/]+)/(.+)", path)
+        repo = self.repos.get(m.group(1)) if m else None
+        if repo is None:
+            return f"{method} unknown", 404, {}, {"message": "Not Found"}
+        full_name, rest = m.group(1), m.group(2)
+        for pattern, route, handler in self._routes():
+            hit = re.fullmatch(pattern, rest)
+            if hit and route.startswith(method + " "):
+                return (route,) + handler(repo, full_name, query, payload, path, *hit.groups())
+        return f"{method} unknown", 404, {}, {"message": "Not Found"}
+
+    def _routes(self):
+        return [
+            (r"pulls", "GET pulls", self._list_pulls),
+            (r"pulls/(\d+)", "GET pull", self._get_pull),
+            (r"issues", "GET issues", self._list_issues),
+            (r"issues", "POST issues", self._create_issue),
+            (r"issues/(\d+)/comments", "GET comments", self._list_comments),
+            (r"issues/(\d+)/comments", "POST comments", self._create_comment),
+            (r"commits/([0-9a-f]+)/check-runs", "GET check-runs", self._check_runs),
+            (r"commits/([0-9a-f]+)/status", "GET status", self._status),
+            (r"labels", "GET labels", self._list_labels),
+            (r"labels", "POST labels", self._create_label),
+            (r"labels/(.+)", "GET label", self._get_label),
+        ]
+
+    def _page(self, items: list, query: dict, path: str):
+        """One page of items plus a GitHub-style Link header."""
+        per_page = min(int(query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        page = max(int(query.get("page", 1)), 1)
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        headers = {}
+        if page < last:
+            headers["link"] = ", ".join(
+                f'<{self.base_url}/{path}?{urlencode({**query, "page": target})}>; rel="{rel}"'
+                for rel, target in (("next", page + 1), ("last", last)))
+        return 200, headers, items[(page - 1) * per_page:page * per_page]
+
+    def _list_pulls(self, repo, full_name, query, payload, path):
+        pulls = [pr for pr in repo["pulls"].values() if query.get("state", "open") in ("all", pr["state"])]
+        return self._page(sorted(pulls, key=lambda pr: -pr["number"]), query, path)
+
+    def _get_pull(self, repo, full_name, query, payload, path, number):
+        pr = repo["pulls"].get(int(number))
+        return (200, {}, pr) if pr else (404, {}, {"message": "Not Found"})
+
+    def _list_issues(self, repo, full_name, query, payload, path):
+        wanted = {name for name in query.get("labels", "").split(",") if name}
+        issues = [i for i in repo["issues"].values()
+                  if query.get("state", "open") in ("all", i["state"])
+                  and wanted <= {label["name"] for label in i["labels"]}]
+        return self._page(sorted(issues, key=lambda i: -i["number"]), query, path)
+
+    def _create_issue(self, repo, full_name, query, payload, path):
+        if not payload.get("title"):
+            return 422, {}, {"message": "Validation Failed"}
+        number = max(repo["issues"], default=0) + 1
+        issue = {"number": number, "title": payload["title"], "state": "open",
+                 "body": payload.get("body", ""),
+                 "user": {"login": "orchestrator", "type": "User"},
+                 "labels": [{"name": name} for name in payload.get("labels", [])],
+                 "html_url": f"https://github.invalid/{full_name}/issues/{number}"}
+        repo["issues"][number] = issue
+        repo["comments"][number] = []
+        return 201, {}, issue
+
+    def _list_comments(self, repo, full_name, query, payload, path, number):
+        if int(number) not in repo["issues"]:
+            return 404, {}, {"message": "Not Found"}
+        return self._page(repo["comments"][int(number)], query, path)
+
+    def _create_comment(self, repo, full_name, query, payload, path, number):
+        comments = repo["comments"].get(int(number))
+        if comments is None:
+            return 404, {}, {"message": "Not Found"}
+        comment = {"id": int(number) * 100 + len(comments),
+                   "user": {"login": "orchestrator", "type": "User"},
+                   "body": payload.get("body", "")}
+        comments.append(comment)
+        return 201, {}, comment
+
+    def _check_runs(self, repo, full_name, query, payload, path, sha):
+        runs = repo["check_runs"].get(sha, [])
+        return 200, {}, {"total_count": len(runs), "check_runs": runs}
+
+    def _status(self, repo, full_name, query, payload, path, sha):
+        statuses = repo["statuses"].get(sha, [])
+        states = {s["state"] for s in statuses}
+        state = "failure" if "failure" in states else "pending" if "pending" in states or not statuses else "success"
+        return 200, {}, {"state": state, "statuses": statuses}
+
+    def _list_labels(self, repo, full_name, query, payload, path):
+        return self._page(list(repo["labels"].values()), query, path)
+
+    def _get_label(self, repo, full_name, query, payload, path, name):
+        label = repo["labels"].get(unquote(name))
+        return (200, {}, label) if label else (404, {}, {"message": "Not Found"})
+
+    def _create_label(self, repo, full_name, query, payload, path):
+        name = payload.get("name")
+        if not name or name in repo["labels"]:
+            return 422, {}, {"message": "Validation Failed"}
+        repo["labels"][name] = {"name": name, "color": payload.get("color", "ededed"),
+                                "description": payload.get("description", "")}
+        return 201, {}, repo["labels"][name]
+
+    # ── GraphQL ──
+
+    @staticmethod
+    def _actor(user: dict) -> dict:
+        if user["type"] == "Bot":
+            return {"__typename": "Bot", "login": user["login"].removesuffix("[bot]")}
+        return {"__typename": "User", "login": user["login"]}
+
+    def _pull_node(self, repo: dict, pr: dict) -> dict:
+        sha = pr["head"]["sha"]
+        runs = [{"name": r["name"], "status": r["status"].upper(),
+                 "conclusion": r["conclusion"].upper() if r["conclusion"] else None}
+                for r in repo["check_runs"].get(sha, [])]
+        contexts = [{"context": s["context"], "state": s["state"].upper()}
+                    for s in repo["statuses"].get(sha, [])]
+        return {
+            "number": pr["number"], "title": pr["title"], "state": pr["state"].upper(),
+            "isDraft": pr["draft"],
+            "mergeable": {True: "MERGEABLE", False: "CONFLICTING"}.get(pr["mergeable"], "UNKNOWN"),
+            "headRefName": pr["head"]["ref"],
+            "author": self._actor(pr["user"]),
+            "commits": {"nodes": [{"commit": {
+                "oid": sha,
+                "checkSuites": {"nodes": [{"checkRuns": {"nodes": runs}}]},
+                "status": {"contexts": contexts} if contexts else None,
+            }}]},
+            "comments": {"nodes": [{"author": self._actor(c["user"]), "body": c["body"]}
+                                   for c in repo["comments"][pr["number"]][-50:]]},
+        }
+
+    def _graphql(self, query: str, variables: dict):
+        """Answer the orchestrator's two PR queries; anything else is an error."""
+        repo = self.repos.get(f"{variables.get('owner')}/{variables.get('name')}")
+        if repo is None:
+            return 200, {}, {"data": {"repository": None},
+                             "errors": [{"message": "Could not resolve to a Repository"}]}
+        if "pullRequests(" in query:
+            pulls = sorted((pr for pr in repo["pulls"].values() if pr["state"] == "open"),
+                           key=lambda pr: -pr["number"])
+            start = int(variables.get("cursor") or 0)
+            end = start + min(int(variables.get("pageSize", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+            page = {"pageInfo": {"hasNextPage": end < len(pulls), "endCursor": str(end)},
+                    "nodes": [self._pull_node(repo, pr) for pr in pulls[start:end]]}
+            return 200, {}, {"data": {"repository": {"pullRequests": page}}}
+        if "pullRequest(" in query:
+            pr = repo["pulls"].get(int(variables.get("number", 0)))
+            node = self._pull_node(repo, pr) if pr else None
+            return 200, {}, {"data": {"repository": {"pullRequest": node}}}
+        return 200, {}, {"errors": [{"message": "Unsupported query"}]}
+
+
+# ──────────────────────────────────────────────────────────────
+# HTTP server
+# ──────────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else None
+        status, headers, text = self.server.fake.request(
+            self.command, self.path, dict(self.headers.items()), body)
+        data = text.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGitHubServer:
+    """Serve a FakeGitHub on 127.0.0.1 from a background thread.
+
+    Use as a context manager; `url` is the base URL for --api-url.
+    """
+
+    def __init__(self, fake: FakeGitHub | None = None, port: int = 0):
+        self.fake = fake or FakeGitHub()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self.fake
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.fake.base_url = self.url
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> FakeGitHubServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic GitHub API on localhost")
+    parser.add_argument("--repo", default="fake/repo", help="Repo name to seed (default: %(default)s)")
+    parser.add_argument("--prs", type=int, default=100, help="Open PRs to seed (default: %(default)s)")
+    parser.add_argument("--issues", type=int, default=100, help="Open issues to seed (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8787, help="Port on 127.0.0.1 (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds of simulated latency per request (default: %(default)s)")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(latency=args.latency)
+    fake.add_repo(args.repo, prs=args.prs, issues=args.issues, seed=args.seed)
+    with FakeGitHubServer(fake, port=args.port) as server:
+        print(f"Serving {args.repo} ({args.prs} PRs, {args.issues} issues) at {server.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print(f"\n{json.dumps(fake.stats(), indent=2)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
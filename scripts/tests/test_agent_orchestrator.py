@@ -0,0 +1,357 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+The GraphQL backend must return the same PR data as the REST fan-out while
+making one gh call per page instead of several per PR. gh is replaced by a
+local fake that serves canned REST and GraphQL responses.
+"""
+
+import argparse
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import agent_orchestrator as ao
+from fake_github import FakeGitHub, FakeGitHubServer
+
+REPO = "octo/cards"
+
+# Canned data: two open PRs, one from a bot with a failing check
+PRS = [
+    {"number": 7, "title": "Fix ColumnSet", "state": "open", "draft": False, "mergeable": True,
+     "user": {"login": "copilot[bot]"}, "head": {"ref": "copilot/fix", "sha": "aaa"}},
+    {"number": 9, "title": "Add Table", "state": "open", "draft": True, "mergeable": None,
+     "user": {"login": "claude"}, "head": {"ref": "claude/table", "sha": "bbb"}},
+]
+CHECK_RUNS = {
+    "aaa": [{"name": "ios", "status": "completed", "conclusion": "failure"},
+            {"name": "android", "status": "in_progress", "conclusion": None}],
+    "bbb": [{"name": "ios", "status": "completed", "conclusion": "success"}],
+}
+STATUSES = {
+    "aaa": [{"context": "lint", "state": "success"}],
+    "bbb": [],
+}
+COMMENTS = {
+    7: [{"user": "claude", "body": "Snapshot tests FAIL on iPad"},
+        {"user": "octocat", "body": "Looks good"}],
+    9: [{"user": "octocat", "body": None}],
+}
+
+
+def graphql_node(pr):
+    """The canned REST PR as GraphQL would return it."""
+    bot = pr["user"]["login"].endswith("[bot]")
+    return {
+        "number": pr["number"],
+        "title": pr["title"],
+        "state": pr["state"].upper(),
+        "isDraft": pr["draft"],
+        "mergeable": {True: "MERGEABLE", False: "CONFLICTING", None: "UNKNOWN"}[pr["mergeable"]],
+        "headRefName": pr["head"]["ref"],
+        "author": {"__typename": "Bot" if bot else "User",
+                   "login": pr["user"]["login"].removesuffix("[bot]")},
+        "commits": {"nodes": [{"commit": {
+            "oid": pr["head"]["sha"],
+            "checkSuites": {"nodes": [{"checkRuns": {"nodes": [
+                {"name": c["name"], "status": c["status"].upper(),
+                 "conclusion": c["conclusion"] and c["conclusion"].upper()}
+                for c in CHECK_RUNS[pr["head"]["sha"]]
+            ]}}]},
+            "status": {"contexts": [{"context": s["context"], "state": s["state"].upper()}
+                                    for s in STATUSES[pr["head"]["sha"]]]},
+        }}]},
+        "comments": {"nodes": [{"author": {"__typename": "User", "login": c["user"]},
+                                "body": c["body"]} for c in COMMENTS[pr["number"]]]},
+    }
+
+
+class FakeGh:
+    """Stands in for ao.gh and ao.gh_response: answers REST paths and GraphQL
+    queries from the canned data. REST list endpoints serve one item per page
+    with a Link header, to exercise pagination."""
+
+    def __init__(self):
+        self.calls = []
+        self.issues = []
+        self.labels = ["bug", "claude"]
+        self.throttle = 0  # next N issue POSTs get a secondary-rate-limit 403
+
+    def __call__(self, args, input_data=None):
+        self.calls.append(args)
+        if args[:2] == ["api", "graphql"]:
+            return self.graphql(dict(a.split("=", 1) for a in args[3::2]))
+        path = args[1]
+        if path == f"repos/{REPO}/pulls?state=open&per_page=50":
+            return PRS
+        if path.startswith(f"repos/{REPO}/pulls/"):
+            number = int(path.rsplit("/", 1)[1])
+            return next((pr for pr in PRS if pr["number"] == number), {})
+        if path.endswith("/check-runs"):
+            return {"check_runs": CHECK_RUNS[path.split("/")[-2]]}
+        if path.endswith("/status"):
+            return {"statuses": STATUSES[path.split("/")[-2]]}
+        if path.endswith("/comments"):
+            return [{"user": {"login": c["user"]}, "body": c["body"]}
+                    for c in COMMENTS[int(path.split("/")[-2])]]
+        if path.startswith(f"repos/{REPO}/issues?"):
+            return []
+        if path == f"repos/{REPO}/labels" and "POST" in args:
+            self.labels.append(args[args.index("-f") + 1].split("=", 1)[1])
+            return {"name": self.labels[-1]}
+        raise AssertionError(f"unexpected gh call: {args}")
+
+    def response(self, args, input_data=None):
+        self.calls.append(args)
+        url = urlsplit(args[1])
+        query = parse_qs(url.query)
+        if "POST" in args and url.path == f"repos/{REPO}/issues":
+            if self.throttle:
+                self.throttle -= 1
+                return 403, {"retry-after": "0"}, '{"message": "secondary rate limit"}'
+            issue = dict(json.loads(input_data), number=len(self.issues) + 100)
+            issue["html_url"] = f"https://github.com/{REPO}/issues/{issue['number']}"
+            self.issues.append(issue)
+            return 201, {}, json.dumps(issue)
+        if url.path == f"repos/{REPO}/pulls":
+            items = PRS
+        elif url.path == f"repos/{REPO}/issues":
+            items = self.issues
+        elif url.path == f"repos/{REPO}/labels":
+            items = [{"name": name} for name in self.labels]
+        else:
+            raise AssertionError(f"unexpected gh api --include call: {args}")
+        page = int(query.get("page", ["1"])[0])
+        headers = {}
+        if page < len(items):
+            headers["link"] = (f'<https://api.github.com/{url.path}?state=open&per_page=1'
+                               f'&page={page + 1}>; rel="next"')
+        return 200, headers, json.dumps(items[page - 1:page])
+
+    def graphql(self, variables):
+        if "number" in variables:
+            pr = next((pr for pr in PRS if pr["number"] == int(variables["number"])), None)
+            return {"data": {"repository": {"pullRequest": pr and graphql_node(pr)}}}
+        # One PR per page, to exercise pagination
+        index = int(variables.get("cursor", "0"))
+        return {"data": {"repository": {"pullRequests": {
+            "pageInfo": {"hasNextPage": index + 1 < len(PRS), "endCursor": str(index + 1)},
+            "nodes": [graphql_node(PRS[index])],
+        }}}}
+
+
+@pytest.fixture
+def fake_gh(monkeypatch):
+    fake = FakeGh()
+    monkeypatch.setattr(ao, "gh", fake)
+    monkeypatch.setattr(ao, "gh_response", fake.response)
+    return fake
+
+
+def backend_args(backend, **kwargs):
+    return argparse.Namespace(repo=REPO, backend=backend, jobs=4, dry_run=True, **kwargs)
+
+
+def test_graphql_pull_request_matches_rest(fake_gh):
+    rest = ao.RestBackend(REPO).pull_request(7)
+    rest_calls = len(fake_gh.calls)
+    graphql = ao.GraphQLBackend(REPO).pull_request(7)
+
+    assert graphql == {key: rest[key] for key in graphql}
+    assert graphql["user"]["login"] == "copilot[bot]"
+    assert graphql["comments"] == [{"user": "claude", "body": "Snapshot tests FAIL on iPad"}]
+    assert rest_calls == 4
+    assert len(fake_gh.calls) - rest_calls == 1
+
+
+def test_graphql_open_pull_requests_paginates(fake_gh):
+    prs = ao.GraphQLBackend(REPO).open_pull_requests()
+
+    assert [pr["number"] for pr in prs] == [7, 9]
+    assert prs[1]["draft"] is True and prs[1]["mergeable"] is None
+    assert [c["conclusion"] for c in prs[0]["check_runs"]] == ["failure", None]
+    # One call per page, none per PR
+    assert len(fake_gh.calls) == len(PRS)
+
+
+def test_paginate_follows_link_headers_lazily(fake_gh):
+    assert [pr["number"] for pr in ao.gh_paginate(f"repos/{REPO}/pulls?state=open")] == [7, 9]
+    assert len(fake_gh.calls) == 2
+
+    fake_gh.calls.clear()
+    first = ao.gh_paginate(f"repos/{REPO}/pulls?state=open",
+                           predicate=lambda pr: pr["user"]["login"] == "copilot[bot]", limit=1)
+    assert [pr["number"] for pr in first] == [7]
+    # The filter was satisfied on page one, so page two is never requested
+    assert len(fake_gh.calls) == 1
+
+
+def test_missing_pull_request(fake_gh):
+    assert ao.GraphQLBackend(REPO).pull_request(404) is None
+    assert ao.RestBackend(REPO).pull_request(404) is None
+
+
+@pytest.mark.parametrize("backend", ["rest", "graphql"])
+def test_enforce_tests_output_is_backend_independent(fake_gh, capsys, backend):
+    ao.cmd_enforce_tests(backend_args(backend, pr=None))
+    out = capsys.readouterr().out
+
+    assert "PR #7 by @copilot[bot]: ✗ FAILING" in out
+    assert "PR #9 by @claude: ✓ All checks passing" in out
+    # Dry run: nothing is posted
+    assert not any("-X" in call for call in fake_gh.calls)
+
+
+@pytest.mark.parametrize("backend", ["rest", "graphql"])
+def test_check_pr_output_is_backend_independent(fake_gh, capsys, backend):
+    ao.cmd_check_pr(backend_args(backend, pr=7))
+    out = capsys.readouterr().out
+
+    assert "✗ ios: failure" in out
+    assert "⏳ android: in_progress" in out
+    assert "✓ lint: success" in out
+    assert "@claude: Snapshot tests FAIL on iPad..." in out
+    assert "Looks good" not in out
+
+
+def test_response_cache_revalidates_with_etag(monkeypatch, tmp_path):
+    requests = []
+
+    def fake_response(args):
+        requests.append(args)
+        if 'If-None-Match: "v1"' in args:
+            return 304, {"etag": '"v1"'}, ""
+        return 200, {"etag": '"v1"'}, '[{"number": 7}]'
+
+    monkeypatch.setattr(ao, "gh_response", fake_response)
+    cache = ao.ResponseCache(tmp_path)
+    monkeypatch.setattr(ao, "RESPONSE_CACHE", cache)
+    call = ["api", f"repos/{REPO}/pulls?state=open&per_page=50"]
+
+    assert ao.gh(call) == [{"number": 7}]
+    assert ao.gh(call) == [{"number": 7}]
+    assert requests[1] == call + ["-H", 'If-None-Match: "v1"']
+    assert cache.stats == {"fresh": 0, "not_modified": 1, "fetched": 1}
+
+    # Within the TTL no request is made at all
+    cache.ttl = 60
+    assert ao.gh(call) == [{"number": 7}]
+    assert len(requests) == 2
+
+
+def test_response_cache_does_not_rescan_per_request(monkeypatch, tmp_path):
+    def fake_response(args):
+        if any(a.startswith("If-None-Match") for a in args):
+            return 304, {}, ""
+        return 200, {"etag": '"v1"'}, '{"number": 7, "pad": "%s"}' % ("x" * 100)
+
+    monkeypatch.setattr(ao, "gh_response", fake_response)
+    scans = []
+    real_scan = ao.ResponseCache._scan
+    monkeypatch.setattr(ao.ResponseCache, "_scan",
+                        lambda self: scans.append(1) or real_scan(self))
+    calls = [["api", f"repos/{REPO}/pulls/{n}"] for n in range(50)]
+
+    cold = ao.ResponseCache(tmp_path)
+    for call in calls:
+        cold.fetch(call)
+    assert len(scans) == 1  # sized once, then tracked incrementally
+
+    # A warm run answers every call with a 304 and rewrites nothing
+    scans.clear()
+    inodes = {p: p.stat().st_ino for p in tmp_path.glob("*.json")}
+    warm = ao.ResponseCache(tmp_path)
+    for call in calls:
+        assert warm.fetch(call)["number"] == 7
+    assert warm.stats["not_modified"] == 50
+    assert scans == []
+    assert {p: p.stat().st_ino for p in tmp_path.glob("*.json")} == inodes
+
+    # Over the cap, least-recently-used entries go
+    small = ao.ResponseCache(tmp_path, max_bytes=10 * 150)
+    small.fetch(["api", f"repos/{REPO}/pulls/new"])
+    assert len(list(tmp_path.glob("*.json"))) <= 10
+    assert small._entry(["api", f"repos/{REPO}/pulls/new"]).exists()
+
+
+def test_response_cache_skips_writes():
+    assert ao._cacheable(["api", f"repos/{REPO}/labels/claude", "--jq", ".name"])
+    assert not ao._cacheable(["api", f"repos/{REPO}/labels", "-X", "POST", "-f", "name=x"])
+    assert not ao._cacheable(["api", "graphql", "-f", "query={}"])
+    assert not ao._cacheable(["issue", "create", "-R", REPO])
+
+
+def test_batch_create_is_idempotent_and_retries(fake_gh, tmp_path, capsys):
+    tasks = tmp_path / "tasks.json"
+    tasks.write_text(json.dumps({"tasks": [
+        {"agent": "claude", "title": "Fix ColumnSet", "platform": "ios", "labels": ["bug"]},
+        {"agent": "copilot", "title": "Add CI flags", "platform": "ci", "labels": ["bug"]},
+        {"agent": "copilot", "title": "Add CI flags", "platform": "ci"},
+    ]}))
+    args = argparse.Namespace(repo=REPO, file=str(tasks), journal=None, rate=1000.0,
+                              workers=2, dry_run=False)
+    fake_gh.throttle = 1
+
+    ao.cmd_batch_create(args)
+
+    assert sorted(i["title"] for i in fake_gh.issues) == ["Add CI flags", "Fix ColumnSet"]
+    # bug and claude already existed; ios, copilot and ci were created once each
+    assert sorted(fake_gh.labels) == ["bug", "ci", "claude", "copilot", "ios"]
+    journal = (tmp_path / "tasks.json.journal.jsonl").read_text().splitlines()
+    assert len(journal) == 2
+
+    # Re-run: everything is in the journal, nothing is posted
+    fake_gh.calls.clear()
+    ao.cmd_batch_create(args)
+    assert len(fake_gh.issues) == 2
+    assert not any("POST" in call for call in fake_gh.calls)
+    assert "Creating 0 of 3 issues" in capsys.readouterr().out
+
+
+def test_token_bucket_spaces_requests():
+    now = [0.0]
+    bucket = ao.TokenBucket(rate=2.0, capacity=1, clock=lambda: now[0],
+                            sleep=lambda s: now.__setitem__(0, now[0] + s))
+    for _ in range(5):
+        bucket.acquire()
+    # One burst token, then one every 0.5s
+    assert now[0] == pytest.approx(2.0)
+
+    bucket.pause(10)
+    bucket.acquire()
+    assert now[0] == pytest.approx(12.5)
+
+
+def test_parse_api_args():
+    assert ao._parse_api_args(["api", f"repos/{REPO}/pulls/7"]) == (
+        "GET", f"repos/{REPO}/pulls/7", {}, None)
+    method, path, headers, body = ao._parse_api_args(
+        ["api", f"repos/{REPO}/labels", "-X", "POST", "-f", "name=x", "-H", "If-None-Match: e"])
+    assert (method, headers, json.loads(body)) == ("POST", {"If-None-Match": "e"}, {"name": "x"})
+    _, path, _, body = ao._parse_api_args(
+        ["api", "graphql", "-f", "query=q", "-F", "number=7", "-f", "cursor=12"])
+    assert path == "graphql"
+    assert json.loads(body) == {"query": "q", "variables": {"number": 7, "cursor": "12"}}
+
+
+@pytest.mark.parametrize("backend", ["rest", "graphql"])
+def test_status_over_http_against_fake_github(backend, capsys):
+    fake = FakeGitHub()
+    fake.add_repo(REPO, prs=120, issues=30)
+    with FakeGitHubServer(fake) as server:
+        ao.main(["--api-url", server.url, "--repo", REPO, "--no-cache",
+                 "--backend", backend, "status"])
+
+    out = capsys.readouterr().out
+    assert "Open Issues: 30 total" in out
+    assert "Open PRs: 120 total" in out
+    routes = fake.stats()["routes"]
+    # 150 issues + PRs at 100 per page; PRs at 100 per REST page or 50 per GraphQL page
+    assert routes["GET issues"] == 2
+    if backend == "rest":
+        assert routes == {"GET issues": 2, "GET pulls": 2, "GET check-runs": 120}
+    else:
+        assert routes == {"GET issues": 2, "POST graphql": 3}
@@ -0,0 +1,230 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+compare-snapshots.py: snapshot names index into (card, variant), variants
+pair with their same-theme / same-text-size counterpart, and the manifest it
+writes loads back in compare-screenshots.py from any directory.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PIL.Image")
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+IOS_BASELINES = SCRIPTS.parent / "ios/Tests/VisualTests/Snapshots/Baselines"
+
+
+def _load():
+    module = sys.modules.get("compare_snapshots")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("compare_snapshots",
+                                                      SCRIPTS / "compare-snapshots.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["compare_snapshots"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+cs = _load()
+
+
+def test_manifest_round_trips_from_another_directory(tmp_path, monkeypatch):
+    images = tmp_path / "snaps"
+    images.mkdir()
+    (images / "a_ios.png").write_bytes(b"x")
+    (images / "a_android.png").write_bytes(b"x")
+    monkeypatch.chdir(tmp_path)
+    pairs = [{"name": "a [light | light]", "card": "a",
+              "ios": "snaps/a_ios.png", "android": "snaps/a_android.png"}]
+
+    manifest = tmp_path / "out" / "nested" / "pairs.jsonl"
+    cs.write_manifest(pairs, str(manifest))
+
+    monkeypatch.chdir(manifest.parent)
+    loaded = cs.compare_screenshots.load_manifest(manifest)
+    assert [p["name"] for p in loaded] == ["a [light | light]"]
+    assert Path(loaded[0]["ios"]) == images / "a_ios.png"
+    assert Path(loaded[0]["android"]).is_file()
+
+
+def test_snapshot_names_index_by_variant():
+    assert cs.parse_snapshot_name("accordion_iPhone_15_Pro_Dark", cs.IOS_PATTERNS)[:2] == \
+        ("accordion", ("iPhone_15_Pro", "dark", "default"))
+    assert cs.parse_snapshot_name("list_iPhone_15_Pro_A11y_XXXL", cs.IOS_PATTERNS)[:2] == \
+        ("list", ("iPhone_15_Pro", "light", "XXXL"))
+    # Committed parity baselines repeat the device
+    stem = "parity_parity-table_iPhone_15_Pro_iPhone_15_Pro"
+    assert (IOS_BASELINES / f"{stem}.png").exists()
+    assert cs.parse_snapshot_name(stem, cs.IOS_PATTERNS)[:2] == \
+        ("parity_parity-table", ("iPhone_15_Pro", "light", "default"))
+    assert cs.parse_snapshot_name("table_iPad_Portrait_iPad_Portrait_Dark", cs.IOS_PATTERNS)[:2] == \
+        ("table", ("iPad_Portrait", "dark", "default"))
+    stem = ("com.microsoft.adaptivecards.rendering.snapshots_AllCardsDiscoveryTests_"
+            "snapshot_defaultConfig[official-samples/agenda]_official-samples_agenda")
+    assert cs.parse_snapshot_name(stem, cs.ANDROID_PATTERNS)[:2] == \
+        ("official-samples_agenda", ("phone", "light", "default"))
+
+
+def test_only_same_theme_and_size_variants_pair():
+    ios = {("iPhone_15_Pro", "light", "default"): "l.png",
+           ("iPad_Portrait", "light", "default"): "ipad.png",
+           ("iPhone_15_Pro", "dark", "default"): "d.png",
+           ("iPhone_15_Pro", "light", "XXXL"): "xxxl.png"}
+    android = {("phone", "light", "default"): "al.png",
+               ("phone", "teams", "default"): "at.png"}
+
+    pairs = cs.pair_variants(ios, android)
+    assert sorted(pairs) == [(("iPad_Portrait", "light", "default"), ("phone", "light", "default")),
+                             (("iPhone_15_Pro", "light", "default"), ("phone", "light", "default"))]
+    ios_extra, android_extra = cs.unpaired_variants(ios, android)
+    assert ios_extra == [("iPhone_15_Pro", "dark", "default"), ("iPhone_15_Pro", "light", "XXXL")]
+    assert android_extra == [("phone", "teams", "default")]
+
+    # Once Android records a dark variant, the dark snapshots pair up
+    android[("phone", "dark", "default")] = "ad.png"
+    assert (("iPhone_15_Pro", "dark", "default"), ("phone", "dark", "default")) in \
+        cs.pair_variants(ios, android)
+
+
+def _snapshots():
+    light = ("iPhone_15_Pro", "light", "default")
+    ios = {card: {light: f"{card}_ios.png", ("iPhone_15_Pro", "dark", "default"): f"{card}_dark.png"}
+           for card in ("alpha", "beta", "gamma")}
+    ios["ios-only"] = {light: "ios-only.png"}
+    android = {card: {("phone", "light", "default"): f"{card}_android.png"}
+               for card in ("alpha", "beta", "gamma")}
+    return ios, android
+
+
+def _result(diff, threshold=0.15):
+    return {"diff": diff, "status": "PASS" if diff <= threshold else "MISMATCH",
+            "threshold": threshold, "metric": "ssim"}
+
+
+def test_report_lists_cards_worst_first(tmp_path):
+    ios, android = _snapshots()
+    pairs = cs.build_pairs(ios, android)
+    assert len(pairs) == 3  # dark iOS variants have no Android counterpart
+    diffs = {"alpha": 0.05, "beta": 0.4, "gamma": 0.2}
+    results = {p["name"]: _result(diffs[p["card"]]) for p in pairs}
+
+    output = tmp_path / "report.html"
+    verdicts = cs.generate_html_report(ios, android, str(output), results)
+    assert verdicts == {"PASS": 1, "MISMATCH": 2, "ERROR": 0}
+
+    html = output.read_text()
+    order = [html.index(f'<div class="card-name">{card}</div>')
+             for card in ("beta", "gamma", "alpha", "ios-only")]
+    assert order == sorted(order)
+    # Unpaired dark variants are shown, but never scored
+    assert "alpha_dark.png" in html
+    assert "Variant pairs compared: 3" in html
+
+
+def test_report_assets_are_self_contained(tmp_path, monkeypatch):
+    from PIL import Image
+
+    src = tmp_path / "snaps" / "card.png"
+    src.parent.mkdir()
+    Image.new("RGB", (960, 1600), (200, 30, 30)).save(src)
+    assets = cs.ReportAssets(str(tmp_path / "out" / "report.html"), cache_dir=tmp_path / "cache")
+
+    thumb = assets.thumbnail(str(src))
+    assert not Path(thumb).is_absolute() and thumb.startswith("report_assets/thumbs/")
+    with Image.open(tmp_path / "out" / thumb) as img:
+        assert img.size == (cs.THUMB_WIDTH, 400)
+    full = tmp_path / "out" / assets.full_size(str(src))
+    assert full.read_bytes() == src.read_bytes()
+
+    # A second report reuses the cached thumbnail instead of re-encoding it
+    monkeypatch.setattr(cs.Image, "open", lambda *a, **k: pytest.fail("re-encoded"))
+    other = cs.ReportAssets(str(tmp_path / "other" / "report.html"), cache_dir=tmp_path / "cache")
+    assert other.thumbnail(str(src)) == thumb
+
+
+def test_report_is_paginated(tmp_path, monkeypatch):
+    monkeypatch.setattr(cs, "PAGE_SIZE", 2)
+    ios = {f"card{i}": {("iPhone_15_Pro", "light", "default"): f"{i}.png"} for i in range(5)}
+    output = tmp_path / "report.html"
+    cs.generate_html_report(ios, {}, str(output))
+
+    html = output.read_text()
+    assert [f'id="page-{n}"' in html for n in (1, 2, 3, 4)] == [True, True, True, False]
+    assert html.index("card1") < html.index('id="page-2"') < html.index("card2")
+
+
+def test_unchanged_pairs_reuse_their_previous_result(tmp_path):
+    diff_image = tmp_path / "diff.png"
+    diff_image.write_bytes(b"png")
+    pairs = [{"name": "a", "ios": "a_i", "android": "a_a"},
+             {"name": "b", "ios": "b_i", "android": "b_a"}]
+    images = {p: {"digest": p} for p in ("a_i", "a_a", "b_i", "b_a")}
+    result = dict(_result(0.1), crop="auto", diff_image=str(diff_image))
+    previous = {name: {"ios_digest": f"{name}_i", "android_digest": f"{name}_a", "result": result}
+                for name in ("a", "b")}
+
+    reused, todo = cs.reusable_results(pairs, images, previous, 0.15, "ssim", "auto")
+    assert sorted(reused) == ["a", "b"] and todo == []
+
+    images["b_a"] = {"digest": "changed"}
+    reused, todo = cs.reusable_results(pairs, images, previous, 0.15, "ssim", "auto")
+    assert sorted(reused) == ["a"] and [p["name"] for p in todo] == ["b"]
+
+    # Different settings, or a missing heat map, re-diff everything
+    assert cs.reusable_results(pairs, images, previous, 0.2, "ssim", "auto")[0] == {}
+    assert cs.reusable_results(pairs, images, previous, 0.15, "mad", "auto")[0] == {}
+    assert cs.reusable_results(pairs, images, previous, 0.15, "ssim", "fixed")[0] == {}
+    diff_image.unlink()
+    assert cs.reusable_results(pairs, images, previous, 0.15, "ssim", "auto")[0] == {}
+
+
+def test_results_from_another_engine_version_are_dropped(tmp_path, monkeypatch):
+    path = tmp_path / "report-state.json"
+    saved = {"version": cs.STATE_VERSION, "images": {"a.png": {"digest": "x"}},
+             "pairs": {"a": {"result": _result(0.1)}},
+             "engine": cs.compare_screenshots.ENGINE_VERSIONS}
+    cs.save_state(path, saved)
+    assert cs.load_state(path)["pairs"] == saved["pairs"]
+
+    # content_bounds.DETECT_VERSION or SSIM_VERSION bumped since the last run
+    monkeypatch.setattr(cs.compare_screenshots, "ENGINE_VERSIONS",
+                        dict(saved["engine"], detect=saved["engine"]["detect"] + 1))
+    state = cs.load_state(path)
+    assert state["pairs"] == {} and state["images"] == saved["images"]
+    assert state["engine"] == cs.compare_screenshots.ENGINE_VERSIONS
+
+    # State written before engine versions were recorded is treated as stale too
+    cs.save_state(path, {key: value for key, value in saved.items() if key != "engine"})
+    assert cs.load_state(path)["pairs"] == {}
+
+
+def test_unchanged_rows_and_files_are_not_redone(tmp_path, monkeypatch):
+    ios, android = _snapshots()
+    results = {p["name"]: _result(0.1) for p in cs.build_pairs(ios, android)}
+    rows = {}
+    cs.generate_html_report(ios, android, str(tmp_path / "r.html"), results, row_cache=rows)
+    first = {card: row["key"] for card, row in rows.items()}
+
+    rendered = []
+    real_render = cs.render_card
+    monkeypatch.setattr(cs, "render_card",
+                        lambda row, assets=None: rendered.append(row["card"]) or real_render(row, assets))
+    results[next(n for n in results if n.startswith("beta"))] = _result(0.3)
+    cs.generate_html_report(ios, android, str(tmp_path / "r.html"), results, row_cache=rows)
+    assert rendered == ["beta"]
+    assert {c: k for c, k in first.items() if c != "beta"} == \
+        {c: row["key"] for c, row in rows.items() if c != "beta"}
+
+    # Files whose mtime and size are unchanged keep their digest without a re-read
+    src = tmp_path / "a.png"
+    src.write_bytes(b"one")
+    images = cs.fingerprint_images([str(src)], {})
+    monkeypatch.setattr(cs, "file_digest", lambda path: pytest.fail("re-hashed"))
+    assert cs.fingerprint_images([str(src)], images) == images
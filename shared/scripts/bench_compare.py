@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Benchmark the screenshot comparison engines over the committed baselines
+========================================================================
+Times compare-screenshots.py (compute_diff) and pixel_diff.py, the engine
+behind visual-diff-gate.sh and the design-review-loop.sh smoke test, on real
+PNGs from the repo. No simulator, emulator or network is needed.
+
+Pairs:
+  parity    iOS vs Android snapshot of the same card (compute_diff)
+            ios/Tests/VisualTests/Snapshots/Baselines x
+            android/ac-rendering/src/test/snapshots/images
+  theme     light vs dark iOS snapshot of the same card (pixel_diff, changed)
+  same      a baseline vs a re-encoded copy: different bytes, same pixels
+            (pixel_diff, the "nothing changed" gate run)
+  legacy    consecutive shared/golden-baselines/legacy images of different
+            heights (pixel_diff resize path)
+
+Every in-process case runs in its own child process, so its peak RSS is its
+own. Each pair is timed individually over --repeat passes after one warm-up
+pass; the CLI cases time whole `python3 <script>` invocations, cold and
+through a warm comparison daemon (compare_client.py).
+
+Per case the JSON report holds: pairs, samples, p50/p90/p99/max latency (ms),
+throughput (pairs/s), peak RSS (MB) and, for CLI cases, interpreter +
+import start-up (ms). Timings are machine-dependent; compare runs from the
+same machine:
+
+Usage:
+  python3 shared/scripts/bench_compare.py --output bench-compare.json
+  python3 shared/scripts/bench_compare.py --pairs 24 --repeat 5 --cases compare-ssim-cold
+  python3 shared/scripts/bench_compare.py --output new.json --compare old.json
+
+Exit codes:
+  0 - done (and, with --compare, no case's p50 slowed past --tolerance)
+  1 - with --compare, at least one case is slower than allowed
+  2 - no baseline images found
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+IOS_BASELINES = REPO_ROOT / "ios/Tests/VisualTests/Snapshots/Baselines"
+ANDROID_BASELINES = REPO_ROOT / "android/ac-rendering/src/test/snapshots/images"
+LEGACY_BASELINES = REPO_ROOT / "shared/golden-baselines/legacy"
+
+IOS_NAME = re.compile(r"^(?P<card>.+)_iPhone_15_Pro\.png$")
+ANDROID_NAME = re.compile(r"_snapshot_defaultConfig\[(?P<card>[^\]]+)\]_.*\.png$")
+
+DEFAULT_PAIRS = 12
+DEFAULT_REPEAT = 3
+CLI_CALLS = 6   # subprocess invocations per CLI case
+
+# case -> (engine, pair set, description)
+CASES = {
+    "compare-ssim-cold": ("compute_diff", "parity", "SSIM, no cache: decode + crop + resize every time"),
+    "compare-ssim-warm": ("compute_diff", "parity", "SSIM, normalized arrays served from the cache"),
+    "compare-ms-ssim-warm": ("compute_diff", "parity", "MS-SSIM, warm cache"),
+    "compare-mad-warm": ("compute_diff", "parity", "mean absolute difference, warm cache"),
+    "compare-ssim-fixed-crop": ("compute_diff", "parity", "SSIM, legacy fixed chrome ratios, no cache"),
+    "ssim-kernel": ("ssim", "parity", "ssim.ssim alone on the normalized COMPARE_SIZE arrays"),
+    "ms-ssim-kernel": ("ssim", "parity", "ssim.ms_ssim alone on the normalized COMPARE_SIZE arrays"),
+    "pixel-full-theme": ("pixel_diff", "theme", "full-frame diff of changed pairs"),
+    "pixel-tiles-theme": ("pixel_diff", "theme", "tile-hash diff of changed pairs, warm hashes"),
+    "pixel-full-same": ("pixel_diff", "same", "full-frame diff of unchanged pairs"),
+    "pixel-tiles-same": ("pixel_diff", "same", "tile-hash diff of unchanged pairs, warm hashes"),
+    "pixel-resize-legacy": ("pixel_diff", "legacy", "different sizes: LANCZOS resize + full diff"),
+    "cli-pixel-diff": ("cli", "theme", "python3 pixel_diff.py --tiles per pair"),
+    "cli-compare": ("cli", "parity", "python3 compare-screenshots.py per pair"),
+    "cli-client-daemon": ("cli", "theme", "python3 compare_client.py pixel-diff, warm daemon"),
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# Pairs
+# ──────────────────────────────────────────────────────────────
+
+def discover_pairs(limit: int, workdir: Path) -> dict:
+    """{pair set: [(a, b), ...]} from the committed baselines, at most limit per set.
+
+    The "same" set re-encodes baselines into workdir.
+    """
+    from PIL import Image
+
+    ios = {m["card"]: p for p in sorted(IOS_BASELINES.glob("*.png"))
+           if (m := IOS_NAME.match(p.name))}
+    android = {m["card"]: p for p in sorted(ANDROID_BASELINES.glob("*.png"))
+               if (m := ANDROID_NAME.search(p.name))}
+    parity = [(str(ios[c]), str(android[c])) for c in sorted(ios.keys() & android.keys())]
+
+    theme = []
+    for card, light in ios.items():
+        dark = light.with_name(f"{card}_iPhone_15_Pro_Dark.png")
+        if dark.exists():
+            theme.append((str(light), str(dark)))
+
+    same = []
+    for light, _ in theme[:limit]:
+        copy = workdir / f"same-{len(same)}.png"
+        Image.open(light).save(copy, optimize=False, compress_level=1)
+        same.append((light, str(copy)))
+
+    legacy = sorted(LEGACY_BASELINES.glob("*.png"))
+    legacy_pairs = [(str(a), str(b)) for a, b in zip(legacy, legacy[1:])]
+
+    return {"parity": parity[:limit], "theme": theme[:limit], "same": same,
+            "legacy": legacy_pairs[:limit]}
+
+
+# ──────────────────────────────────────────────────────────────
+# Measurement
+# ──────────────────────────────────────────────────────────────
+
+def percentile(samples: list[float], q: float) -> float:
+    """Linear-interpolated q-th percentile (0-100) of samples."""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = (len(ordered) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize(latencies: list[float], wall: float, pairs: int) -> dict:
+    """Latency percentiles (ms) and throughput for per-pair timings in seconds."""
+    ms = [t * 1000 for t in latencies]
+    return {
+        "pairs": pairs,
+        "samples": len(ms),
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p90_ms": round(percentile(ms, 90), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2),
+        "mean_ms": round(statistics.fmean(ms), 2),
+        "throughput_per_s": round(len(ms) / wall, 2) if wall else None,
+    }
+
+
+def _rss_mb(usage) -> float:
+    # Linux reports ru_maxrss in KiB, macOS in bytes
+    return round(usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def peak_rss_mb() -> float:
+    """This process's peak resident set size."""
+    return _rss_mb(resource.getrusage(resource.RUSAGE_SELF))
+
+
+def _load_engines():
+    sys.path.insert(0, str(SCRIPT_DIR))
+    import importlib.util
+
+    # Reuse an already-loaded engine: a second copy under the same name
+    # breaks pickling of its functions for worker processes
+    compare_screenshots = sys.modules.get("compare_screenshots")
+    if compare_screenshots is None:
+        spec = importlib.util.spec_from_file_location("compare_screenshots",
+                                                      SCRIPT_DIR / "compare-screenshots.py")
+        compare_screenshots = importlib.util.module_from_spec(spec)
+        sys.modules["compare_screenshots"] = compare_screenshots
+        spec.loader.exec_module(compare_screenshots)
+    import pixel_diff
+    return compare_screenshots, pixel_diff
+
+
+def run_in_process(case: str, pairs: list, repeat: int, cache_dir: str) -> dict:
+    """Time one in-process case; called in a fresh child process."""
+    compare_screenshots, pixel_diff = _load_engines()
+    cache = compare_screenshots.ImageCache(cache_dir)
+
+    if case.endswith("-kernel"):
+        import ssim
+
+        kernel = ssim.ms_ssim if case.startswith("ms-") else ssim.ssim
+        normalized = {}
+
+        def one(a, b):
+            if (a, b) not in normalized:  # filled by the warm-up pass, untimed
+                normalized[a, b] = [
+                    compare_screenshots.normalize_screenshot(path, platform)[0].astype("float32") / 255
+                    for path, platform in ((a, "ios"), (b, "android"))]
+            return kernel(*normalized[a, b])
+    elif case.startswith("compare-"):
+        metric = {"compare-ms-ssim-warm": "ms-ssim", "compare-mad-warm": "mad"}.get(case, "ssim")
+        crop = "fixed" if case.endswith("fixed-crop") else "auto"
+        use_cache = cache if case.endswith("-warm") else None
+
+        def one(a, b):
+            return compare_screenshots.compute_diff(a, b, None, metric, use_cache, crop=crop)
+    else:
+        tiles = "-tiles-" in case
+        use_cache = cache if tiles else None
+
+        def one(a, b):
+            return pixel_diff.diff_report(a, b, tiles=tiles, cache=use_cache)
+
+    for a, b in pairs:  # warm-up: imports, page cache, and the image cache for -warm cases
+        one(a, b)
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for a, b in pairs:
+            t = time.perf_counter()
+            one(a, b)
+            latencies.append(time.perf_counter() - t)
+    wall = time.perf_counter() - start
+    return {**summarize(latencies, wall, len(pairs)), "peak_rss_mb": peak_rss_mb()}
+
+
+def _child(case: str, pairs: list, repeat: int, cache_dir: str) -> dict:
+    """Run one in-process case in a child interpreter and read back its result."""
+    proc = subprocess.run(
+        [sys.executable, __file__, "--run-case", case, "--repeat", str(repeat),
+         "--cache-dir", cache_dir],
+        input=json.dumps(pairs), capture_output=True, text=True, check=False)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{case} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+def _timed_run(argv: list, env: dict) -> tuple[float, float]:
+    """(wall seconds, peak RSS MB) of one subprocess."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, _, usage = os.wait4(proc.pid, 0)
+    proc.returncode = 0  # reaped above; keep Popen from waiting again
+    return time.perf_counter() - start, _rss_mb(usage)
+
+
+def run_cli(case: str, pairs: list, cache_dir: str, workdir: Path) -> dict:
+    """Time whole `python3 <script>` invocations, one per pair."""
+    env = dict(os.environ, AC_COMPARE_CACHE_DIR=cache_dir)
+    pairs = (pairs * CLI_CALLS)[:CLI_CALLS]
+    if case == "cli-compare":
+        script = SCRIPT_DIR / "compare-screenshots.py"
+        argvs = [[sys.executable, str(script), a, b] for a, b in pairs]
+    elif case == "cli-pixel-diff":
+        script = SCRIPT_DIR / "pixel_diff.py"
+        argvs = [[sys.executable, str(script), a, b, "--tiles"] for a, b in pairs]
+    else:
+        script = SCRIPT_DIR / "compare_client.py"
+        sock = workdir / "bench.sock"
+        argvs = [[sys.executable, str(script), "--socket", str(sock), "--no-fallback",
+                  "pixel-diff", a, b, "--tiles"] for a, b in pairs]
+
+    # Interpreter + imports only: what every per-pair call pays before any work
+    startup = [_timed_run([sys.executable, str(script), "--help"], env)[0] for _ in range(3)]
+
+    daemon = None
+    if case == "cli-client-daemon":
+        daemon = subprocess.Popen(
+            [sys.executable, str(SCRIPT_DIR / "compare-screenshots.py"), "serve",
+             "--socket", str(sock), "--cache-dir", cache_dir, "--idle-timeout", "120"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        ping = [sys.executable, str(script), "--socket", str(sock), "ping"]
+        for _ in range(100):
+            if subprocess.run(ping, capture_output=True, check=False).returncode == 0:
+                break
+            time.sleep(0.1)
+    try:
+        _timed_run(argvs[0], env)  # warm-up: caches, daemon's first imports
+        latencies = []
+        rss = 0.0
+        start = time.perf_counter()
+        for argv in argvs:
+            wall, peak = _timed_run(argv, env)
+            latencies.append(wall)
+            rss = max(rss, peak)
+        total = time.perf_counter() - start
+    finally:
+        daemon_rss = None
+        if daemon is not None:
+            daemon.terminate()
+            _, _, usage = os.wait4(daemon.pid, 0)
+            daemon.returncode = 0
+            daemon_rss = _rss_mb(usage)
+
+    result = {**summarize(latencies, total, len(set(pairs))), "peak_rss_mb": rss,
+              "startup_ms": round(statistics.median(startup) * 1000, 1)}
+    if daemon_rss is not None:
+        result["daemon_rss_mb"] = daemon_rss
+    return result
+
+
+# ──────────────────────────────────────────────────────────────
+# Comparing runs
+# ──────────────────────────────────────────────────────────────
+
+def compare_runs(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Cases whose p50 latency grew by more than tolerance (a fraction) over the baseline."""
+    old = {r["case"]: r for r in baseline}
+    slower = []
+    for result in results:
+        before = old.get(result["case"])
+        if not before or not before.get("p50_ms"):
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        line = (f"{result['case']:<24} p50 {before['p50_ms']:>9.2f} -> {result['p50_ms']:>9.2f} ms "
+                f"({ratio:.2f}x), peak RSS {before.get('peak_rss_mb')} -> {result.get('peak_rss_mb')} MB")
+        print(f"  {line}", file=sys.stderr)
+        if ratio > 1 + tolerance:
+            slower.append(line)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the screenshot comparison engines over the committed baselines")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES),
+                        help="Cases to run (default: all)")
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS,
+                        help="Max pairs per pair set (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Timed passes over the pairs per in-process case (default: %(default)s)")
+    parser.add_argument("--output", "-o", help="Write results JSON here")
+    parser.add_argument("--compare", help="Earlier results JSON to compare p50 latency against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed p50 slowdown vs --compare, as a fraction (default: %(default)s)")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        pairs = json.load(sys.stdin)
+        print(json.dumps(run_in_process(args.run_case, pairs, args.repeat, args.cache_dir)))
+        return
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-compare-"))
+    try:
+        pair_sets = discover_pairs(args.pairs, workdir)
+        if not any(pair_sets.values()):
+            print("Error: no baseline images found", file=sys.stderr)
+            sys.exit(2)
+
+        print(f"  {'case':<24} {'pairs':>5} {'p50':>9} {'p90':>9} {'p99':>9} "
+              f"{'pairs/s':>8} {'RSS MB':>7} {'start':>7}", file=sys.stderr)
+        results = []
+        for case in args.cases:
+            engine, pair_set, description = CASES[case]
+            pairs = pair_sets[pair_set]
+            if not pairs:
+                print(f"  {case:<24} skipped (no {pair_set} pairs)", file=sys.stderr)
+                continue
+            cache_dir = tempfile.mkdtemp(dir=workdir)
+            if engine == "cli":
+                result = run_cli(case, pairs, cache_dir, workdir)
+            else:
+                result = _child(case, pairs, args.repeat, cache_dir)
+            results.append({"case": case, "engine": engine, "pair_set": pair_set,
+                            "description": description, **result})
+            startup = f"{result['startup_ms']:>5.0f}ms" if "startup_ms" in result else ""
+            print(f"  {case:<24} {result['pairs']:>5} {result['p50_ms']:>7.1f}ms "
+                  f"{result['p90_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms "
+                  f"{result['throughput_per_s']:>8.2f} {result['peak_rss_mb']:>7.1f} {startup:>7}",
+                  file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "version": 1,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpu_count": os.cpu_count(),
+        "pairs": args.pairs,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Results: {args.output}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+        print(f"\nAgainst {args.compare}:", file=sys.stderr)
+        slower = compare_runs(results, baseline, args.tolerance)
+        if slower:
+            print(f"\n✗ {len(slower)} case(s) slower than {args.tolerance:.0%}:", file=sys.stderr)
+            for line in slower:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\n✓ No case slower than {args.tolerance:.0%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
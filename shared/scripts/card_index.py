@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Element-type index over the shared test-card corpus.
+
+Every card under shared/test-cards (excluding template data, host configs
+and the sample catalog) is parsed once and recorded with the element/action
+types it uses and the properties set on each ("Table.showGridLines"). The
+index is persisted as JSON together with its inverted maps, type -> cards
+and property -> cards, and refreshed incrementally: a card whose size and
+mtime are unchanged keeps its stored entry. Queries are dictionary lookups.
+
+Usage:
+    # Build / refresh the index
+    python3 shared/scripts/card_index.py build
+
+    # Which cards exercise Table? ... set Table.showGridLines?
+    python3 shared/scripts/card_index.py query Table
+    python3 shared/scripts/card_index.py query Table --property showGridLines
+
+    # Types the renderers don't know, per card (all cards, or the given ones)
+    python3 shared/scripts/card_index.py unknown
+    python3 shared/scripts/card_index.py unknown --tsv card1.json card2.json
+
+    # Cards per type, and known types no card exercises
+    python3 shared/scripts/card_index.py coverage [--json]
+
+Every command refreshes the index first, so it never answers from stale data.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import validate_test_cards
+
+INDEX_VERSION = 1
+
+# Element, action and inline types the iOS and Android renderers support
+KNOWN_TYPES = frozenset({
+    "TextBlock", "Image", "Media", "RichTextBlock", "Container", "ColumnSet", "Column",
+    "ImageSet", "FactSet", "ActionSet", "Table", "TableRow", "TableCell",
+    "Input.Text", "Input.Number", "Input.Date", "Input.Time", "Input.Toggle",
+    "Input.ChoiceSet", "Input.Rating", "Input.DataGrid",
+    "Carousel", "CarouselPage", "Accordion", "CodeBlock", "Rating",
+    "ProgressBar", "ProgressRing", "Spinner", "TabSet", "List", "CompoundButton",
+    "Badge", "DonutChart", "BarChart", "LineChart", "PieChart", "Chart.Donut", "Icon",
+    "Action.OpenUrl", "Action.Submit", "Action.ShowCard", "Action.ToggleVisibility",
+    "Action.Execute", "Action.Popover", "Action.ResetInputs", "Action.RunCommands",
+    "Action.OpenUrlDialog", "AdaptiveCard", "TextRun", "CitationRun", "Layout.Flow",
+    "Layout.AreaGrid", "Data.Query", "AdaptiveCardReference", "DocumentReference",
+})
+
+
+def default_index_path():
+    """AC_CARD_INDEX, else $XDG_CACHE_HOME (or ~/.cache)/adaptivecards-mobile/card-index.json."""
+    if os.environ.get("AC_CARD_INDEX"):
+        return Path(os.environ["AC_CARD_INDEX"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "adaptivecards-mobile" / "card-index.json"
+
+
+def card_usage(card):
+    """(type -> occurrence count, sorted "Type.property" list) for a parsed card."""
+    types = Counter()
+    properties = set()
+    stack = [card]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            node_type = node.get("type")
+            if isinstance(node_type, str) and node_type:
+                types[node_type] += 1
+                properties.update(f"{node_type}.{key}" for key in node if key != "type")
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return dict(types), sorted(properties)
+
+
+def _index_entry(path, backend):
+    try:
+        card = validate_test_cards.parse_json(Path(path).read_bytes(), backend)
+    except (OSError, ValueError) as e:
+        return {"types": {}, "properties": [], "error": str(e)}
+    types, properties = card_usage(card)
+    return {"types": types, "properties": properties, "error": None}
+
+
+class CardIndex:
+    """Card path -> (size, mtime, types, properties), plus the inverted maps."""
+
+    def __init__(self, root, entries=None, types=None, properties=None):
+        self.root = Path(root).resolve()
+        self.entries = entries or {}
+        self.types = types if types is not None else {}
+        self.properties = properties if properties is not None else {}
+        if entries and types is None:
+            self._invert()
+
+    @classmethod
+    def load(cls, index_path, root):
+        """The stored index for root, or an empty one if missing, stale-format or for another root."""
+        root = Path(root).resolve()
+        try:
+            data = json.loads(Path(index_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(root)
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(root):
+            return cls(root)
+        return cls(root, data["entries"], data["types"], data["properties"])
+
+    def save(self, index_path):
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "root": str(self.root),
+                                   "entries": self.entries, "types": self.types,
+                                   "properties": self.properties},
+                                  indent=0, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, index_path)
+
+    def update(self, workers=1, backend=None):
+        """Parse new or changed cards; drop entries whose file is gone.
+
+        Returns (parsed, reused, removed) counts. The inverted maps are
+        rebuilt only if something changed.
+        """
+        backend = backend or ("orjson" if validate_test_cards.orjson is not None else "json")
+        seen = {}
+        for p in validate_test_cards.find_files(self.root):
+            if validate_test_cards.classify(p, self.root) == "card":
+                seen[p.relative_to(self.root).as_posix()] = p
+
+        stale = []
+        for key, p in seen.items():
+            st = p.stat()
+            entry = self.entries.get(key)
+            if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns:
+                continue
+            stale.append((key, p, st))
+
+        removed = [key for key in self.entries if key not in seen]
+        for key in removed:
+            del self.entries[key]
+
+        paths = [str(p) for _, p, _ in stale]
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_index_entry, paths, [backend] * len(paths),
+                                        chunksize=16))
+        else:
+            results = [_index_entry(p, backend) for p in paths]
+
+        for (key, _, st), entry in zip(stale, results):
+            self.entries[key] = {"size": st.st_size, "mtime": st.st_mtime_ns, **entry}
+
+        if stale or removed:
+            self._invert()
+        return len(stale), len(seen) - len(stale), len(removed)
+
+    def _invert(self):
+        types = {}
+        properties = {}
+        for key in sorted(self.entries):
+            entry = self.entries[key]
+            for node_type in entry["types"]:
+                types.setdefault(node_type, []).append(key)
+            for prop in entry["properties"]:
+                properties.setdefault(prop, []).append(key)
+        self.types = types
+        self.properties = properties
+
+    def key(self, path):
+        """Index key for a card path (absolute, cwd-relative or root-relative)."""
+        p = Path(path)
+        if not p.is_absolute() and not p.exists():
+            p = self.root / p
+        try:
+            return p.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def cards_with(self, node_type, prop=None):
+        """Cards using node_type (with prop set on it, if given)."""
+        if prop:
+            return self.properties.get(f"{node_type}.{prop}", [])
+        return self.types.get(node_type, [])
+
+    def unknown_types(self, key):
+        entry = self.entries.get(key)
+        return sorted(t for t in entry["types"] if t not in KNOWN_TYPES) if entry else []
+
+    def unknown(self):
+        """Card -> unknown types, for every card that uses one."""
+        unknown_keys = {key for t, keys in self.types.items() if t not in KNOWN_TYPES for key in keys}
+        return {key: self.unknown_types(key) for key in sorted(unknown_keys)}
+
+    def coverage(self):
+        """(type -> number of cards using it, known types no card uses)."""
+        counts = {t: len(keys) for t, keys in sorted(self.types.items())}
+        return counts, sorted(KNOWN_TYPES - counts.keys())
+
+
+def cmd_build(index, args):
+    parsed, reused, removed = args.refresh
+    print(f"Indexed {len(index.entries)} cards, {len(index.types)} types ({parsed} parsed, "
+          f"{reused} unchanged, {removed} removed) -> {args.index}")
+
+
+def cmd_query(index, args):
+    for key in index.cards_with(args.type, args.property):
+        print(key)
+
+
+def cmd_unknown(index, args):
+    """Unknown types per card; --tsv prints path, status (ok/invalid) and types for each card given."""
+    if not args.cards:
+        if args.tsv:
+            return  # --tsv only reports on the cards given
+        for key, types in index.unknown().items():
+            print(f"{key}: {', '.join(types)}")
+        return
+    for card in args.cards:
+        key = index.key(card)
+        # Files the index skips (e.g. *.data.json) are parsed on the spot
+        entry = index.entries.get(key) or _index_entry(card, "json")
+        status = "invalid" if entry["error"] else "ok"
+        types = ",".join(sorted(t for t in entry["types"] if t not in KNOWN_TYPES))
+        if args.tsv:
+            print(f"{card}\t{status}\t{types}")
+        elif status == "invalid":
+            print(f"{card}: invalid JSON")
+        elif types:
+            print(f"{card}: {types}")
+
+
+def cmd_coverage(index, args):
+    counts, unused = index.coverage()
+    if args.json:
+        print(json.dumps({"cards": len(index.entries), "types": counts,
+                          "unknown": sorted(t for t in counts if t not in KNOWN_TYPES),
+                          "unexercised": unused}, indent=2))
+        return
+    print(f"{len(index.entries)} cards, {len(counts)} types")
+    for node_type, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
+        marker = "" if node_type in KNOWN_TYPES else "  (unknown)"
+        print(f"{n:>5}  {node_type}{marker}")
+    if unused:
+        print(f"\nKnown types no card exercises: {', '.join(unused)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Element-type index over the test-card corpus")
+    parser.add_argument("--index", default=None,
+                        help="Index file (default: $AC_CARD_INDEX or "
+                             "~/.cache/adaptivecards-mobile/card-index.json)")
+    parser.add_argument("--cards-dir", default=str(validate_test_cards.DEFAULT_CARDS_DIR),
+                        help="Test card root (default: shared/test-cards)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Parsing processes when (re)indexing (0 = one per CPU, default: 1)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("build", help="Build or refresh the index")
+
+    q = sub.add_parser("query", help="Cards that use an element/action type")
+    q.add_argument("type", help="Element or action type, e.g. Table or Action.Execute")
+    q.add_argument("--property", help="Only cards that set this property on the type")
+
+    u = sub.add_parser("unknown", help="Types outside the known set, per card")
+    u.add_argument("cards", nargs="*", help="Cards to report on (default: every card using one)")
+    u.add_argument("--tsv", action="store_true",
+                   help="One 'path<TAB>ok|invalid<TAB>type,type' line per given card")
+
+    c = sub.add_parser("coverage", help="Cards per type, and unexercised known types")
+    c.add_argument("--json", action="store_true", help="Machine-readable output")
+
+    args = parser.parse_args()
+    args.index = args.index or default_index_path()
+    if not Path(args.cards_dir).is_dir():
+        print(f"Error: test cards directory not found: {args.cards_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    index = CardIndex.load(args.index, args.cards_dir)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    args.refresh = index.update(workers)
+    if args.refresh[0] or args.refresh[2]:
+        try:
+            index.save(args.index)
+        except OSError:
+            pass  # read-only cache: re-parse every time
+
+    commands = {
+        "build": cmd_build,
+        "query": cmd_query,
+        "unknown": cmd_unknown,
+        "coverage": cmd_coverage,
+    }
+    commands[args.command](index, args)
+
+
+if __name__ == "__main__":
+    main()
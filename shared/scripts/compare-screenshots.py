@@ -8,12 +8,41 @@
 Cross-platform screenshot comparison for parity testing.
 
 Compares an iOS and Android screenshot by:
-1. Cropping out platform chrome (status bar, nav bar, bottom bar)
+1. Cropping each to its card region: platform chrome (status bar, nav bar,
+   home indicator) and page margins are detected from the pixels (see
+   content_bounds.py); `--crop fixed` cuts the legacy fixed ratios instead
 2. Resizing both to the same dimensions
-3. Computing structural similarity (SSIM-like) via normalized pixel diff
+3. Computing windowed structural similarity (SSIM) on luma; the reported
+   diff is 1 - SSIM. `--metric ms-ssim` uses multi-scale SSIM and
+   `--metric mad` the legacy mean absolute pixel difference.
 
 Usage:
-    python3 compare-screenshots.py <ios.png> <android.png> [--threshold 0.15]
+    python3 compare-screenshots.py <ios.png> <android.png> [--threshold 0.20]
+
+    # Batch mode: one process for a whole sweep
+    python3 compare-screenshots.py --manifest pairs.jsonl [--threshold 0.20]
+    python3 compare-screenshots.py --ios-dir DIR --android-dir DIR [--pair-by stem]
+    python3 compare-screenshots.py --manifest pairs.jsonl --workers 0   # all cores
+    python3 compare-screenshots.py --manifest pairs.jsonl --diff-dir diffs/   # + heat maps
+
+    # Where does the time go? Per-stage timings + cProfile dumps of the 5 slowest pairs
+    python3 compare-screenshots.py --manifest pairs.jsonl --profile --profile-dump prof/
+
+    # Long-lived daemon for shell loops; query it with compare_client.py
+    python3 compare-screenshots.py serve [--socket PATH] [--idle-timeout 900]
+
+Normalized (cropped + resized) images are cached on disk by content hash,
+so re-comparing an unchanged baseline skips decode and resize. See
+image_cache.py; pass --no-cache to bypass.
+
+Manifest format:
+    JSON list or JSONL of {"ios": path, "android": path, "name": str?, "threshold": float?,
+    "metric": "ssim"|"ms-ssim"|"mad"?, "crop": "auto"|"fixed"?} objects (or
+    [ios, android] arrays). Relative paths resolve against the manifest's
+    directory; an unknown metric or crop makes that pair an ERROR.
+
+The default threshold depends on the metric (DEFAULT_THRESHOLDS): 1 - SSIM
+and the mean absolute difference are on different scales.
 
 Exit codes:
     0 = PASS (diff within threshold)
@@ -21,14 +50,61 @@ Exit codes:
     2 = ERROR (file not found, etc.)
 
 Output (stdout):
-    JSON: {"diff": 0.123, "status": "PASS"|"MISMATCH", "ios_crop": [t,b], "android_crop": [t,b]}
+    JSON: {"diff": 0.123, "status": "PASS"|"MISMATCH", "metric": "ssim", "ssim": 0.877,
+           "tiles": [[...], ...], "ios_size": [w,h], "android_size": [w,h],
+           "crop": "auto", "ios_crop": [x0,y0,x1,y1], "android_crop": [x0,y0,x1,y1]}
+
+    With --diff-dir each result also has "diff_image", the path of a
+    THUMB_SIZE heat map of the normalized pair (see pixel_diff.heatmap_image).
+
+    "tiles" is a rows x columns grid (ssim.TILE_GRID) of per-tile SSIM, so a
+    localized regression shows up as one low tile rather than a small global dip.
+
+    "changed_tiles" lists the pixel_diff.TILE_SIZE tiles of the normalized
+    frame whose hashes differ, as [x0, y0, x1, y1]; when it is empty the
+    pair is identical after normalization and the metric is skipped.
+
+    Batch mode streams one JSON line per pair (the single-pair object plus
+    "name", "ios" and "android"), then a final {"summary": {...}} line.
+
+    With --profile each result also has "profile" (see stage_profile.py):
+        {"total_ms": 41.2, "peak_alloc_bytes": n, "decoded_pixels": n,
+         "resize_input_pixels": n, "stages": {"decode": {"ms": 12.1, "calls": 2,
+         "peak_alloc_bytes": n}, "crop": ..., "resize": ..., "diff": ..., ...}}
+    Stages: header, cache (lookup, hashing, store), decode, crop (card-region
+    detection), resize (LANCZOS), tile_hash, diff (the metric), heatmap. A
+    stage's ms excludes the stages inside it, so they add up to total_ms.
+    The batch summary gets "profile": per-stage totals, share of the time,
+    percentiles and a histogram over "buckets_ms", plus the --profile-top
+    slowest pairs (with their cProfile dump under --profile-dump).
 """
 
+import argparse
+import cProfile
+import hashlib
+import os
+import re
+import signal
+import socketserver
 import sys
 import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
 import numpy as np
 from PIL import Image
 
+from compare_client import DaemonUnavailable, default_socket_path, request
+from content_bounds import DETECT_VERSION, content_bounds
+from image_cache import DEFAULT_MAX_BYTES, ImageCache, file_digest
+from pixel_diff import diff_report, heatmap_image, tile_bounds, tile_hashes
+from ssim import SSIM_VERSION, TILE_GRID, ms_ssim, ssim
+from stage_profile import StageHistogram, StageProfile
+
 # Default crop ratios to remove platform chrome
 # iOS: status bar ~7% top, bottom bar ~5% bottom
 # Android: status bar ~5% top, nav bar + bottom bar ~12% bottom
@@ -36,66 +112,619 @@ IOS_CROP_TOP = 0.07
 IOS_CROP_BOTTOM = 0.05
 ANDROID_CROP_TOP = 0.05
 ANDROID_CROP_BOTTOM = 0.12
+# --crop auto only strips page-coloured chrome within these same windows
+PLATFORM_CROP = {
+    "ios": (IOS_CROP_TOP, IOS_CROP_BOTTOM),
+    "android": (ANDROID_CROP_TOP, ANDROID_CROP_BOTTOM),
+}
+CROP_MODES = ("auto", "fixed")
+DEFAULT_CROP = "auto"
 
 COMPARE_SIZE = (360, 640)  # Normalize both to this size
 
+METRICS = ("ssim", "ms-ssim", "mad")
+DEFAULT_METRIC = "ssim"
+# Max diff before MISMATCH, per metric. Calibrated on 60 iOS baselines with
+# auto crop: each against itself with renderer-level noise (1 px blur, 2 px
+# shift, resample through Android's width, a slight tint), which should
+# pass, and against a different card, which should not. ssim at 0.20 passes
+# 96% of the noisy pairs and fails 95% of the other cards; ms-ssim at 0.25,
+# 97% and 100%. mad keeps its original 0.15.
+DEFAULT_THRESHOLDS = {"ssim": 0.20, "ms-ssim": 0.25, "mad": 0.15}
+# Algorithm versions behind a score; results saved by callers are stale once these change
+ENGINE_VERSIONS = {"detect": DETECT_VERSION, "ssim": SSIM_VERSION}
+IDLE_TIMEOUT = 900  # seconds without a request before `serve` exits
+
+THUMB_SIZE = (180, 320)  # Diff heat map thumbnails (--diff-dir)
+PROFILE_TOP = 5  # slowest pairs listed (and cProfile dumps kept) per --profile batch
+
 
 def crop_chrome(img, crop_top_ratio, crop_bottom_ratio):
-    """Remove platform chrome (status bar, nav bar) by cropping."""
+    """Remove platform chrome (status bar, nav bar) by cropping fixed ratios."""
     w, h = img.size
     top = int(h * crop_top_ratio)
     bottom = int(h * (1 - crop_bottom_ratio))
     return img.crop((0, top, w, bottom))
 
 
-def compute_diff(ios_path, android_path, threshold=0.15):
-    """Compare two screenshots and return diff percentage."""
+def crop_box(img, platform, crop=DEFAULT_CROP):
+    """(x0, y0, x1, y1) of the region of a decoded screenshot that gets compared."""
+    top_ratio, bottom_ratio = PLATFORM_CROP[platform]
+    if crop == "fixed":
+        w, h = img.size
+        return 0, int(h * top_ratio), w, int(h * (1 - bottom_ratio))
+    return content_bounds(np.asarray(img), top_ratio, bottom_ratio)
+
+
+def profile_stage(profile, name):
+    """profile.stage(name), or a no-op context when not profiling."""
+    return profile.stage(name) if profile is not None else nullcontext()
+
+
+def normalize_screenshot(path, platform, crop=DEFAULT_CROP, cache=None, profile=None):
+    """Decode, crop to the card region and resize one screenshot to COMPARE_SIZE.
+
+    Returns (HxWx3 uint8 array, crop box). With an ImageCache, an unchanged
+    file is served from the cache without being decoded or resized. With a
+    StageProfile, the decode / crop / resize / cache stages are timed and
+    decoded_pixels and resize_input_pixels counted.
+    """
+    decoded = {}
+
+    def decode():
+        if "img" not in decoded:
+            with profile_stage(profile, "decode"):
+                decoded["img"] = Image.open(path).convert("RGB")
+            if profile is not None:
+                profile.count("decoded_pixels", decoded["img"].width * decoded["img"].height)
+        return decoded["img"]
+
+    def box():
+        img = decode()
+        with profile_stage(profile, "crop"):
+            return np.array(crop_box(img, platform, crop))
+
+    def normalize():
+        img = decode()
+        x0, y0, x1, y1 = (int(v) for v in region)
+        if profile is not None:
+            profile.count("resize_input_pixels", (x1 - x0) * (y1 - y0))
+        with profile_stage(profile, "resize"):
+            return np.asarray(img.crop((x0, y0, x1, y1)).resize(COMPARE_SIZE, Image.LANCZOS))
+
+    if cache is None:
+        region = box()
+        return normalize(), [int(v) for v in region]
+    params = (platform, crop, PLATFORM_CROP[platform], DETECT_VERSION)
+    with profile_stage(profile, "cache"):
+        digest = file_digest(path)
+        region = cache.get_or_compute(path, ("crop-box",) + params, box, digest)
+        arr = cache.get_or_compute(path, params + (COMPARE_SIZE, "LANCZOS"), normalize, digest)
+    return arr, [int(v) for v in region]
+
+
+def write_diff_thumbnail(ios_norm, android_norm, out_path):
+    """Save a THUMB_SIZE heat map of where two normalized screenshots differ."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    heatmap_image(ios_norm, android_norm).resize(THUMB_SIZE, Image.LANCZOS).save(out_path)
+
+
+def diff_image_path(diff_dir, pair, suffix=".png"):
+    """Stable, filesystem-safe thumbnail (or other per-pair file) path inside diff_dir."""
+    digest = hashlib.blake2b(f"{pair['ios']}\0{pair['android']}".encode(),
+                             digest_size=4).hexdigest()
+    safe = re.sub(r"[^\w.-]+", "_", pair["name"]).strip("_")[:80]
+    return str(Path(diff_dir) / f"{safe}-{digest}{suffix}")
+
+
+def compute_diff(ios_path, android_path, threshold=None, metric=DEFAULT_METRIC,
+                 cache=None, diff_image=None, crop=DEFAULT_CROP, profile=None):
+    """Compare two screenshots and return diff (0 = identical, 1 = unrelated).
+
+    threshold defaults to the metric's DEFAULT_THRESHOLDS entry.
+
+    With diff_image, a heat map thumbnail of the normalized pair is written
+    there and its path returned as "diff_image".
+
+    The normalized frames are compared tile by tile first: "changed_tiles"
+    lists the (x0, y0, x1, y1) tiles, in COMPARE_SIZE coordinates, whose
+    hashes differ, and a pair with none is scored as identical without
+    running the metric.
+
+    With a StageProfile, the result gains "profile": its report() of
+    per-stage wall time, decoded pixels and peak allocation.
+
+    An unknown metric or crop mode (e.g. a typo in a manifest entry) is an
+    ERROR result rather than a silent fallback to the default.
+    """
+    if metric not in METRICS:
+        return {"diff": 1.0, "status": "ERROR",
+                "error": f"unknown metric {metric!r} (expected one of {', '.join(METRICS)})"}
+    if crop not in CROP_MODES:
+        return {"diff": 1.0, "status": "ERROR",
+                "error": f"unknown crop {crop!r} (expected one of {', '.join(CROP_MODES)})"}
+    if threshold is None:
+        threshold = DEFAULT_THRESHOLDS[metric]
+    if profile is None:
+        return _compute_diff(ios_path, android_path, threshold, metric, cache, diff_image,
+                             crop, None)
+    with profile:
+        result = _compute_diff(ios_path, android_path, threshold, metric, cache, diff_image,
+                               crop, profile)
+    result["profile"] = profile.report()
+    return result
+
+
+def _compute_diff(ios_path, android_path, threshold, metric, cache, diff_image, crop, profile):
     try:
-        ios_img = Image.open(ios_path).convert("RGB")
-        android_img = Image.open(android_path).convert("RGB")
+        # Header-only reads; pixel data is decoded (or cache-served) below
+        with profile_stage(profile, "header"):
+            ios_size = Image.open(ios_path).size
+            android_size = Image.open(android_path).size
+
+        # Crop to the card region and resize both to same dimensions
+        ios_norm, ios_crop = normalize_screenshot(ios_path, "ios", crop, cache, profile)
+        android_norm, android_crop = normalize_screenshot(android_path, "android", crop, cache,
+                                                          profile)
     except Exception as e:
         return {"diff": 1.0, "status": "ERROR", "error": str(e)}
 
-    # Crop platform chrome
-    ios_cropped = crop_chrome(ios_img, IOS_CROP_TOP, IOS_CROP_BOTTOM)
-    android_cropped = crop_chrome(android_img, ANDROID_CROP_TOP, ANDROID_CROP_BOTTOM)
+    bounds = tile_bounds(ios_norm.shape)
+    with profile_stage(profile, "tile_hash"):
+        changed = np.flatnonzero(tile_hashes(ios_norm) != tile_hashes(android_norm))
+    extra = {"changed_tiles": [list(bounds[i]) for i in changed]}
 
-    # Resize both to same dimensions
-    ios_resized = ios_cropped.resize(COMPARE_SIZE, Image.LANCZOS)
-    android_resized = android_cropped.resize(COMPARE_SIZE, Image.LANCZOS)
+    if not len(changed):
+        # Identical frames: every metric is at its best, no need to run it
+        diff = 0.0
+        if metric != "mad":
+            extra["ssim"] = 1.0
+        if metric == "ssim":
+            cols, rows = TILE_GRID
+            extra["tiles"] = np.ones((rows, cols)).tolist()
+    else:
+        with profile_stage(profile, "diff"):
+            # Convert to float arrays and compute normalized difference
+            ios_arr = np.asarray(ios_norm, dtype=np.float32) / 255.0
+            android_arr = np.asarray(android_norm, dtype=np.float32) / 255.0
 
-    # Convert to numpy arrays and compute normalized difference
-    ios_arr = np.array(ios_resized, dtype=np.float32) / 255.0
-    android_arr = np.array(android_resized, dtype=np.float32) / 255.0
-
-    # Mean absolute difference across all channels
-    diff = np.mean(np.abs(ios_arr - android_arr))
+            if metric == "mad":
+                # Mean absolute difference across all channels
+                diff = np.mean(np.abs(ios_arr - android_arr))
+            elif metric == "ms-ssim":
+                score = ms_ssim(ios_arr, android_arr)
+                diff = 1.0 - score
+                extra["ssim"] = round(score, 4)
+            else:
+                score, tiles = ssim(ios_arr, android_arr)
+                diff = 1.0 - score
+                extra["ssim"] = round(score, 4)
+                extra["tiles"] = np.round(tiles, 3).tolist()
 
+    # SSIM can dip below zero for anti-correlated content; keep diff in [0, 1]
+    diff = min(max(float(diff), 0.0), 1.0)
     status = "PASS" if diff <= threshold else "MISMATCH"
 
-    return {
-        "diff": round(float(diff), 4),
+    result = {
+        "diff": round(diff, 4),
         "status": status,
         "threshold": threshold,
-        "ios_size": list(ios_img.size),
-        "android_size": list(android_img.size),
+        "metric": metric,
+        "ios_size": list(ios_size),
+        "android_size": list(android_size),
+        "crop": crop,
+        "ios_crop": ios_crop,
+        "android_crop": android_crop,
     }
+    result.update(extra)
+
+    if diff_image:
+        try:
+            with profile_stage(profile, "heatmap"):
+                write_diff_thumbnail(ios_norm, android_norm, diff_image)
+            result["diff_image"] = str(diff_image)
+        except OSError as e:
+            # The score is still valid; only the thumbnail is missing
+            result["diff_image_error"] = str(e)
+    return result
+
+
+def load_manifest(manifest_path):
+    """Load comparison pairs from a JSON or JSONL manifest."""
+    path = Path(manifest_path)
+    text = path.read_text(encoding="utf-8")
+    try:
+        entries = json.loads(text)
+    except json.JSONDecodeError:
+        # JSONL: one pair per line
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(entries, dict):
+        entries = entries.get("pairs", [entries])
+
+    pairs = []
+    for entry in entries:
+        if isinstance(entry, (list, tuple)):
+            entry = {"ios": entry[0], "android": entry[1]}
+        pair = dict(entry)
+        for key in ("ios", "android"):
+            p = Path(pair[key])
+            if not p.is_absolute():
+                p = path.parent / p
+            pair[key] = str(p)
+        pair.setdefault("name", Path(pair["ios"]).stem)
+        pairs.append(pair)
+    return pairs
+
+
+def pair_directories(ios_dir, android_dir, pair_by="stem", pattern="*.png"):
+    """Pair screenshots from two directories by relative path or filename stem."""
+    def index(directory):
+        root = Path(directory)
+        files = {}
+        for p in sorted(root.rglob(pattern)):
+            key = p.stem if pair_by == "stem" else str(p.relative_to(root))
+            files.setdefault(key, str(p))
+        return files
+
+    ios_files = index(ios_dir)
+    android_files = index(android_dir)
+    return [
+        {"name": key, "ios": ios_files[key], "android": android_files[key]}
+        for key in sorted(ios_files.keys() & android_files.keys())
+    ]
+
+
+def compare_pair(pair, threshold=None, metric=DEFAULT_METRIC, cache=None, diff_dir=None,
+                 crop=DEFAULT_CROP, profile=False, profile_dir=None):
+    """Compare one manifest pair; never raises, so one bad pair can't sink a batch.
+
+    With profile, the record carries compute_diff's "profile" report. With
+    profile_dir, the comparison also runs under cProfile and the stats are
+    dumped there; the dump's path is the profile's "cprofile".
+    """
+    profiler = cProfile.Profile() if profile_dir else None
+    try:
+        diff_image = diff_image_path(diff_dir, pair) if diff_dir else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = compute_diff(pair["ios"], pair["android"],
+                                  pair.get("threshold", threshold),
+                                  pair.get("metric", metric), cache, diff_image,
+                                  pair.get("crop", crop),
+                                  StageProfile() if profile or profile_dir else None)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        if profiler is not None and "profile" in result:
+            dump = diff_image_path(profile_dir, pair, ".prof")
+            Path(profile_dir).mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(dump)
+            result["profile"]["cprofile"] = dump
+    except Exception as e:
+        result = {"diff": 1.0, "status": "ERROR", "error": str(e)}
+    record = {"name": pair["name"], "ios": pair["ios"], "android": pair["android"]}
+    record.update(result)
+    return record
+
+
+def iter_results(pairs, threshold=None, workers=1, max_in_flight=None,
+                 metric=DEFAULT_METRIC, cache=None, diff_dir=None, crop=DEFAULT_CROP,
+                 profile=False, profile_dir=None):
+    """Yield one result per pair, in input order.
+
+    With workers > 1 the pairs are spread over a process pool. At most
+    max_in_flight pairs (default: 2 x workers) are submitted ahead of the
+    oldest unfinished one, so memory stays flat however long the manifest is.
+    """
+    if workers <= 1:
+        for pair in pairs:
+            yield compare_pair(pair, threshold, metric, cache, diff_dir, crop, profile,
+                               profile_dir)
+        return
+
+    max_in_flight = max(max_in_flight or workers * 2, workers)
+    pending = deque()
+
+    def collect():
+        pair, future = pending.popleft()
+        try:
+            return future.result()
+        except Exception as e:
+            # Worker died (e.g. OOM-killed) — report this pair, keep going
+            return {"name": pair["name"], "ios": pair["ios"], "android": pair["android"],
+                    "diff": 1.0, "status": "ERROR", "error": f"worker failed: {e}"}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for pair in pairs:
+            pending.append((pair, pool.submit(compare_pair, pair, threshold, metric, cache,
+                                              diff_dir, crop, profile, profile_dir)))
+            if len(pending) >= max_in_flight:
+                yield collect()
+        while pending:
+            yield collect()
+
+
+def run_batch(pairs, threshold=None, out=None, workers=1, max_in_flight=None,
+              metric=DEFAULT_METRIC, cache=None, diff_dir=None, crop=DEFAULT_CROP,
+              profile=False, profile_dir=None, profile_top=PROFILE_TOP):
+    """Compare every pair, streaming one JSON line per pair.
+
+    Returns the aggregate summary, which is also written as the last line.
+    With profile (or profile_dir), the summary gains "profile": per-stage
+    totals, percentiles and histograms (see StageHistogram) and the
+    profile_top slowest pairs; only those pairs' cProfile dumps are kept.
+    """
+    out = out or sys.stdout
+    counts = {"PASS": 0, "MISMATCH": 0, "ERROR": 0}
+    diffs = []
+    worst = None
+    total = 0
+    histogram = StageHistogram()
+    timed = []
+
+    for record in iter_results(pairs, threshold, workers, max_in_flight, metric, cache,
+                               diff_dir, crop, profile, profile_dir):
+        report = record.get("profile")
+        if report is not None:
+            histogram.add(report)
+            # Dumps outside the slowest profile_top are deleted at the end
+            timed.append((report["total_ms"], record["name"], report.pop("cprofile", None)))
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+        total += 1
+        counts[record["status"]] += 1
+        if record["status"] != "ERROR":
+            diffs.append(record["diff"])
+            if worst is None or record["diff"] > worst["diff"]:
+                worst = {"name": record["name"], "diff": record["diff"]}
+
+    summary = {
+        "total": total,
+        "pass": counts["PASS"],
+        "mismatch": counts["MISMATCH"],
+        "error": counts["ERROR"],
+        "threshold": threshold if threshold is not None else DEFAULT_THRESHOLDS[metric],
+        "metric": metric,
+        "crop": crop,
+        "mean_diff": round(float(np.mean(diffs)), 4) if diffs else None,
+        "max_diff": worst,
+    }
+    if profile or profile_dir:
+        timed.sort(key=lambda t: t[0], reverse=True)
+        for _, _, dump in timed[profile_top:]:
+            if dump:
+                Path(dump).unlink(missing_ok=True)
+        summary["profile"] = histogram.summary()
+        summary["profile"]["slowest"] = [
+            dict({"name": name, "total_ms": ms}, **({"cprofile": dump} if dump else {}))
+            for ms, name, dump in timed[:profile_top]
+        ]
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+    return summary
+
+
+def handle_request(message, cache=None):
+    """Answer one daemon request ("compare" or "pixel-diff"); never raises."""
+    op = message.get("op", "compare")
+    try:
+        if op == "compare":
+            return compute_diff(message["ios"], message["android"],
+                                message.get("threshold"), message.get("metric", DEFAULT_METRIC),
+                                cache, message.get("diff_image"), message.get("crop", DEFAULT_CROP),
+                                StageProfile() if message.get("profile") else None)
+        if op == "pixel-diff":
+            return diff_report(message["before"], message["after"],
+                               message.get("channel_threshold", 30),
+                               tiles=message.get("tiles", False),
+                               tile_size=message.get("tile_size", 64), cache=cache,
+                               mask_path=message.get("mask"),
+                               heatmap_path=message.get("heatmap"))
+        raise ValueError(f"unknown op {op!r}")
+    except Exception as e:
+        if op == "compare":
+            return {"diff": 1.0, "status": "ERROR", "error": str(e)}
+        return {"error": str(e)}
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """One client connection: newline-delimited JSON requests, one answer each."""
+
+    def handle(self):
+        server = self.server
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError as e:
+                answer = {"error": f"bad request: {e}"}
+            else:
+                op = message.get("op") if isinstance(message, dict) else None
+                if not isinstance(message, dict):
+                    # e.g. `[]` or `1`: valid JSON, but not a request
+                    answer = {"error": "bad request: expected a JSON object"}
+                elif op == "ping":
+                    answer = {"ok": True, "pid": os.getpid(), "requests": server.requests,
+                              "uptime_s": round(time.monotonic() - server.started, 1)}
+                elif op == "shutdown":
+                    answer = {"ok": True}
+                    server.stopping = True
+                else:
+                    answer = handle_request(message, server.cache)
+                    server.requests += 1
+            self.wfile.write(json.dumps(answer).encode() + b"\n")
+            self.wfile.flush()
+            if server.stopping:
+                return
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    def handle_timeout(self):
+        self.stopping = True
+
+
+def serve(socket_path=None, cache=None, idle_timeout=IDLE_TIMEOUT, log=sys.stderr):
+    """Answer compare requests on a Unix socket until shut down or idle.
+
+    Returns False without serving if another daemon already answers on the
+    socket. A stale socket file is replaced.
+    """
+    path = Path(socket_path or default_socket_path())
+    if path.exists():
+        try:
+            request({"op": "ping"}, path, timeout=5)
+            print(f"compare daemon already running on {path}", file=log)
+            return False
+        except (DaemonUnavailable, OSError, ValueError):
+            path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Owner-only from the moment bind() creates the socket file
+    old_umask = os.umask(0o177)
+    try:
+        server = _DaemonServer(str(path), _DaemonHandler)
+    finally:
+        os.umask(old_umask)
+    server.cache = cache
+    server.requests = 0
+    server.started = time.monotonic()
+    server.stopping = False
+    server.timeout = idle_timeout or None
+    # SIGTERM (e.g. `kill` from a calling script) still removes the socket file
+    in_main = threading.current_thread() is threading.main_thread()
+    previous = signal.signal(signal.SIGTERM, lambda *_: sys.exit(0)) if in_main else None
+    print(f"compare daemon listening on {path} (pid {os.getpid()})", file=log, flush=True)
+    try:
+        while not server.stopping:
+            server.handle_request()
+    finally:
+        if in_main:
+            signal.signal(signal.SIGTERM, previous)
+        server.server_close()
+        path.unlink(missing_ok=True)
+    print(f"compare daemon stopped after {server.requests} request(s)", file=log)
+    return True
+
+
+def serve_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="compare-screenshots.py serve",
+        description="Serve compare / pixel-diff requests on a Unix socket (see compare_client.py)")
+    parser.add_argument("--socket", default=None,
+                        help="Socket path (default: $AC_COMPARE_SOCKET or "
+                             "$XDG_RUNTIME_DIR/adaptivecards-compare-<uid>.sock)")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="Exit after this many seconds without a request, 0 = never "
+                             "(default: %(default)s)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Normalized-image cache directory (default: as the comparator)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Cache size cap before LRU eviction (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the on-disk cache")
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        cache = ImageCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    serve(args.socket, cache, args.idle_timeout)
+    sys.exit(0)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Compare iOS and Android screenshots for rendering parity")
+    parser.add_argument("ios", nargs="?", help="iOS screenshot (single-pair mode)")
+    parser.add_argument("android", nargs="?", help="Android screenshot (single-pair mode)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Max diff before MISMATCH (default: per metric, "
+                             + ", ".join(f"{m} {t}" for m, t in DEFAULT_THRESHOLDS.items()) + ")")
+    parser.add_argument("--metric", choices=METRICS, default=DEFAULT_METRIC,
+                        help=f"Diff metric (default: {DEFAULT_METRIC})")
+    parser.add_argument("--crop", choices=CROP_MODES, default=DEFAULT_CROP,
+                        help="Detect the card region per screenshot, or cut the fixed "
+                             f"per-platform chrome ratios (default: {DEFAULT_CROP})")
+    parser.add_argument("--manifest", help="JSON/JSONL manifest of pairs (batch mode)")
+    parser.add_argument("--ios-dir", help="iOS screenshot directory (batch mode)")
+    parser.add_argument("--android-dir", help="Android screenshot directory (batch mode)")
+    parser.add_argument("--pair-by", choices=["stem", "path"], default="stem",
+                        help="Pair directory files by filename stem or relative path")
+    parser.add_argument("--pattern", default="*.png",
+                        help="Glob for directory batch mode (default: *.png)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Worker processes for batch mode (0 = one per CPU, default: 1)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Max pairs queued ahead of the output (default: 2 x workers)")
+    parser.add_argument("--diff-dir", default=None,
+                        help="Write a diff heat map thumbnail per pair into this directory")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Normalized-image cache directory "
+                             "(default: $AC_COMPARE_CACHE_DIR or ~/.cache/adaptivecards-mobile/compare)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Cache size cap before LRU eviction (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always decode and resize; don't read or write the cache")
+    parser.add_argument("--profile", action="store_true",
+                        help="Add per-stage wall time, decoded pixels and peak allocation to "
+                             "each result (and a per-stage histogram to the batch summary)")
+    parser.add_argument("--profile-dump", default=None, metavar="DIR",
+                        help="Also run each pair under cProfile and keep the .prof dumps of "
+                             "the slowest --profile-top pairs in DIR (implies --profile)")
+    parser.add_argument("--profile-top", type=int, default=PROFILE_TOP,
+                        help="Slowest pairs to list in the summary / keep dumps for "
+                             "(default: %(default)s)")
+    return parser
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: compare-screenshots.py <ios.png> <android.png> [--threshold 0.15]", file=sys.stderr)
-        sys.exit(2)
+    if sys.argv[1:2] == ["serve"]:
+        serve_main(sys.argv[2:])
+
+    parser = build_parser()
+    args = parser.parse_args()
+
+    cache = None
+    if not args.no_cache:
+        cache = ImageCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
 
-    ios_path = sys.argv[1]
-    android_path = sys.argv[2]
-    threshold = 0.15
+    if args.manifest or args.ios_dir or args.android_dir:
+        try:
+            if args.manifest:
+                pairs = load_manifest(args.manifest)
+            elif args.ios_dir and args.android_dir:
+                pairs = pair_directories(args.ios_dir, args.android_dir,
+                                         args.pair_by, args.pattern)
+            else:
+                parser.error("--ios-dir and --android-dir must be used together")
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print(f"Error reading pairs: {e}", file=sys.stderr)
+            sys.exit(2)
 
-    for i, arg in enumerate(sys.argv):
-        if arg == "--threshold" and i + 1 < len(sys.argv):
-            threshold = float(sys.argv[i + 1])
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        summary = run_batch(pairs, args.threshold, workers=workers,
+                            max_in_flight=args.max_in_flight, metric=args.metric,
+                            cache=cache, diff_dir=args.diff_dir, crop=args.crop,
+                            profile=args.profile, profile_dir=args.profile_dump,
+                            profile_top=args.profile_top)
+        if summary["error"]:
+            sys.exit(2)
+        elif summary["mismatch"]:
+            sys.exit(1)
+        sys.exit(0)
+
+    if not args.ios or not args.android:
+        print("Usage: compare-screenshots.py <ios.png> <android.png> [--threshold 0.20]", file=sys.stderr)
+        sys.exit(2)
 
-    result = compute_diff(ios_path, android_path, threshold)
+    pair = {"name": Path(args.ios).stem, "ios": args.ios, "android": args.android}
+    result = compare_pair(pair, args.threshold, args.metric, cache, args.diff_dir, args.crop,
+                          args.profile, args.profile_dump)
+    for key in ("name", "ios", "android"):
+        del result[key]
     print(json.dumps(result))
 
     if result["status"] == "MISMATCH":
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Thin client for the screenshot comparison daemon (compare-screenshots.py serve).
+
+Shell loops that diff one pair per iteration pay python3 + numpy + PIL
+start-up and a cold cache on every call. This client imports only the
+standard library, sends the request to a warm daemon over a Unix domain
+socket, and prints exactly what compare-screenshots.py / pixel_diff.py would.
+If no daemon is listening it runs the comparison in-process instead, so
+callers never depend on the daemon being up.
+
+Protocol: one JSON object per line each way, on one connection per client.
+    {"op": "compare", "ios": path, "android": path, "threshold": float|null,
+     "metric": "ssim", "crop": "auto", "diff_image": path|null, "profile": bool}
+        -> the compute_diff() result (a null threshold is the metric's default)
+    {"op": "pixel-diff", "before": path, "after": path, "channel_threshold": 30,
+     "tiles": bool, "tile_size": 64, "mask": path|null, "heatmap": path|null}
+        -> the pixel_diff.py --json report
+    {"op": "ping"}      -> {"ok": true, "pid": n, "requests": n, "uptime_s": s}
+    {"op": "shutdown"}  -> {"ok": true}
+A request that fails answers {"error": "..."} (compare: status "ERROR").
+Paths are absolutized by the client; the daemon may run in another cwd.
+
+Usage:
+    # Start a daemon for the length of a script
+    python3 compare-screenshots.py serve --socket "$SOCK" &
+
+    python3 compare_client.py --socket "$SOCK" compare ios.png android.png [--metric ssim]
+    python3 compare_client.py --socket "$SOCK" pixel-diff before.png after.png --tiles --json
+    python3 compare_client.py --socket "$SOCK" ping
+    python3 compare_client.py --socket "$SOCK" stop
+
+Exit codes:
+    compare:    as compare-screenshots.py (0 = PASS, 1 = MISMATCH, 2 = ERROR)
+    pixel-diff: as pixel_diff.py (0 = diff computed, 2 = error)
+    ping/stop:  0 = daemon answered, 1 = no daemon
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+CONNECT_TIMEOUT = 1.0   # seconds to wait for the daemon to accept
+REQUEST_TIMEOUT = 300   # seconds to wait for one answer
+
+
+def default_socket_path():
+    """AC_COMPARE_SOCKET, else $XDG_RUNTIME_DIR (or the temp dir)/adaptivecards-compare-<uid>.sock."""
+    if os.environ.get("AC_COMPARE_SOCKET"):
+        return Path(os.environ["AC_COMPARE_SOCKET"])
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(base) / f"adaptivecards-compare-{uid}.sock"
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket."""
+
+
+def request(message, socket_path=None, timeout=REQUEST_TIMEOUT):
+    """Send one request to the daemon and return its decoded answer."""
+    path = str(socket_path or default_socket_path())
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except OSError as e:
+            raise DaemonUnavailable(f"{path}: {e}") from e
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailable(f"{path}: connection closed without an answer")
+    return json.loads(line)
+
+
+def _engine():
+    """compare-screenshots.py, imported in-process for the fallback path."""
+    import importlib.util
+
+    here = Path(__file__).resolve().parent
+    if str(here) not in sys.path:
+        sys.path.insert(0, str(here))
+    module = sys.modules.get("compare_screenshots")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("compare_screenshots",
+                                                      here / "compare-screenshots.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["compare_screenshots"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def run_local(message, cache=True):
+    """Answer a compare / pixel-diff request in this process, as the daemon would."""
+    engine = _engine()
+    return engine.handle_request(message, engine.ImageCache() if cache else None)
+
+
+def submit(message, socket_path=None, fallback=True, cache=True):
+    """The daemon's answer, or the in-process one if no daemon is listening."""
+    try:
+        return request(message, socket_path)
+    except DaemonUnavailable:
+        if not fallback:
+            raise
+        return run_local(message, cache)
+
+
+def _abs(path):
+    return str(Path(path).resolve()) if path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client for the screenshot comparison daemon")
+    parser.add_argument("--socket", default=None,
+                        help="Daemon socket (default: $AC_COMPARE_SOCKET or "
+                             "$XDG_RUNTIME_DIR/adaptivecards-compare-<uid>.sock)")
+    parser.add_argument("--no-fallback", action="store_true",
+                        help="Fail (exit 2) instead of comparing in-process when no daemon runs")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="In-process fallback: don't use the image cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    c = sub.add_parser("compare", help="Cross-platform parity diff (compare-screenshots.py)")
+    c.add_argument("ios")
+    c.add_argument("android")
+    c.add_argument("--threshold", type=float, default=None,
+                   help="Max diff before MISMATCH (default: the metric's default)")
+    c.add_argument("--metric", default="ssim")
+    c.add_argument("--crop", default="auto")
+    c.add_argument("--diff-image", default=None, help="Write a diff heat map thumbnail here")
+    c.add_argument("--profile", action="store_true",
+                   help="Add per-stage timings and peak allocation to the result")
+
+    p = sub.add_parser("pixel-diff", help="Per-channel pixel diff (pixel_diff.py)")
+    p.add_argument("before")
+    p.add_argument("after")
+    p.add_argument("--channel-threshold", type=int, default=30)
+    p.add_argument("--tiles", action="store_true")
+    p.add_argument("--tile-size", type=int, default=64)
+    p.add_argument("--mask", default=None)
+    p.add_argument("--heatmap", default=None)
+    p.add_argument("--json", action="store_true")
+
+    sub.add_parser("ping", help="Check that a daemon is running")
+    sub.add_parser("stop", help="Ask the daemon to exit")
+    args = parser.parse_args()
+
+    if args.command in ("ping", "stop"):
+        try:
+            answer = request({"op": "ping" if args.command == "ping" else "shutdown"},
+                             args.socket)
+        except (DaemonUnavailable, ValueError) as e:
+            print(f"No comparison daemon: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(answer))
+        sys.exit(0)
+
+    if args.command == "compare":
+        message = {"op": "compare", "ios": _abs(args.ios), "android": _abs(args.android),
+                   "threshold": args.threshold, "metric": args.metric, "crop": args.crop,
+                   "diff_image": _abs(args.diff_image), "profile": args.profile}
+    else:
+        message = {"op": "pixel-diff", "before": _abs(args.before), "after": _abs(args.after),
+                   "channel_threshold": args.channel_threshold, "tiles": args.tiles,
+                   "tile_size": args.tile_size, "mask": _abs(args.mask),
+                   "heatmap": _abs(args.heatmap)}
+
+    try:
+        answer = submit(message, args.socket, fallback=not args.no_fallback,
+                        cache=not args.no_cache)
+    except (DaemonUnavailable, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.command == "compare":
+        print(json.dumps(answer))
+        sys.exit({"PASS": 0, "MISMATCH": 1}.get(answer.get("status"), 2))
+
+    if "error" in answer:
+        print(f"Error: {answer['error']}", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps(answer) if args.json else f"{answer['diff_percent']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Content-aware chrome detection: find the card region of a screenshot.
+
+Each row (and, within the chrome-free band, each column) is reduced to a
+peak-to-peak spread and a representative colour with a couple of numpy
+reductions over a column-subsampled view. A row is "background" when it is a
+solid band in the page colour (the most common colour among solid rows);
+everything else is content or chrome.
+
+Chrome is peeled off each edge as:
+  - a tinted bar: a solid, non-page-colour edge row and everything up to the
+    first page-background row (a coloured status bar, a black Android nav
+    bar), if that is within MAX_CHROME of the height, or
+  - page-coloured chrome (status-bar glyphs on the page colour, a home
+    indicator): whole content bands inside the platform's chrome window,
+    followed by at least MIN_GAP background rows and laid out like chrome
+    (see chrome_like). A band that runs past the window, or a card title,
+    is never cut.
+The card region is then the bounding box of the remaining content rows and
+columns. Frames without any solid row (full-bleed images, gradients) fall
+back to cropping the chrome windows.
+
+Every frame is detected on its own: the result depends only on its pixels,
+never on which screenshots were processed before it in the same process.
+
+Usage:
+    from content_bounds import content_bounds
+
+    x0, y0, x1, y1 = content_bounds(arr, top_window=0.07, bottom_window=0.05)
+"""
+
+import numpy as np
+
+SOLID_TOL = 8       # max per-channel spread along a row for it to count as solid
+COLOUR_TOL = 12     # max per-channel distance from the page colour for background
+MIN_GAP = 4         # background rows that separate page-coloured chrome from content
+MAX_CHROME = 0.15   # tinted bars never extend beyond this fraction of the height
+SAMPLE_STEP = 4     # every SAMPLE_STEP-th column/row is read for the line statistics
+DETECT_VERSION = 2  # bump when the algorithm changes; part of cache keys
+
+
+def line_stats(arr, axis, step=SAMPLE_STEP):
+    """(per-channel spread, first-pixel colour) of every row (axis=1) or column (axis=0).
+
+    Only every step-th pixel along each line is read. Channels are reduced
+    one at a time: a reduction over a strided HxW plane is several times
+    faster than one over the HxWx3 view.
+    """
+    spread = None
+    for c in range(arr.shape[2]):
+        plane = arr[:, ::step, c] if axis == 1 else arr[::step, :, c]
+        d = plane.max(axis=axis) - plane.min(axis=axis)
+        spread = d if spread is None else np.maximum(spread, d)
+    colour = arr[:, 0] if axis == 1 else arr[0, :]
+    return spread, colour.astype(np.int16)
+
+
+def page_colour(spread, colour):
+    """Most common colour among solid lines, or None if there are none."""
+    solid = colour[spread <= SOLID_TOL]
+    if not len(solid):
+        return None
+    solid = solid.astype(np.int32)
+    packed = (solid[:, 0] << 16) | (solid[:, 1] << 8) | solid[:, 2]
+    values, counts = np.unique(packed, return_counts=True)
+    mode = int(values[counts.argmax()])
+    return np.array([mode >> 16, (mode >> 8) & 0xFF, mode & 0xFF], dtype=np.int16)
+
+
+def background_lines(spread, colour, page):
+    """Boolean per line: a solid band in the page colour."""
+    return (spread <= SOLID_TOL) & (np.abs(colour - page).max(axis=1) <= COLOUR_TOL)
+
+
+def chrome_like(band, page):
+    """Whether a page-coloured band of rows is laid out like system chrome.
+
+    A status bar has content at both ends and none in the middle third (clock
+    left, indicators right); a home indicator / gesture pill has content only
+    in the middle third. Card content (a left-aligned title, a full-width
+    row) matches neither.
+    """
+    spread, colour = line_stats(band, axis=0, step=1)
+    content = ~background_lines(spread, colour, page)
+    third = len(content) // 3
+    left, middle, right = content[:third].any(), content[third:-third].any(), content[-third:].any()
+    return (left and right and not middle) or (middle and not left and not right)
+
+
+def edge_chrome(arr, background, page, window):
+    """Number of chrome rows at the start (top) of a frame.
+
+    Pass arr[::-1] and background[::-1] for the bottom edge.
+    """
+    n = len(background)
+    if background.all():
+        return 0
+
+    # Tinted bar: a solid non-page-colour edge row, up to the first background row
+    if not background[0]:
+        edge_spread, _ = line_stats(arr[:1], axis=1)
+        first_bg = np.flatnonzero(background)
+        end = int(first_bg[0]) if len(first_bg) else n
+        if edge_spread[0] <= SOLID_TOL and end <= int(n * MAX_CHROME):
+            return end
+        return 0
+
+    # Page-coloured chrome: chrome-like bands inside the window, each followed by a gap
+    limit = int(n * window)
+    cut = 0
+    starts = np.flatnonzero(~background[1:] & background[:-1]) + 1
+    for start in starts:
+        ends = np.flatnonzero(background[start:])
+        if not len(ends):
+            break
+        end = int(start + ends[0])
+        if end > limit or end + MIN_GAP > n or not background[end:end + MIN_GAP].all():
+            break
+        if not chrome_like(arr[start:end], page):
+            break
+        cut = end
+    return cut
+
+
+def chrome_bands(arr, background, page, top_window, bottom_window):
+    """(top, bottom) row range left after removing chrome from both edges."""
+    n = len(background)
+    top = edge_chrome(arr, background, page, top_window)
+    bottom = n - edge_chrome(arr[::-1], background[::-1], page, bottom_window)
+    if bottom <= top:
+        return 0, n
+    return top, bottom
+
+
+def content_bounds(arr, top_window, bottom_window):
+    """(x0, y0, x1, y1) of the card region of an HxWx3 uint8 screenshot, end-exclusive."""
+    h, w = arr.shape[:2]
+    spread, colour = line_stats(arr, axis=1)
+    page = page_colour(spread, colour)
+    if page is None:
+        return 0, int(h * top_window), w, int(h * (1 - bottom_window))
+
+    rows_bg = background_lines(spread, colour, page)
+    top, bottom = chrome_bands(arr, rows_bg, page, top_window, bottom_window)
+
+    rows = np.flatnonzero(~rows_bg[top:bottom])
+    if not len(rows):
+        return 0, top, w, bottom
+    y0, y1 = top + int(rows[0]), top + int(rows[-1]) + 1
+
+    col_spread, col_colour = line_stats(arr[y0:y1], axis=0)
+    cols = np.flatnonzero(~background_lines(col_spread, col_colour, page))
+    if not len(cols):
+        return 0, y0, w, y1
+    return int(cols[0]), y0, int(cols[-1]) + 1, y1
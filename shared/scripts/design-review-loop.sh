@@ -1252,33 +1252,11 @@ resolve_impacted_cards() {
         return
     fi
 
-    # Use Python to resolve changed files → impacted cards via the impact map
-    # Pass data via environment to avoid heredoc quoting issues with filenames
+    # One call resolves the whole list against the compiled impact map
+    # (exact paths, directory prefixes and globs; see impact_resolver.py)
     local impacted
-    impacted=$(IMPACT_MAP="$IMPACT_MAP_FILE" CHANGED_FILES="$changed_files" python3 << 'IMPACT_EOF'
-import json, os
-
-impact_map_path = os.environ["IMPACT_MAP"]
-changed_raw = os.environ.get("CHANGED_FILES", "")
-
-with open(impact_map_path) as f:
-    impact_map = json.load(f)
-
-patterns = impact_map.get("file_patterns", {})
-changed = [f.strip() for f in changed_raw.strip().split("\n") if f.strip()]
-cards = set()
-
-for changed_file in changed:
-    for pattern, info in patterns.items():
-        # Exact match or directory prefix match
-        if changed_file == pattern or changed_file.startswith(pattern):
-            for card in info.get("test_cards", []):
-                cards.add(card)
-
-for card in sorted(cards):
-    print(card)
-IMPACT_EOF
-    )
+    impacted=$(printf '%s\n' "$changed_files" | \
+        python3 "$SCRIPT_DIR/impact_resolver.py" --map "$IMPACT_MAP_FILE" - 2>/dev/null || true)
 
     if [ -z "$impacted" ]; then
         RESOLVED_CARDS=("${SMOKE_TEST_CARDS[@]}")
@@ -1346,6 +1324,16 @@ run_smoke_test() {
         log "  Skipping rebuild (HEAD unchanged since last build)."
     fi
 
+    # One warm comparison daemon answers every catalog pixel diff below;
+    # compare_client.py diffs in-process if it isn't up (yet).
+    local compare_socket="" compare_daemon_pid=""
+    if [ -n "$CATALOG_DIR" ]; then
+        compare_socket="${TMPDIR:-/tmp}/ac-smoke-$$.sock"
+        python3 "$SCRIPT_DIR/compare-screenshots.py" serve --socket "$compare_socket" \
+            --idle-timeout 900 2>/dev/null &
+        compare_daemon_pid=$!
+    fi
+
     for card in "${RESOLVED_CARDS[@]}"; do
         local card_safe="${card//\//-}"
 
@@ -1403,30 +1391,26 @@ run_smoke_test() {
                         log "  SMOKE WARN: $card — $plat screenshot shrank ${ratio}% vs catalog (${smoke_sz}B vs ${catalog_sz}B, possible content loss)"
                         echo "WARN size-drop $plat $card ratio=${ratio}% smoke=${smoke_sz} catalog=${catalog_sz}" >> "$smoke_log"
                     fi
-                    # Pixel-level diff using Pillow (catches layout regressions
-                    # where file size is similar but content moved/disappeared)
-                    local pixel_diff
-                    pixel_diff=$(python3 -c "
-from PIL import Image
-import sys
-try:
-    a = Image.open('$catalog_shot').convert('RGB')
-    b = Image.open('$smoke_shot').convert('RGB')
-    if a.size != b.size:
-        b = b.resize(a.size, Image.LANCZOS)
-    pa, pb = a.load(), b.load()
-    w, h = a.size
-    diff = sum(1 for y in range(0, h, 3) for x in range(0, w, 3)
-               if abs(pa[x,y][0]-pb[x,y][0])>30 or abs(pa[x,y][1]-pb[x,y][1])>30 or abs(pa[x,y][2]-pb[x,y][2])>30)
-    print(f'{diff * 9 * 100 / (w * h):.1f}')
-except Exception:
-    print('-1')
-" 2>/dev/null || echo "-1")
-                    if [ "$pixel_diff" != "-1" ]; then
+                    # Full-resolution pixel diff (catches layout regressions
+                    # where file size is similar but content moved/disappeared).
+                    # Every pixel of every changed tile is checked, so 1-px
+                    # borders and baseline shifts are not lost to sampling;
+                    # tiles whose hashes match the catalog's are skipped.
+                    local pixel_diff diff_json diff_boxes
+                    local heatmap="$smoke_dir/diff-${plat}-${card_safe}.png"
+                    diff_json=$(python3 "$SCRIPT_DIR/compare_client.py" --socket "$compare_socket" \
+                        pixel-diff "$catalog_shot" "$smoke_shot" --tiles \
+                        --json --heatmap "$heatmap" 2>/dev/null || echo "")
+                    pixel_diff=$(echo "$diff_json" | sed -n 's/.*"diff_percent": \([0-9.]*\).*/\1/p')
+                    diff_boxes=$(echo "$diff_json" | sed -n 's/.*"box_count": \([0-9]*\).*/\1/p')
+                    if [ -n "$diff_json" ]; then
+                        echo "$plat $card $diff_json" >> "$smoke_dir/pixel-diff.log"
+                    fi
+                    if [ -n "$pixel_diff" ]; then
                         local diff_int=${pixel_diff%.*}
                         if [ "$diff_int" -gt 25 ]; then
-                            log "  SMOKE WARN: $card — $plat ${pixel_diff}% pixel diff vs catalog (>25% threshold)"
-                            echo "WARN pixel-diff $plat $card diff=${pixel_diff}%" >> "$smoke_log"
+                            log "  SMOKE WARN: $card — $plat ${pixel_diff}% pixel diff vs catalog (>25% threshold, ${diff_boxes:-0} changed regions, heat map: $heatmap)"
+                            echo "WARN pixel-diff $plat $card diff=${pixel_diff}% regions=${diff_boxes:-0} heatmap=$heatmap" >> "$smoke_log"
                         fi
                     fi
                 fi
@@ -1450,6 +1434,11 @@ except Exception:
         fi
     done
 
+    if [ -n "$compare_daemon_pid" ]; then
+        kill "$compare_daemon_pid" 2>/dev/null || true
+        wait "$compare_daemon_pid" 2>/dev/null || true
+    fi
+
     if [ "$failures" -gt 0 ]; then
         log "  SMOKE TEST FAILED: $failures failures across $total impacted cards. See $smoke_log"
         return 1
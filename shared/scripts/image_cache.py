@@ -0,0 +1,152 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+On-disk cache of normalized (cropped + resized) screenshot arrays.
+
+Entries are keyed by the image's content hash plus the normalization
+parameters (crop ratios, target size, resample filter), so an unchanged
+baseline is decoded and resized once and then served from a memory-mapped
+.npy file on every later run. The cache is capped by total size and evicts
+least-recently-used entries; a hit refreshes the entry's mtime.
+
+Usage:
+    from image_cache import ImageCache
+
+    cache = ImageCache()                       # ~/.cache/adaptivecards-mobile/compare
+    arr = cache.get_or_compute(path, params, lambda: expensive_decode(path))
+
+    # Several entries for one file: hash its bytes once
+    digest = file_digest(path)
+    box = cache.get_or_compute(path, ("box",), find_box, digest=digest)
+
+Set AC_COMPARE_CACHE_DIR to relocate the cache (e.g. onto a CI cache volume).
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def default_cache_dir():
+    """AC_COMPARE_CACHE_DIR, else $XDG_CACHE_HOME (or ~/.cache)/adaptivecards-mobile/compare."""
+    if os.environ.get("AC_COMPARE_CACHE_DIR"):
+        return Path(os.environ["AC_COMPARE_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "adaptivecards-mobile" / "compare"
+
+
+def file_digest(path):
+    """BLAKE2b hex digest of a file's bytes."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ImageCache:
+    """Size-capped LRU cache of numpy arrays stored as memory-mappable .npy files."""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Running estimate of the cache size, so put() doesn't rescan the
+        # directory every time; other processes' writes are picked up on the
+        # next full scan in evict().
+        self._approx_bytes = None
+
+    def key(self, path, params, digest=None):
+        """Cache key for an image file and the parameters used to normalize it.
+
+        digest is the file's file_digest() when the caller already has it.
+        """
+        if digest is None:
+            digest = file_digest(path)
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"v{CACHE_VERSION}:{digest}:{params!r}".encode())
+        return h.hexdigest()
+
+    def _entry(self, key):
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def get(self, key):
+        """Memory-mapped array for key, or None on a miss."""
+        entry = self._entry(key)
+        try:
+            arr = np.load(entry, mmap_mode="r")
+            os.utime(entry)  # mark as recently used
+        except (OSError, ValueError):
+            # Missing, concurrently evicted, or truncated — treat as a miss
+            return None
+        return arr
+
+    def put(self, key, arr):
+        """Store arr atomically, then evict old entries if over the size cap."""
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(arr))
+            os.replace(tmp, entry)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan()[1]
+        else:
+            self._approx_bytes += arr.nbytes
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def get_or_compute(self, path, params, compute, digest=None):
+        """Return the cached array for (path content, params), computing it on a miss."""
+        key = self.key(path, params, digest)
+        arr = self.get(key)
+        if arr is not None:
+            self.hits += 1
+            return arr
+        self.misses += 1
+        arr = compute()
+        self.put(key, arr)
+        return arr
+
+    def _scan(self):
+        """(entries as (mtime, size, path), total bytes) for everything on disk."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob("*/*.npy"):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry))
+            total += st.st_size
+        return entries, total
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        entries, total = self._scan()
+        if total > self.max_bytes:
+            for _, size, entry in sorted(entries):
+                entry.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._approx_bytes = total
+
+    def clear(self):
+        """Remove every cached entry."""
+        for entry in self.cache_dir.glob("*/*.npy"):
+            entry.unlink(missing_ok=True)
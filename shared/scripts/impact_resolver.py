@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Resolve changed files to impacted test cards via impact-map.json.
+
+The map's file_patterns are compiled into a trie over path components, so a
+whole `git diff --name-only` list resolves in one pass with no per-pattern
+scan. Pattern forms:
+    ios/Sources/ACRendering/Views/TableView.swift   exact file (or, if it
+                                                    names a directory,
+                                                    everything below it)
+    ios/Sources/ACTemplating/                       everything below the directory
+    ios/Sources/**/Chart*View.swift                 glob: * and ? stay within one
+                                                    path component, ** spans any
+Prefixes match whole path components: "ios/SampleApp/" does not match
+"ios/SampleAppTests/...".
+
+The compiled trie is cached by the map's content hash, in memory and on disk
+(AC_IMPACT_CACHE_DIR, default ~/.cache/adaptivecards-mobile/impact), so an
+edited map is recompiled on next use and an unchanged one never is.
+
+design-review-loop.sh (smoke tests) and visual-diff-gate.sh both use this.
+
+Usage:
+    git diff --name-only main | python3 impact_resolver.py -
+    python3 impact_resolver.py ios/Sources/ACMarkdown/Parser.swift --format csv
+    python3 impact_resolver.py --format json - < changed.txt
+
+Exit codes:
+    0 = at least one impacted card
+    1 = no changed file matched the map
+    2 = ERROR (map not found or invalid)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+DEFAULT_MAP = Path(__file__).resolve().parent / "impact-map.json"
+COMPILED_VERSION = 1
+RISK_ORDER = {"low": 0, "medium": 1, "high": 2}
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+_compiled = {}
+
+
+def default_cache_dir():
+    """AC_IMPACT_CACHE_DIR, else $XDG_CACHE_HOME (or ~/.cache)/adaptivecards-mobile/impact."""
+    if os.environ.get("AC_IMPACT_CACHE_DIR"):
+        return Path(os.environ["AC_IMPACT_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "adaptivecards-mobile" / "impact"
+
+
+def glob_regex(parts):
+    """Regex source for glob path components (* and ? within a component, ** across)."""
+    out = []
+    for i, part in enumerate(parts):
+        sep = "/" if i < len(parts) - 1 else ""
+        if part == "**":
+            out.append("(?:.*/)?" if sep else ".*")
+            continue
+        piece = ""
+        j = 0
+        while j < len(part):
+            c = part[j]
+            if c == "*":
+                piece += "[^/]*"
+            elif c == "?":
+                piece += "[^/]"
+            elif c == "[":
+                end = part.find("]", j + 1)
+                if end == -1:
+                    piece += re.escape(c)
+                else:
+                    body = part[j + 1:end]
+                    piece += "[" + ("^" + body[1:] if body.startswith("!") else body) + "]"
+                    j = end
+            else:
+                piece += re.escape(c)
+            j += 1
+        out.append(piece + sep)
+    return "".join(out) + r"\Z"
+
+
+def compile_map(impact_map):
+    """Trie of path components built from an impact map's file_patterns.
+
+    Each node is {"children": {...}, "exact": [...], "below": [...],
+    "globs": [[regex, [...]], ...]}: pattern ids matched by a path ending
+    here, by any path through here, and by a glob over the rest of the path.
+    Pattern ids index into the returned "patterns" list.
+    """
+    patterns = []
+    root = _node()
+    for pattern, info in impact_map.get("file_patterns", {}).items():
+        pid = len(patterns)
+        patterns.append({"pattern": pattern, "test_cards": info.get("test_cards", []),
+                         "risk": info.get("risk")})
+        parts = [p for p in pattern.strip("/").split("/") if p]
+        node = root
+        for i, part in enumerate(parts):
+            if _GLOB_CHARS.search(part):
+                node["globs"].append([glob_regex(parts[i:]), pid])
+                break
+            node = node["children"].setdefault(part, _node())
+        else:
+            # A directory pattern matches everything below; a plain path
+            # matches itself, or everything below it if it is a directory
+            node["below" if pattern.endswith("/") else "exact"].append(pid)
+            if not pattern.endswith("/"):
+                node["below"].append(pid)
+    return {"version": COMPILED_VERSION, "patterns": patterns, "trie": root}
+
+
+def _node():
+    return {"children": {}, "exact": [], "below": [], "globs": []}
+
+
+class ImpactResolver:
+    """Changed files -> impacted cards, from a compiled impact map."""
+
+    def __init__(self, compiled):
+        self.patterns = compiled["patterns"]
+        self.trie = compiled["trie"]
+        self._regex = {}
+
+    def _glob(self, source):
+        regex = self._regex.get(source)
+        if regex is None:
+            regex = self._regex[source] = re.compile(source)
+        return regex
+
+    def match(self, path):
+        """Ids of the patterns matching one repo-relative path."""
+        parts = [p for p in path.strip().strip("/").split("/") if p]
+        matched = set()
+        node = self.trie
+        for i, part in enumerate(parts):
+            if node["globs"]:
+                rest = "/".join(parts[i:])
+                matched.update(pid for source, pid in node["globs"] if self._glob(source).match(rest))
+            node = node["children"].get(part)
+            if node is None:
+                return matched
+            if i < len(parts) - 1:
+                matched.update(node["below"])
+        matched.update(node["exact"])
+        return matched
+
+    def resolve(self, paths):
+        """{"cards": sorted card ids, "matches": {path: [patterns]}, "unmatched": [...], "risk": ...}."""
+        cards = set()
+        matches = {}
+        unmatched = []
+        risk = None
+        for path in paths:
+            path = path.strip()
+            if not path:
+                continue
+            pids = sorted(self.match(path))
+            if not pids:
+                unmatched.append(path)
+                continue
+            matches[path] = [self.patterns[pid]["pattern"] for pid in pids]
+            for pid in pids:
+                cards.update(self.patterns[pid]["test_cards"])
+                r = self.patterns[pid]["risk"]
+                if r in RISK_ORDER and (risk is None or RISK_ORDER[r] > RISK_ORDER[risk]):
+                    risk = r
+        return {"cards": sorted(cards), "matches": matches, "unmatched": unmatched, "risk": risk}
+
+
+def load_resolver(map_path=DEFAULT_MAP, cache_dir=None):
+    """ImpactResolver for a map file, compiled at most once per map content."""
+    data = Path(map_path).read_bytes()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if digest in _compiled:
+        return ImpactResolver(_compiled[digest])
+
+    cache_file = Path(cache_dir or default_cache_dir()) / f"impact-{digest}.json"
+    compiled = None
+    try:
+        compiled = json.loads(cache_file.read_text(encoding="utf-8"))
+        if compiled.get("version") != COMPILED_VERSION:
+            compiled = None
+    except (OSError, ValueError):
+        pass
+    if compiled is None:
+        compiled = compile_map(json.loads(data))
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(compiled, f)
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass  # read-only cache: compile every time
+    _compiled[digest] = compiled
+    return ImpactResolver(compiled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve changed files to impacted test cards")
+    parser.add_argument("files", nargs="*",
+                        help="Changed repo-relative paths ('-' reads one per line from stdin)")
+    parser.add_argument("--map", default=str(DEFAULT_MAP),
+                        help="Impact map (default: shared/scripts/impact-map.json)")
+    parser.add_argument("--format", choices=["lines", "csv", "json"], default="lines",
+                        help="Cards one per line, comma-separated, or a JSON report (default: lines)")
+    args = parser.parse_args()
+
+    paths = []
+    for f in args.files:
+        paths.extend(sys.stdin.read().splitlines() if f == "-" else [f])
+
+    try:
+        resolver = load_resolver(args.map)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load impact map {args.map}: {e}", file=sys.stderr)
+        sys.exit(2)
+    result = resolver.resolve(paths)
+
+    if args.format == "json":
+        print(json.dumps(result, indent=2))
+    elif args.format == "csv":
+        if result["cards"]:
+            print(",".join(result["cards"]))
+    else:
+        for card in result["cards"]:
+            print(card)
+    sys.exit(0 if result["cards"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Perceptual-hash index over the snapshot baselines.
+
+Every baseline gets a 64-bit DCT pHash and a 64-bit gradient dHash. The index
+is persisted as JSON and rebuilt incrementally: a file whose size and mtime
+are unchanged keeps its stored hashes. Queries compute Hamming distances
+against all entries in one vectorized numpy pass.
+
+Usage:
+    # Build / refresh the index over the default baseline directories
+    python3 shared/scripts/phash_index.py build
+
+    # Baselines that look like a screenshot
+    python3 shared/scripts/phash_index.py query screenshot.png --max-distance 8
+
+    # Groups of near-duplicate baselines
+    python3 shared/scripts/phash_index.py duplicates --max-distance 2
+
+    # Flag identical and suspiciously different pairs in a compare manifest,
+    # writing the pairs that still need a full diff
+    python3 shared/scripts/phash_index.py check-pairs pairs.jsonl --remaining todo.jsonl
+
+Distances are 0-64 differing bits; pHash <= 4 is visually near-identical.
+Hashes cover the whole image, so iOS-vs-Android pairs (different aspect ratio
+and chrome) sit much further apart than baseline-vs-fresh pairs on one
+platform; check-pairs is sharpest on the latter.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from image_cache import default_cache_dir
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+BASELINE_DIRS = [
+    "ios/Tests/VisualTests/Snapshots/Baselines",
+    "android/ac-rendering/src/test/snapshots/images",
+    "shared/golden-baselines",
+]
+INDEX_VERSION = 1
+HASH_KINDS = ("phash", "dhash")
+
+PHASH_SIZE = 32      # DCT input side
+PHASH_LOW = 8        # low-frequency block kept (8x8 = 64 bits)
+
+# Orthogonal DCT-II basis: _DCT @ block @ _DCT.T is the 2-D DCT
+_n = np.arange(PHASH_SIZE)
+_DCT = np.cos(np.pi * (2 * _n[None, :] + 1) * _n[:, None] / (2 * PHASH_SIZE))
+
+
+def default_index_path():
+    return default_cache_dir() / "phash-index.json"
+
+
+def _bits_to_int(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def phash(img):
+    """64-bit DCT perceptual hash: low-frequency coefficients above their median."""
+    gray = np.asarray(img.convert("L").resize((PHASH_SIZE, PHASH_SIZE), Image.LANCZOS),
+                      dtype=np.float64)
+    low = (_DCT @ gray @ _DCT.T)[:PHASH_LOW, :PHASH_LOW]
+    # Median excludes the DC term, which only encodes overall brightness
+    return _bits_to_int(low > np.median(low.ravel()[1:]))
+
+
+def dhash(img):
+    """64-bit difference hash: is each pixel brighter than its right neighbour."""
+    gray = np.asarray(img.convert("L").resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    return _bits_to_int(gray[:, 1:] > gray[:, :-1])
+
+
+def hash_file(path):
+    """(phash, dhash) for an image file."""
+    with Image.open(path) as img:
+        return phash(img), dhash(img)
+
+
+def hamming(hashes, query):
+    """Bit distance between every uint64 in hashes and query."""
+    x = np.bitwise_xor(hashes, np.uint64(query))
+    return np.unpackbits(x.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+def _display_path(path):
+    path = Path(path).resolve()
+    try:
+        return str(path.relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def _hash_entry(path):
+    try:
+        p, d = hash_file(path)
+    except Exception as e:
+        return path, None, str(e)
+    return path, {"phash": f"{p:016x}", "dhash": f"{d:016x}"}, None
+
+
+class PHashIndex:
+    """Path -> (size, mtime, phash, dhash), with vectorized Hamming queries."""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+        self._arrays = None
+
+    @classmethod
+    def load(cls, index_path):
+        try:
+            data = json.loads(Path(index_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data.get("entries", {}))
+
+    def save(self, index_path):
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "entries": self.entries},
+                                  indent=0, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, index_path)
+
+    def update(self, directories, pattern="*.png", workers=1):
+        """Hash new or changed files under directories; drop entries whose file is gone.
+
+        Relative directories resolve against the current directory.
+        Returns (hashed, reused, removed) counts.
+        """
+        seen = {}
+        for directory in directories:
+            root = Path(directory).resolve()
+            for p in root.rglob(pattern):
+                seen[_display_path(p)] = p
+
+        stale = []
+        for key, p in seen.items():
+            st = p.stat()
+            entry = self.entries.get(key)
+            if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+                continue
+            stale.append((key, p, st))
+
+        removed = [key for key in self.entries if key not in seen]
+        for key in removed:
+            del self.entries[key]
+
+        paths = [str(p) for _, p, _ in stale]
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_hash_entry, paths, chunksize=16))
+        else:
+            results = [_hash_entry(p) for p in paths]
+
+        for (key, _, st), (_, hashes, error) in zip(stale, results):
+            if hashes is None:
+                print(f"Warning: could not hash {key}: {error}", file=sys.stderr)
+                continue
+            self.entries[key] = {"size": st.st_size, "mtime": st.st_mtime, **hashes}
+
+        self._arrays = None
+        return len(stale), len(seen) - len(stale), len(removed)
+
+    def _matrix(self, kind):
+        if self._arrays is None:
+            keys = sorted(self.entries)
+            self._arrays = (keys, {
+                k: np.array([int(self.entries[p][k], 16) for p in keys], dtype=np.uint64)
+                for k in HASH_KINDS
+            })
+        keys, arrays = self._arrays
+        return keys, arrays[kind]
+
+    def query(self, hash_value, kind="phash", max_distance=8, limit=None):
+        """[(path, distance)] within max_distance of hash_value, nearest first."""
+        keys, hashes = self._matrix(kind)
+        if not keys:
+            return []
+        dist = hamming(hashes, hash_value)
+        hits = np.flatnonzero(dist <= max_distance)
+        hits = hits[np.argsort(dist[hits], kind="stable")]
+        if limit:
+            hits = hits[:limit]
+        return [(keys[i], int(dist[i])) for i in hits]
+
+    def duplicates(self, kind="phash", max_distance=2):
+        """Groups of entries within max_distance of each other (single linkage)."""
+        keys, hashes = self._matrix(kind)
+        parent = list(range(len(keys)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i in range(len(keys)):
+            # Only compare against later entries; one row of the distance matrix at a time
+            dist = hamming(hashes[i + 1:], hashes[i])
+            for j in np.flatnonzero(dist <= max_distance) + i + 1:
+                parent[find(int(j))] = find(i)
+
+        groups = {}
+        for i, key in enumerate(keys):
+            groups.setdefault(find(i), []).append(key)
+        return sorted((g for g in groups.values() if len(g) > 1), key=len, reverse=True)
+
+    def lookup(self, path, kind="phash"):
+        """Stored hash for an indexed path, or None if unindexed or changed since."""
+        entry = self.entries.get(str(path)) or self.entries.get(_display_path(path))
+        if not entry:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        # A file rewritten after the last build must not keep its old hash
+        if entry["size"] != st.st_size or entry["mtime"] != st.st_mtime:
+            return None
+        return int(entry[kind], 16)
+
+
+def _hash_for(index, path, kind):
+    stored = index.lookup(path, kind)
+    if stored is not None:
+        return stored
+    p, d = hash_file(path)
+    return p if kind == "phash" else d
+
+
+def cmd_build(index, args):
+    if args.dirs:
+        directories = [Path(d).resolve() for d in args.dirs]
+        for directory in directories:
+            if not directory.is_dir():
+                print(f"Error: directory not found: {directory}", file=sys.stderr)
+                sys.exit(2)
+            if next(directory.rglob(args.pattern), None) is None:
+                print(f"Error: no {args.pattern} files under {directory}", file=sys.stderr)
+                sys.exit(2)
+    else:
+        directories = [REPO_ROOT / d for d in BASELINE_DIRS]
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    hashed, reused, removed = index.update(directories, args.pattern, workers)
+    index.save(args.index)
+    print(f"Indexed {len(index.entries)} images ({hashed} hashed, {reused} unchanged, "
+          f"{removed} removed) -> {args.index}")
+
+
+def cmd_query(index, args):
+    query = _hash_for(index, args.image, args.kind)
+    for path, dist in index.query(query, args.kind, args.max_distance, args.limit):
+        print(f"{dist:>3}  {path}")
+
+
+def cmd_duplicates(index, args):
+    groups = index.duplicates(args.kind, args.max_distance)
+    for group in groups:
+        print(f"[{len(group)}]")
+        for path in group:
+            print(f"    {path}")
+    print(f"{len(groups)} near-duplicate groups (max distance {args.max_distance})")
+
+
+def cmd_check_pairs(index, args):
+    """Classify manifest pairs as identical / similar / suspect by hash distance."""
+    manifest = Path(args.manifest)
+    text = manifest.read_text(encoding="utf-8")
+    try:
+        lines = json.loads(text)
+    except json.JSONDecodeError:
+        lines = [json.loads(l) for l in text.splitlines() if l.strip()]
+    if isinstance(lines, dict):
+        lines = lines.get("pairs", [lines])
+    remaining = []
+    counts = {"identical": 0, "similar": 0, "suspect": 0, "error": 0}
+
+    for pair in lines:
+        if isinstance(pair, list):
+            pair = {"ios": pair[0], "android": pair[1]}
+        paths = [Path(pair[k]) if Path(pair[k]).is_absolute() else manifest.parent / pair[k]
+                 for k in ("ios", "android")]
+        try:
+            a, b = (_hash_for(index, p, args.kind) for p in paths)
+        except Exception as e:
+            verdict, dist = "error", None
+            print(json.dumps({**pair, "verdict": verdict, "error": str(e)}))
+        else:
+            dist = bin(a ^ b).count("1")
+            if dist == 0:
+                verdict = "identical"
+            elif dist > args.suspect_distance:
+                verdict = "suspect"
+            else:
+                verdict = "similar"
+            print(json.dumps({**pair, "verdict": verdict, "distance": dist}))
+
+        counts[verdict] += 1
+        if verdict != "identical":
+            # Resolved, so the new manifest works wherever it is written
+            remaining.append(dict(pair, ios=str(paths[0].resolve()),
+                                  android=str(paths[1].resolve())))
+
+    if args.remaining:
+        with open(args.remaining, "w", encoding="utf-8") as f:
+            for pair in remaining:
+                f.write(json.dumps(pair) + "\n")
+    print(json.dumps({"summary": counts}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perceptual-hash index over snapshot baselines")
+    parser.add_argument("--index", default=None,
+                        help="Index file (default: <compare cache dir>/phash-index.json)")
+    parser.add_argument("--kind", choices=HASH_KINDS, default="phash", help="Hash to compare")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="Build or refresh the index")
+    b.add_argument("dirs", nargs="*",
+                   help=f"Directories to index (default, in the repo: {', '.join(BASELINE_DIRS)})")
+    b.add_argument("--pattern", default="*.png", help="File glob (default: *.png)")
+    b.add_argument("-j", "--workers", type=int, default=0,
+                   help="Hashing processes (0 = one per CPU, default: 0)")
+
+    q = sub.add_parser("query", help="Find baselines similar to an image")
+    q.add_argument("image")
+    q.add_argument("--max-distance", type=int, default=8)
+    q.add_argument("--limit", type=int, default=20)
+
+    d = sub.add_parser("duplicates", help="List groups of near-duplicate baselines")
+    d.add_argument("--max-distance", type=int, default=2)
+
+    c = sub.add_parser("check-pairs", help="Classify compare-screenshots manifest pairs")
+    c.add_argument("manifest", help="JSON/JSONL manifest of {ios, android} pairs")
+    c.add_argument("--suspect-distance", type=int, default=32,
+                   help="Distance above which a pairing looks wrong (default: 32)")
+    c.add_argument("--remaining",
+                   help="Write non-identical pairs here as a new manifest (absolute paths)")
+
+    args = parser.parse_args()
+    args.index = args.index or default_index_path()
+    index = PHashIndex.load(args.index)
+
+    commands = {
+        "build": cmd_build,
+        "query": cmd_query,
+        "duplicates": cmd_duplicates,
+        "check-pairs": cmd_check_pairs,
+    }
+    commands[args.command](index, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Pixel diff between two screenshots with a per-channel tolerance.
+
+A pixel counts as changed when any of its R, G or B channels differs by more
+than CHANNEL_THRESHOLD (anti-aliasing tolerance). If the sizes differ, the
+second image is LANCZOS-resized to the first. The comparison is a single
+numpy pass over the whole frame.
+
+With --tiles, same-size pairs are compared tile by tile instead: byte-identical
+files short-circuit without being decoded, each TILE_SIZE x TILE_SIZE tile
+is hashed (the before image's tile hashes are cached by file content, see
+image_cache.py), and the pixel diff runs only on tiles whose hashes differ.
+The result is exactly the full-frame one, since identical tiles have no
+changed pixels; a pair with no changed tile writes no heat map. Pairs of
+different sizes fall back to the full-frame diff.
+
+Usage:
+    python3 pixel_diff.py <before.png> <after.png> [--mask mask.png] [--heatmap heat.png]
+    python3 pixel_diff.py <before.png> <after.png> --json
+    python3 pixel_diff.py <before.png> <after.png> --tiles --json
+
+Output (stdout):
+    Changed-pixel percentage with two decimals, e.g. "3.14"
+
+    With --json: {"diff_percent": 3.14, "changed_pixels": n, "size": [w, h],
+                  "box_count": n, "boxes": [[x0, y0, x1, y1], ...], "heatmap": path|null}
+    Boxes are bounding boxes of changed regions (end-exclusive), largest first,
+    capped at MAX_BOXES.
+    With --tiles the report adds "tiles": {"size": n, "total": n,
+    "changed": [[x0, y0, x1, y1], ...]} (null when the sizes differ).
+
+Exit codes:
+    0 = diff computed
+    2 = usage error or unreadable image
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+
+import numpy as np
+from PIL import Image
+
+from image_cache import ImageCache, file_digest
+
+CHANNEL_THRESHOLD = 30  # per-channel tolerance for anti-aliasing
+BOX_CELL = 16           # changed pixels within one cell of each other share a box
+MAX_BOXES = 20          # largest regions listed in --json output
+TILE_SIZE = 64          # --tiles: edge of the hashed tiles, in pixels
+
+
+def load_pair(img1_path, img2_path):
+    """Decode both images to HxWx3 uint8 arrays, resizing the second to the first."""
+    img1 = Image.open(img1_path).convert("RGB")
+    img2 = Image.open(img2_path).convert("RGB")
+
+    # Resize to same dimensions if different
+    if img1.size != img2.size:
+        img2 = img2.resize(img1.size, Image.LANCZOS)
+
+    return np.asarray(img1), np.asarray(img2)
+
+
+def channel_delta(arr1, arr2):
+    """Largest absolute per-channel difference for every pixel (HxW uint8)."""
+    return np.abs(arr1.astype(np.int16) - arr2.astype(np.int16)).max(axis=2).astype(np.uint8)
+
+
+def diff_mask(arr1, arr2, channel_threshold=CHANNEL_THRESHOLD):
+    """Boolean HxW mask of pixels where any channel differs by more than the tolerance."""
+    return channel_delta(arr1, arr2) > channel_threshold
+
+
+def diff_percent(mask):
+    """Percentage of True pixels in a diff mask."""
+    return (int(np.count_nonzero(mask)) / mask.size) * 100
+
+
+def pixel_diff_percent(img1_path, img2_path, channel_threshold=CHANNEL_THRESHOLD):
+    """Percentage of pixels whose channels differ by more than the tolerance."""
+    arr1, arr2 = load_pair(img1_path, img2_path)
+    return diff_percent(diff_mask(arr1, arr2, channel_threshold))
+
+
+def changed_regions(mask, cell=BOX_CELL):
+    """Bounding boxes (x0, y0, x1, y1) of changed regions, largest first.
+
+    The mask is pooled into cell x cell blocks, touching blocks are grouped
+    (8-connected), and each group's box is tightened to its changed pixels.
+    Only the pooled grid is walked in Python, never individual pixels.
+    """
+    h, w = mask.shape
+    grid_h, grid_w = -(-h // cell), -(-w // cell)
+    padded = np.zeros((grid_h * cell, grid_w * cell), dtype=bool)
+    padded[:h, :w] = mask
+    cells = padded.reshape(grid_h, cell, grid_w, cell).any(axis=(1, 3))
+
+    seen = np.zeros_like(cells)
+    boxes = []
+    for start in zip(*np.nonzero(cells)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        stack = [start]
+        r0 = r1 = start[0]
+        c0 = c1 = start[1]
+        while stack:
+            r, c = stack.pop()
+            r0, r1, c0, c1 = min(r0, r), max(r1, r), min(c0, c), max(c1, c)
+            for nr in range(max(r - 1, 0), min(r + 2, grid_h)):
+                for nc in range(max(c - 1, 0), min(c + 2, grid_w)):
+                    if cells[nr, nc] and not seen[nr, nc]:
+                        seen[nr, nc] = True
+                        stack.append((nr, nc))
+
+        y0, x0 = r0 * cell, c0 * cell
+        region = mask[y0:(r1 + 1) * cell, x0:(c1 + 1) * cell]
+        rows = np.flatnonzero(region.any(axis=1))
+        cols = np.flatnonzero(region.any(axis=0))
+        boxes.append((int(x0 + cols[0]), int(y0 + rows[0]),
+                      int(x0 + cols[-1] + 1), int(y0 + rows[-1] + 1)))
+
+    boxes.sort(key=lambda b: (b[2] - b[0]) * (b[3] - b[1]), reverse=True)
+    return boxes
+
+
+def decode(path):
+    """One image as an HxWx3 uint8 array."""
+    return np.asarray(Image.open(path).convert("RGB"))
+
+
+def tile_bounds(shape, tile=TILE_SIZE):
+    """(x0, y0, x1, y1) of every tile of an HxW frame, row-major; edge tiles are clipped."""
+    h, w = shape[:2]
+    return [(x, y, min(x + tile, w), min(y + tile, h))
+            for y in range(0, h, tile) for x in range(0, w, tile)]
+
+
+def tile_hashes(arr, tile=TILE_SIZE):
+    """64-bit BLAKE2b hash of every tile's pixels, in tile_bounds() order."""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(arr[y0:y1, x0:x1].tobytes(), digest_size=8).digest(),
+                       "little")
+        for x0, y0, x1, y1 in tile_bounds(arr.shape, tile)
+    ], dtype=np.uint64)
+
+
+def tiled_diff(before_path, after_path, channel_threshold=CHANNEL_THRESHOLD,
+               tile=TILE_SIZE, cache=None):
+    """Diff mask of a same-size pair computed only over tiles whose hashes differ.
+
+    Returns (mask, changed tile bounds, tile count, before array, after
+    array). The arrays are None when they were never decoded: the before
+    image when no tile changed and its hashes came from the cache, both
+    when the files are byte-identical. With a different-size pair, returns
+    None so the caller can fall back to the full-frame diff.
+    """
+    w, h = Image.open(before_path).size
+    if Image.open(after_path).size != (w, h):
+        return None
+    total = len(tile_bounds((h, w), tile))
+    before_digest = file_digest(before_path)
+    if before_digest == file_digest(after_path):
+        return np.zeros((h, w), dtype=bool), [], total, None, None
+
+    arr2 = decode(after_path)
+    decoded = {}
+
+    def before():
+        if "arr" not in decoded:
+            decoded["arr"] = decode(before_path)
+        return decoded["arr"]
+
+    if cache is None:
+        hashes1 = tile_hashes(before(), tile)
+    else:
+        hashes1 = cache.get_or_compute(before_path, ("tile-hashes", tile),
+                                       lambda: tile_hashes(before(), tile), before_digest)
+    hashes2 = tile_hashes(arr2, tile)
+    bounds = tile_bounds(arr2.shape, tile)
+    changed = [bounds[i] for i in np.flatnonzero(hashes1 != hashes2)]
+
+    mask = np.zeros((h, w), dtype=bool)
+    if changed:
+        arr1 = before()
+        for x0, y0, x1, y1 in changed:
+            mask[y0:y1, x0:x1] = diff_mask(arr1[y0:y1, x0:x1], arr2[y0:y1, x0:x1],
+                                           channel_threshold)
+    return mask, changed, total, decoded.get("arr"), arr2
+
+
+def mask_image(mask):
+    """Black/white image of a diff mask (white = changed)."""
+    return Image.fromarray(mask.astype(np.uint8) * 255)
+
+
+def heatmap_image(arr1, arr2, channel_threshold=CHANNEL_THRESHOLD):
+    """Dimmed grayscale of the first image with changed pixels tinted red.
+
+    The red intensity scales with the per-channel delta, so large changes
+    stand out from ones just over the tolerance.
+    """
+    delta = channel_delta(arr1, arr2)
+    base = np.asarray(Image.fromarray(arr1).convert("L"), dtype=np.float32) * 0.35
+    out = np.repeat(base[..., None], 3, axis=2)
+
+    changed = delta > channel_threshold
+    heat = delta.astype(np.float32)[changed]
+    out[changed, 0] = 128 + heat / 2
+    out[changed, 1] = base[changed] * 0.5
+    out[changed, 2] = base[changed] * 0.5
+    return Image.fromarray(out.clip(0, 255).astype(np.uint8))
+
+
+def diff_report(before, after, channel_threshold=CHANNEL_THRESHOLD, tiles=False,
+                tile_size=TILE_SIZE, cache=None, mask_path=None, heatmap_path=None):
+    """The --json report for one pair, writing the mask / heat map PNGs if asked.
+
+    With tiles, the tile-hash path is used for same-size pairs and cache
+    (an ImageCache, or None) holds the baseline tile hashes.
+    """
+    tiled = None
+    if tiles:
+        tiled = tiled_diff(before, after, channel_threshold, tile_size, cache)
+    if tiled is None:
+        arr1, arr2 = load_pair(before, after)
+        mask = diff_mask(arr1, arr2, channel_threshold)
+    else:
+        mask, changed_tiles, total_tiles, arr1, arr2 = tiled
+
+    if mask_path:
+        mask_image(mask).save(mask_path)
+    if heatmap_path and tiled is not None and not changed_tiles:
+        heatmap_path = None  # nothing to show
+    if heatmap_path:
+        if arr1 is None:
+            arr1 = decode(before)
+        heatmap_image(arr1, arr2, channel_threshold).save(heatmap_path)
+
+    boxes = changed_regions(mask)
+    report = {
+        "diff_percent": round(diff_percent(mask), 2),
+        "changed_pixels": int(np.count_nonzero(mask)),
+        "size": [mask.shape[1], mask.shape[0]],
+        "box_count": len(boxes),
+        "boxes": [list(b) for b in boxes[:MAX_BOXES]],
+        "heatmap": heatmap_path,
+    }
+    if tiles:
+        report["tiles"] = None if tiled is None else {
+            "size": tile_size,
+            "total": total_tiles,
+            "changed": [list(t) for t in changed_tiles],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pixel diff between two screenshots")
+    parser.add_argument("before", help="Before / baseline image")
+    parser.add_argument("after", help="After / candidate image")
+    parser.add_argument("--channel-threshold", type=int, default=CHANNEL_THRESHOLD,
+                        help=f"Per-channel tolerance (default: {CHANNEL_THRESHOLD})")
+    parser.add_argument("--mask", help="Write the changed-pixel mask to this PNG")
+    parser.add_argument("--heatmap", help="Write a diff heat map to this PNG")
+    parser.add_argument("--json", action="store_true",
+                        help="Print a JSON report with changed-region bounding boxes")
+    parser.add_argument("--tiles", action="store_true",
+                        help="Only diff tiles whose hashes differ (same-size pairs)")
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE,
+                        help=f"Tile edge in pixels for --tiles (default: {TILE_SIZE})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write cached baseline tile hashes")
+    args = parser.parse_args()
+
+    try:
+        report = diff_report(args.before, args.after, args.channel_threshold,
+                             tiles=args.tiles, tile_size=args.tile_size,
+                             cache=None if args.no_cache else ImageCache(),
+                             mask_path=args.mask, heatmap_path=args.heatmap)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(f"{report['diff_percent']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,9 @@ REPO_ROOT="$(cd "$(dirname "$0")/../.." && pwd)"
 TIMESTAMP=$(date +%Y%m%d-%H%M%S)
 REPORT_DIR="${REPO_ROOT}/shared/test-output/self-heal-dual-$TIMESTAMP"
 REPORT_FILE="$REPORT_DIR/report.md"
+PARITY_PAIRS="$REPORT_DIR/parity-pairs.tsv"
+PARITY_MANIFEST="$REPORT_DIR/parity-manifest.jsonl"
+PARITY_RESULTS="$REPORT_DIR/parity-results.jsonl"
 
 # Defaults
 CATEGORY="teams-official"
@@ -576,13 +579,12 @@ for card_path in "${cards_to_test[@]}"; do
         if [ "$ios_status" = "CRASH" ] || [ "$android_status" = "CRASH" ]; then
             notes="PARITY MISMATCH (crash)"
         elif [ -f "$ios_ss" ] && [ -f "$android_ss" ] && [ "$ios_sz" -gt 5000 ] && [ "$android_sz" -gt 5000 ]; then
-            # Use pixel-level image comparison instead of file-size heuristic
-            compare_result=$(python3 "$REPO_ROOT/shared/scripts/compare-screenshots.py" "$ios_ss" "$android_ss" --threshold 0.20 2>/dev/null || echo '{"diff": -1, "status": "ERROR"}')
-            parity_diff=$(echo "$compare_result" | python3 -c "import sys,json; d=json.load(sys.stdin); print(f\"{d['diff']*100:.1f}%\")" 2>/dev/null || echo "?")
-            compare_status=$(echo "$compare_result" | python3 -c "import sys,json; print(json.load(sys.stdin).get('status','ERROR'))" 2>/dev/null || echo "ERROR")
-            if [ "$compare_status" = "MISMATCH" ]; then
-                notes="PARITY MISMATCH (diff: $parity_diff)"
-            fi
+            # Queue for pixel-level comparison — every queued pair is diffed in
+            # a single compare-screenshots.py batch run after the lock-step pass,
+            # which then fills in this row's Diff and Notes. Plain TSV here; it
+            # becomes a JSON manifest once, before that run
+            printf '%s\t%s\t%s\n' "$card_name" "$ios_ss" "$android_ss" >> "$PARITY_PAIRS"
+            parity_diff="queued"
         elif [ "$ios_status" != "$android_status" ]; then
             notes="PARITY MISMATCH"
         fi
@@ -633,6 +635,67 @@ cat >> "$REPORT_FILE" << EOF
 
 EOF
 
+# =============================================================================
+# Cross-platform pixel comparison (one batch process for all queued pairs)
+# =============================================================================
+if [ -s "$PARITY_PAIRS" ]; then
+    echo "━━━ Parity Comparison ($(wc -l < "$PARITY_PAIRS" | tr -d ' ') pairs) ━━━"
+    # name<TAB>ios<TAB>android -> JSONL, escaping quotes and backslashes in names/paths
+    python3 -c '
+import json, sys
+for line in open(sys.argv[1], encoding="utf-8"):
+    print(json.dumps(dict(zip(("name", "ios", "android"), line.rstrip("\n").split("\t")))))
+' "$PARITY_PAIRS" > "$PARITY_MANIFEST"
+    # Default metric (1 - SSIM) at its calibrated default threshold
+    python3 "$SCRIPT_DIR/compare-screenshots.py" --manifest "$PARITY_MANIFEST" --workers 0 \
+        > "$PARITY_RESULTS" 2>/dev/null || true
+
+    # Fill the per-card rows queued above from the results, then append the
+    # parity table (also shown on the terminal)
+    PARITY_RESULTS="$PARITY_RESULTS" REPORT_FILE="$REPORT_FILE" python3 << 'PARITY_EOF'
+import json, os
+
+rows, summary = [], {}
+with open(os.environ["PARITY_RESULTS"]) as f:
+    for line in f:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "summary" in record:
+            summary = record["summary"]
+        else:
+            rows.append(record)
+
+def diff_text(r):
+    return f"{r['diff'] * 100:.1f}%" if r["status"] != "ERROR" else "?"
+
+by_name = {r["name"]: r for r in rows}
+report = os.environ["REPORT_FILE"]
+with open(report) as f:
+    lines = f.read().splitlines()
+for i, line in enumerate(lines):
+    cells = [c.strip() for c in line.strip().strip("|").split("|")]
+    if len(cells) != 8 or cells[6] != "queued":
+        continue
+    r = by_name.get(cells[1])
+    # A pair with no result (e.g. the batch run failed) is unknown, as before
+    cells[6] = diff_text(r) if r else "?"
+    if r and r["status"] == "MISMATCH":
+        cells[7] = f"PARITY MISMATCH (diff: {cells[6]})"
+    lines[i] = "| " + " | ".join(cells) + " |"
+
+table = ["", "## Cross-Platform Parity", "", "| Card | Diff | Status |", "|------|------|--------|"]
+table += [f"| {r['name']} | {diff_text(r)} | {r['status']} |" for r in rows]
+if summary:
+    table += ["", f"**Parity:** {summary['total']} compared | {summary['pass']} pass | "
+                  f"{summary['mismatch']} mismatch | {summary['error']} error", ""]
+with open(report, "w") as f:
+    f.write("\n".join(lines + table) + "\n")
+print("\n".join(table))
+PARITY_EOF
+    echo ""
+fi
+
 # =============================================================================
 # Retry failed cards (lock-step)
 # =============================================================================
@@ -803,6 +866,7 @@ echo "" >> "$REPORT_FILE"
 
 echo "## Artifacts" >> "$REPORT_FILE"
 echo "- Report: \`$REPORT_FILE\`" >> "$REPORT_FILE"
+[ -s "$PARITY_RESULTS" ] && echo "- Parity results: \`$PARITY_RESULTS\`" >> "$REPORT_FILE"
 echo "- iOS screenshots: \`$REPORT_DIR/screenshots/ios/\`" >> "$REPORT_FILE"
 echo "- Android screenshots: \`$REPORT_DIR/screenshots/android/\`" >> "$REPORT_FILE"
 
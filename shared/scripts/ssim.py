@@ -0,0 +1,174 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Windowed structural similarity (SSIM) and multi-scale SSIM on numpy arrays.
+
+Local means, variances and covariance come from one separable box filter
+over the stacked x, y, x² + y², xy planes, in float32 and in bands of
+STRIP_ROWS rows, so a 360x640 pair costs a few ms of whole-array adds
+rather than a per-window Python loop.
+
+Usage:
+    from ssim import ssim, ms_ssim
+
+    score, tiles = ssim(a, b)          # a, b: float arrays in [0, 1], HxW or HxWx3
+    score = ms_ssim(a, b)
+"""
+
+import numpy as np
+
+K1 = 0.01
+K2 = 0.03
+WIN_SIZE = 7            # Uniform window side, as in Wang et al. / skimage default
+TILE_GRID = (4, 8)      # (columns, rows) of the per-tile score map
+STRIP_ROWS = 32         # Output rows per pass; keeps the temporaries cache-sized
+SSIM_VERSION = 2        # bump when scores change; saved report results are keyed on it
+
+# Per-scale exponents from Wang, Simoncelli & Bovik (2003)
+MS_SSIM_WEIGHTS = (0.0448, 0.2856, 0.3001, 0.2363, 0.1333)
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)   # BT.601
+
+
+def to_luma(arr):
+    """Collapse an HxWx3 RGB array to BT.601 luma; 2-D arrays pass through."""
+    if arr.ndim == 3:
+        return arr[..., :3].astype(np.float32) @ LUMA_WEIGHTS
+    return arr.astype(np.float32)
+
+
+def _window_sums(arr, win, axis):
+    """Sums of every win consecutive entries along a negative axis (-1 or -2).
+
+    Built by doubling (pairs, then fours, ...) and adding the blocks that
+    make up win, so a 7-wide window costs 4 adds rather than 6, and there
+    are none of the long cumulative sums whose float32 round-off would
+    swamp the small variances of flat regions.
+    """
+    n = arr.shape[axis] - win + 1
+    trailing = (slice(None),) * (-axis - 1)
+
+    def span(a, start, stop):
+        return a[(Ellipsis, slice(start, stop)) + trailing]
+
+    total, offset, block, size = None, 0, arr, 1
+    while True:
+        if win & size:
+            part = span(block, offset, offset + n)
+            if total is None:
+                total = part.copy()
+            else:
+                total += part
+            offset += size
+        if size * 2 > win:
+            return total
+        block = span(block, None, -size) + span(block, size, None)
+        size *= 2
+
+
+def box_filter(arr, win=WIN_SIZE):
+    """Mean over every win x win window ('valid' output) of the last two axes."""
+    sums = _window_sums(_window_sums(arr, win, -2), win, -1)
+    sums *= np.float32(1 / (win * win))
+    return sums
+
+
+def _luma_pair(a, b):
+    """Both images as luma arrays; SSIM is only defined for equal shapes."""
+    x, y = to_luma(a), to_luma(b)
+    if x.shape != y.shape:
+        raise ValueError(f"image shapes differ: {x.shape} vs {y.shape}")
+    return x, y
+
+
+def _ssim_components(x, y, win, data_range):
+    """Return the luminance and contrast-structure maps for two luma arrays.
+
+    Computed STRIP_ROWS output rows at a time: a whole-frame pass allocates
+    a dozen frame-sized temporaries, and faulting those in costs more than
+    the arithmetic.
+    """
+    rows = x.shape[0] - win + 1
+    strips = [_ssim_strip(x[r:r + STRIP_ROWS + win - 1], y[r:r + STRIP_ROWS + win - 1],
+                          win, data_range)
+              for r in range(0, rows, STRIP_ROWS)]
+    return (np.concatenate([luminance for luminance, _ in strips]),
+            np.concatenate([contrast_structure for _, contrast_structure in strips]))
+
+
+def _ssim_strip(x, y, win, data_range):
+    """_ssim_components for one band of rows."""
+    c1 = (K1 * data_range) ** 2
+    c2 = (K2 * data_range) ** 2
+    # Unbiased (sample) covariance, matching skimage's default
+    cov_norm = win * win / (win * win - 1)
+
+    # The variances only appear as var_x + var_y, so four local means in one
+    # filter pass cover every term
+    mu_x, mu_y, mean_sq, mean_xy = box_filter(np.stack([x, y, x * x + y * y, x * y]), win)
+    mu_xy = mu_x * mu_y
+    mu_sq = mu_x * mu_x + mu_y * mu_y
+
+    luminance = (2 * mu_xy + c1) / (mu_sq + c1)
+    contrast_structure = (2 * cov_norm * (mean_xy - mu_xy) + c2) / (cov_norm * (mean_sq - mu_sq) + c2)
+    return luminance, contrast_structure
+
+
+def ssim_map(a, b, win=WIN_SIZE, data_range=1.0):
+    """Per-window SSIM map of shape (H - win + 1, W - win + 1)."""
+    luminance, contrast_structure = _ssim_components(*_luma_pair(a, b), win, data_range)
+    return luminance * contrast_structure
+
+
+def _split_starts(n, parts):
+    """Start offsets of np.array_split(range(n), parts)."""
+    size, extra = divmod(n, parts)
+    return np.cumsum([0] + [size + 1] * extra + [size] * (parts - extra - 1))
+
+
+def tile_scores(score_map, grid=TILE_GRID):
+    """Average a score map over a (columns, rows) grid of tiles, split as np.array_split does."""
+    cols, rows = grid
+    h, w = score_map.shape
+    row_starts, col_starts = _split_starts(h, rows), _split_starts(w, cols)
+    sums = np.add.reduceat(np.add.reduceat(score_map, row_starts, axis=0, dtype=np.float64),
+                           col_starts, axis=1)
+    counts = np.outer(np.diff(row_starts, append=h), np.diff(col_starts, append=w))
+    return sums / counts
+
+
+def ssim(a, b, win=WIN_SIZE, data_range=1.0, grid=TILE_GRID):
+    """Mean SSIM plus a rows x cols map of per-tile SSIM."""
+    score_map = ssim_map(a, b, win, data_range)
+    return float(score_map.mean(dtype=np.float64)), tile_scores(score_map, grid)
+
+
+def _downsample(arr):
+    """2x2 average pool, dropping an odd trailing row/column."""
+    h, w = arr.shape[0] // 2 * 2, arr.shape[1] // 2 * 2
+    arr = arr[:h, :w]
+    return (arr[0::2, 0::2] + arr[1::2, 0::2] + arr[0::2, 1::2] + arr[1::2, 1::2]) / 4
+
+
+def ms_ssim(a, b, win=WIN_SIZE, data_range=1.0, weights=MS_SSIM_WEIGHTS):
+    """Multi-scale SSIM; drops the coarsest scales if the image is too small."""
+    x, y = _luma_pair(a, b)
+    max_scales = 1
+    while min(x.shape) >> max_scales >= win and max_scales < len(weights):
+        max_scales += 1
+    weights = np.array(weights[:max_scales])
+    weights = weights / weights.sum()
+
+    factors = []
+    for scale in range(max_scales):
+        luminance, contrast_structure = _ssim_components(x, y, win, data_range)
+        if scale == max_scales - 1:
+            factors.append((luminance * contrast_structure).mean(dtype=np.float64))
+        else:
+            factors.append(contrast_structure.mean(dtype=np.float64))
+            x, y = _downsample(x), _downsample(y)
+
+    # Negative structure terms would make fractional powers undefined
+    factors = np.maximum(np.array(factors), 0.0)
+    return float(np.prod(factors ** weights))
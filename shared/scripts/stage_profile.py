@@ -0,0 +1,188 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Per-stage wall time, counters and peak allocation for one comparison.
+
+A StageProfile times named stages with `with profile.stage("decode"):`.
+Stages may nest (a cache lookup that decodes on a miss); each stage's "ms"
+is its own time, excluding the stages inside it, so the stage times of a
+pair add up to its total. Peak allocation is measured with tracemalloc: a
+stage's "peak_alloc_bytes" is the highest traced memory above what was
+allocated when it started, including its nested stages. tracemalloc sees
+Python and numpy allocations but not PIL's internal image buffers, and
+slows allocation-heavy Python code; it is only running while a profile is
+being recorded.
+
+StageHistogram aggregates the reports of many pairs into per-stage totals,
+percentiles and a bucketed latency histogram for batch summaries.
+
+Usage:
+    from stage_profile import StageProfile, StageHistogram
+
+    profile = StageProfile()
+    with profile:
+        with profile.stage("decode"):
+            img = Image.open(path).convert("RGB")
+            profile.count("decoded_pixels", img.width * img.height)
+    report = profile.report()
+    # {"total_ms": ..., "peak_alloc_bytes": ..., "decoded_pixels": ...,
+    #  "stages": {"decode": {"ms": ..., "calls": 1, "peak_alloc_bytes": ...}}}
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class StageProfile:
+    """Stage timings, counters and traced peak allocation for one comparison."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.counters = {}
+        self._stack = []
+        self._started_tracing = False
+        self._start = None
+        self._total = 0.0
+        self._base = 0
+        self._peak = 0
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.trace_memory:
+            self._base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._total += time.perf_counter() - self._start
+        if self.trace_memory:
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1] - self._base)
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        return False
+
+    def stage(self, name):
+        """Context manager timing one run of a named stage."""
+        return _Stage(self, name)
+
+    def count(self, name, n):
+        """Add n to a counter (e.g. decoded_pixels)."""
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def report(self):
+        """JSON-ready {"total_ms", "peak_alloc_bytes", counters..., "stages"}."""
+        out = {"total_ms": round(self._total * 1000, 3)}
+        if self.trace_memory:
+            out["peak_alloc_bytes"] = self._peak
+        out.update(self.counters)
+        out["stages"] = {
+            name: {key: round(value * 1000, 3) if key == "ms" else value
+                   for key, value in stats.items()}
+            for name, stats in self.stages.items()
+        }
+        return out
+
+
+class _Stage:
+    """One entry on a StageProfile's stack of running stages."""
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self.children = 0.0
+        self.peak = 0
+
+    def __enter__(self):
+        p = self.profile
+        if p.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing peak so far before this stage resets it
+            if p._stack:
+                parent = p._stack[-1]
+                parent.peak = max(parent.peak, peak)
+            else:
+                p._peak = max(p._peak, peak - p._base)
+            self.base = current
+            tracemalloc.reset_peak()
+        p._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        p = self.profile
+        elapsed = time.perf_counter() - self.start
+        p._stack.pop()
+        stats = p.stages.setdefault(self.name, {"ms": 0.0, "calls": 0})
+        stats["ms"] += elapsed - self.children
+        stats["calls"] += 1
+        if p.trace_memory and tracemalloc.is_tracing():
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            stats["peak_alloc_bytes"] = max(stats.get("peak_alloc_bytes", 0), peak - self.base)
+            if p._stack:
+                p._stack[-1].peak = max(p._stack[-1].peak, peak)
+            else:
+                # The next top-level stage resets the peak; keep this one's
+                p._peak = max(p._peak, peak - p._base)
+        if p._stack:
+            p._stack[-1].children += elapsed
+        return False
+
+
+class StageHistogram:
+    """Per-stage latency distribution over many StageProfile reports."""
+
+    def __init__(self, buckets_ms=BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.samples = {}
+        self.peaks = {}
+        self.counters = {}
+
+    def add(self, report):
+        """Fold one StageProfile.report() in."""
+        self.samples.setdefault("total", []).append(report["total_ms"])
+        for name, stats in report.get("stages", {}).items():
+            self.samples.setdefault(name, []).append(stats["ms"])
+            if "peak_alloc_bytes" in stats:
+                self.peaks[name] = max(self.peaks.get(name, 0), stats["peak_alloc_bytes"])
+        if "peak_alloc_bytes" in report:
+            self.peaks["total"] = max(self.peaks.get("total", 0), report["peak_alloc_bytes"])
+        for key, value in report.items():
+            if key not in ("total_ms", "peak_alloc_bytes", "stages") and isinstance(value, int):
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self):
+        """{"buckets_ms": [...], "counters": {...}, "stages": {name: stats}}.
+
+        Each stage's "histogram" has one count per bucket (ms <= bound) plus a
+        final overflow count; "share" is its fraction of all profiled time.
+        """
+        total = sum(self.samples.get("total", [])) or 1.0
+        stages = {}
+        for name, ms in self.samples.items():
+            arr = np.asarray(ms)
+            counts = np.bincount(np.searchsorted(self.buckets_ms, arr, side="left"),
+                                 minlength=len(self.buckets_ms) + 1)
+            stages[name] = {
+                "pairs": len(ms),
+                "total_ms": round(float(arr.sum()), 3),
+                "share": round(float(arr.sum()) / total, 4) if name != "total" else 1.0,
+                "mean_ms": round(float(arr.mean()), 3),
+                "p50_ms": round(float(np.percentile(arr, 50)), 3),
+                "p90_ms": round(float(np.percentile(arr, 90)), 3),
+                "max_ms": round(float(arr.max()), 3),
+                "histogram": counts.tolist(),
+            }
+            if name in self.peaks:
+                stages[name]["max_peak_alloc_bytes"] = self.peaks[name]
+        return {"buckets_ms": list(self.buckets_ms), "counters": self.counters, "stages": stages}
@@ -80,7 +80,10 @@ case "$CATEGORY" in
         ;;
 esac
 
-TOTAL=$(echo "$CARD_FILES" | wc -l | tr -d ' ')
+TOTAL=0
+if [ -n "$CARD_FILES" ]; then
+    TOTAL=$(echo "$CARD_FILES" | wc -l | tr -d ' ')
+fi
 echo "Found $TOTAL cards to test"
 echo ""
 
@@ -89,11 +92,19 @@ PASS=0
 FAIL=0
 WARN=0
 
-for CARD_FILE in $CARD_FILES; do
+# One pass over the card index: JSON validity and unknown element types for
+# every card (see card_index.py; unchanged cards are not re-parsed)
+CARD_STATUS=""
+if [ -n "$CARD_FILES" ]; then
+    CARD_STATUS=$(python3 "$(dirname "$0")/card_index.py" --cards-dir "$CARD_DIR" unknown --tsv $CARD_FILES)
+fi
+
+while IFS=$'\t' read -r CARD_FILE STATUS UNKNOWN_TYPES; do
+    [ -n "$CARD_FILE" ] || continue
     FILENAME=$(basename "$CARD_FILE" .json)
 
     # Quick JSON validation
-    if ! python3 -c "import json; json.load(open('$CARD_FILE'))" 2>/dev/null; then
+    if [ "$STATUS" != "ok" ]; then
         echo "✗ $FILENAME: Invalid JSON"
         echo "FAIL: $FILENAME - Invalid JSON" >> "$REPORT_FILE"
         FAIL=$((FAIL + 1))
@@ -103,34 +114,6 @@ for CARD_FILE in $CARD_FILES; do
     # Check for known problematic patterns
     ISSUES=""
 
-    # Check for unknown element types
-    UNKNOWN_TYPES=$(python3 -c "
-import json
-known = {'TextBlock','Image','Media','RichTextBlock','Container','ColumnSet','Column',
-         'ImageSet','FactSet','ActionSet','Table','TableRow','TableCell',
-         'Input.Text','Input.Number','Input.Date','Input.Time','Input.Toggle',
-         'Input.ChoiceSet','Input.Rating','Input.DataGrid',
-         'Carousel','CarouselPage','Accordion','CodeBlock','Rating',
-         'ProgressBar','ProgressRing','Spinner','TabSet','List','CompoundButton',
-         'Badge','DonutChart','BarChart','LineChart','PieChart','Chart.Donut','Icon',
-         'Action.OpenUrl','Action.Submit','Action.ShowCard','Action.ToggleVisibility',
-         'Action.Execute','Action.Popover','Action.ResetInputs','Action.RunCommands',
-         'Action.OpenUrlDialog','AdaptiveCard','TextRun','CitationRun','Layout.Flow',
-         'Layout.AreaGrid','Data.Query','AdaptiveCardReference','DocumentReference'}
-card = json.load(open('$CARD_FILE'))
-def find(obj, found=set()):
-    if isinstance(obj, dict):
-        t = obj.get('type','')
-        if t and t not in known:
-            found.add(t)
-        for v in obj.values(): find(v, found)
-    elif isinstance(obj, list):
-        for item in obj: find(item, found)
-    return found
-unknowns = find(card)
-if unknowns: print(','.join(sorted(unknowns)))
-" 2>/dev/null)
-
     if [ -n "$UNKNOWN_TYPES" ]; then
         ISSUES="unknown types: $UNKNOWN_TYPES"
     fi
@@ -144,7 +127,7 @@ if unknowns: print(','.join(sorted(unknowns)))
         echo "PASS: $FILENAME" >> "$REPORT_FILE"
         PASS=$((PASS + 1))
     fi
-done
+done <<< "$CARD_STATUS"
 
 echo ""
 echo "================================"
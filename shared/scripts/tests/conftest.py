@@ -0,0 +1,9 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+import sys
+from pathlib import Path
+
+# shared/scripts modules are run as scripts, not installed — make them importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
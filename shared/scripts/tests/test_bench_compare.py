@@ -0,0 +1,46 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+bench_compare.py finds its pairs in the committed baselines, summarizes
+per-pair timings, and flags cases that slowed down against an earlier run.
+"""
+
+import pytest
+
+pytest.importorskip("PIL")
+
+import bench_compare
+
+
+def test_pairs_come_from_committed_baselines(tmp_path):
+    pairs = bench_compare.discover_pairs(2, tmp_path)
+    assert set(pairs) == {"parity", "theme", "same", "legacy"}
+    for name, found in pairs.items():
+        assert 0 < len(found) <= 2, name
+    ios, android = pairs["parity"][0]
+    assert "Baselines" in ios and "snapshots/images" in android
+    assert pairs["theme"][0][1].endswith("_Dark.png")
+    assert pairs["same"][0][1].startswith(str(tmp_path))
+
+
+def test_summarize_and_compare():
+    result = bench_compare.summarize([0.01, 0.02, 0.03, 0.04], wall=0.1, pairs=2)
+    assert result["samples"] == 4
+    assert result["p50_ms"] == 25.0
+    assert result["max_ms"] == 40.0
+    assert result["throughput_per_s"] == 40.0
+
+    old = [{"case": "a", "p50_ms": 10.0}, {"case": "b", "p50_ms": 10.0}]
+    new = [{"case": "a", "p50_ms": 11.0}, {"case": "b", "p50_ms": 20.0},
+           {"case": "c", "p50_ms": 5.0}]
+    slower = bench_compare.compare_runs(new, old, tolerance=0.25)
+    assert len(slower) == 1 and slower[0].startswith("b ")
+
+
+def test_ssim_kernel_cases_run(tmp_path):
+    pairs = bench_compare.discover_pairs(1, tmp_path)["parity"]
+    for case in ("ssim-kernel", "ms-ssim-kernel"):
+        result = bench_compare.run_in_process(case, pairs, 1, str(tmp_path))
+        assert result["samples"] == 1 and result["p50_ms"] > 0
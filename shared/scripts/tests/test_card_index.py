@@ -0,0 +1,91 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+card_index.py must answer type / property / unknown-type queries from its
+inverted maps, and only re-parse cards that changed since the last build.
+"""
+
+import argparse
+import json
+import os
+
+import card_index
+
+
+def write_card(root, name, body):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"type": "AdaptiveCard", "version": "1.5", "body": body}))
+    return path
+
+
+def test_queries_and_incremental_refresh(tmp_path):
+    cards = tmp_path / "cards"
+    write_card(cards, "table.json", [{"type": "Table", "showGridLines": False, "rows": [
+        {"type": "TableRow", "cells": [{"type": "TableCell", "items": [
+            {"type": "TextBlock", "text": "x"}]}]}]}])
+    widget = write_card(cards, "widget.json", [{"type": "FutureWidget"}])
+    (cards / "table.data.json").write_text('{"type": "NotACard"}')
+    index_path = tmp_path / "index.json"
+
+    index = card_index.CardIndex.load(index_path, cards)
+    assert index.update() == (2, 0, 0)
+    index.save(index_path)
+
+    assert index.cards_with("TextBlock") == ["table.json"]
+    assert index.cards_with("Table", "showGridLines") == ["table.json"]
+    assert index.cards_with("Image") == []
+    # Types seen in one card don't leak into the next one's scan
+    assert index.unknown() == {"widget.json": ["FutureWidget"]}
+
+    # Reloaded from disk: nothing to re-parse until a card changes
+    index = card_index.CardIndex.load(index_path, cards)
+    assert index.update() == (0, 2, 0)
+    assert index.cards_with("Table") == ["table.json"]
+
+    write_card(cards, "widget.json", [{"type": "Image", "url": "x.png"}])
+    st = widget.stat()
+    os.utime(widget, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    (cards / "table.json").unlink()
+    assert index.update() == (1, 0, 1)
+    assert index.unknown() == {}
+    assert index.cards_with("Image") == ["widget.json"]
+    assert "Table" not in index.types
+
+
+def test_committed_corpus():
+    index = card_index.CardIndex(card_index.validate_test_cards.DEFAULT_CARDS_DIR)
+    index.update()
+    assert "element-samples/table-basic.json" in index.cards_with("Table")
+    assert "edge-all-unknown-types.json" in index.unknown()
+    counts, _ = index.coverage()
+    assert counts["AdaptiveCard"] == len(index.entries)
+
+
+def test_unknown_tsv_reports_only_the_cards_given(tmp_path, capsys):
+    cards = tmp_path / "cards"
+    widget = write_card(cards, "widget.json", [{"type": "FutureWidget"}])
+    (cards / "broken.json").write_text("{")
+    index = card_index.CardIndex(cards)
+    index.update()
+
+    card_index.cmd_unknown(index, argparse.Namespace(cards=[], tsv=True))
+    assert capsys.readouterr().out == ""
+
+    card_index.cmd_unknown(index, argparse.Namespace(cards=[str(widget)], tsv=True))
+    assert capsys.readouterr().out == f"{widget}\tok\tFutureWidget\n"
+
+
+def test_queries_run_when_the_index_cannot_be_saved(tmp_path, monkeypatch, capsys):
+    cards = tmp_path / "cards"
+    write_card(cards, "table.json", [{"type": "Table", "rows": []}])
+    blocked = tmp_path / "cache"
+    blocked.write_text("not a directory")
+    monkeypatch.setattr("sys.argv", ["card_index.py", "--index", str(blocked / "index.json"),
+                                     "--cards-dir", str(cards), "query", "Table"])
+
+    card_index.main()
+    assert capsys.readouterr().out == "table.json\n"
+    assert blocked.read_text() == "not a directory"
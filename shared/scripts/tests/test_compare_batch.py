@@ -0,0 +1,150 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+compare-screenshots.py batch mode must read JSON and JSONL manifests, pair
+directories by stem or relative path, stream ordered results whatever the
+worker count, and turn every bad pair into an ERROR row without stopping.
+"""
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PIL.Image")
+
+import compare_client
+
+engine = compare_client._engine()
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+IOS_BASELINES = REPO_ROOT / "ios/Tests/VisualTests/Snapshots/Baselines"
+LIGHT = str(IOS_BASELINES / "table_iPhone_15_Pro.png")
+DARK = str(IOS_BASELINES / "table_iPhone_15_Pro_Dark.png")
+
+
+def test_unknown_metric_or_crop_is_an_error():
+    if not Path(LIGHT).exists():
+        pytest.skip("baseline not present")
+    for pair in ({"metric": "ssmi"}, {"crop": "manual"}):
+        record = engine.compare_pair(dict({"name": "x", "ios": LIGHT, "android": DARK}, **pair))
+        assert record["status"] == "ERROR"
+        assert "unknown" in record["error"]
+    daemon_answer = engine.handle_request({"op": "compare", "ios": LIGHT, "android": DARK,
+                                           "metric": "psnr"})
+    assert daemon_answer["status"] == "ERROR" and "psnr" in daemon_answer["error"]
+
+
+def write_json(path, value):
+    path.write_text(json.dumps(value), encoding="utf-8")
+    return path
+
+
+def test_manifests_load_from_json_and_jsonl(tmp_path):
+    shots = tmp_path / "shots"
+    listed = [{"ios": "ios/a.png", "android": "android/a.png", "name": "card a",
+               "threshold": 0.3},
+              ["ios/b.png", str(tmp_path / "elsewhere" / "b.png")]]
+    as_list = engine.load_manifest(write_json(shots.parent / "pairs.json", listed))
+    shots.mkdir()
+    as_jsonl = shots / "pairs.jsonl"
+    as_jsonl.write_text("\n".join(json.dumps(entry) for entry in listed) + "\n\n",
+                        encoding="utf-8")
+    as_object = engine.load_manifest(write_json(shots / "wrapped.json", {"pairs": listed}))
+
+    assert as_list[0] == {"ios": str(tmp_path / "ios/a.png"),
+                          "android": str(tmp_path / "android/a.png"),
+                          "name": "card a", "threshold": 0.3}
+    assert as_list[1] == {"ios": str(tmp_path / "ios/b.png"),
+                          "android": str(tmp_path / "elsewhere" / "b.png"), "name": "b"}
+    # Relative paths follow the manifest, not the cwd
+    assert engine.load_manifest(as_jsonl)[0]["ios"] == str(shots / "ios/a.png")
+    assert [p["name"] for p in as_object] == ["card a", "b"]
+
+
+def test_directories_pair_by_stem_or_relative_path(tmp_path):
+    for side, names in (("ios", ["a.png", "x/b.png", "only-ios.png"]),
+                        ("android", ["a.png", "y/b.png", "only-android.png"])):
+        for name in names:
+            (tmp_path / side / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / side / name).write_bytes(b"")
+
+    by_stem = engine.pair_directories(tmp_path / "ios", tmp_path / "android")
+    assert [(p["name"], Path(p["ios"]).relative_to(tmp_path),
+             Path(p["android"]).relative_to(tmp_path)) for p in by_stem] == [
+        ("a", Path("ios/a.png"), Path("android/a.png")),
+        ("b", Path("ios/x/b.png"), Path("android/y/b.png")),
+    ]
+    by_path = engine.pair_directories(tmp_path / "ios", tmp_path / "android", "path")
+    assert [p["name"] for p in by_path] == ["a.png"]
+
+
+def batch_pairs(tmp_path):
+    return [
+        {"name": "same", "ios": LIGHT, "android": LIGHT},
+        {"name": "theme", "ios": LIGHT, "android": DARK, "threshold": 0.0},
+        {"name": "missing", "ios": str(tmp_path / "nope.png"), "android": LIGHT},
+        {"name": "theme-loose", "ios": LIGHT, "android": DARK, "threshold": 1.0},
+    ]
+
+
+def test_batch_streams_results_then_summary(tmp_path):
+    if not Path(DARK).exists():
+        pytest.skip("baseline not present")
+    out = io.StringIO()
+    summary = engine.run_batch(batch_pairs(tmp_path), out=out)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert [line.get("name") for line in lines[:-1]] == ["same", "theme", "missing",
+                                                        "theme-loose"]
+    assert [line["status"] for line in lines[:-1]] == ["PASS", "MISMATCH", "ERROR", "PASS"]
+    assert lines[-1] == {"summary": summary}
+    assert (summary["total"], summary["pass"], summary["mismatch"], summary["error"]) == \
+        (4, 2, 1, 1)
+    assert summary["threshold"] == engine.DEFAULT_THRESHOLDS[engine.DEFAULT_METRIC]
+    assert summary["max_diff"]["name"] in ("theme", "theme-loose")
+    assert summary["mean_diff"] == pytest.approx(
+        sum(line["diff"] for line in lines[:-1] if line["status"] != "ERROR") / 3, abs=1e-4)
+
+
+def test_batch_exit_code_is_the_worst_status(tmp_path):
+    if not Path(DARK).exists():
+        pytest.skip("baseline not present")
+    pairs = batch_pairs(tmp_path)
+    script = Path(engine.__file__)
+    for expected, subset in ((0, [pairs[0], pairs[3]]), (1, pairs[:2]), (2, pairs)):
+        manifest = write_json(tmp_path / f"pairs-{expected}.json", subset)
+        proc = subprocess.run([sys.executable, str(script), "--manifest", str(manifest),
+                               "--no-cache"], capture_output=True, text=True, check=False)
+        assert proc.returncode == expected, proc.stderr
+        assert len(proc.stdout.splitlines()) == len(subset) + 1
+
+
+@pytest.mark.parametrize("max_in_flight", [None, 1])
+def test_parallel_results_keep_input_order(tmp_path, max_in_flight):
+    if not Path(DARK).exists():
+        pytest.skip("baseline not present")
+    pairs = batch_pairs(tmp_path) * 2
+    pairs = [dict(pair, name=f"{i}-{pair['name']}") for i, pair in enumerate(pairs)]
+    serial = list(engine.iter_results(pairs))
+    parallel = list(engine.iter_results(pairs, workers=2, max_in_flight=max_in_flight))
+    assert [r["name"] for r in parallel] == [p["name"] for p in pairs]
+    assert parallel == serial
+
+
+def test_a_failed_worker_task_is_an_error_row(tmp_path):
+    if not Path(DARK).exists():
+        pytest.skip("baseline not present")
+    pairs = batch_pairs(tmp_path)[:2]
+    # Can't be sent to a worker process: the future fails, not compare_pair
+    broken = {"name": "broken", "ios": LIGHT, "android": DARK, "threshold": lambda: 0}
+    results = list(engine.iter_results([pairs[0], broken, pairs[1]], workers=2))
+    assert [r["name"] for r in results] == ["same", "broken", "theme"]
+    assert [r["status"] for r in results] == ["PASS", "ERROR", "MISMATCH"]
+    assert results[1]["error"].startswith("worker failed:")
@@ -0,0 +1,86 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+The comparison daemon must answer with exactly what compare-screenshots.py
+and pixel_diff.py compute in-process, and the client must fall back to the
+in-process path when no daemon is listening.
+"""
+
+import io
+import stat
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PIL.Image")
+
+import compare_client
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+IOS_BASELINES = REPO_ROOT / "ios/Tests/VisualTests/Snapshots/Baselines"
+LIGHT = str(IOS_BASELINES / "table_iPhone_15_Pro.png")
+DARK = str(IOS_BASELINES / "table_iPhone_15_Pro_Dark.png")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    engine = compare_client._engine()
+    # Unix socket paths are length-limited; keep it short
+    sock = Path("/tmp") / f"ac-test-{tmp_path.name[-20:]}.sock"
+    server = threading.Thread(target=engine.serve, args=(sock, None, 30),
+                              kwargs={"log": io.StringIO()}, daemon=True)
+    server.start()
+    for _ in range(100):
+        if sock.exists():
+            break
+        threading.Event().wait(0.05)
+    yield sock
+    compare_client.request({"op": "shutdown"}, sock)
+    server.join(10)
+    assert not sock.exists()
+
+
+def test_daemon_answers_match_in_process(daemon):
+    if not Path(LIGHT).exists():
+        pytest.skip("baseline not present")
+    compare = {"op": "compare", "ios": LIGHT, "android": DARK, "metric": "ssim"}
+    pixel = {"op": "pixel-diff", "before": LIGHT, "after": DARK, "tiles": True}
+
+    assert compare_client.request(compare, daemon) == compare_client.run_local(compare, cache=False)
+    assert compare_client.request(pixel, daemon) == compare_client.run_local(pixel, cache=False)
+    assert compare_client.request({"op": "ping"}, daemon)["requests"] == 2
+
+    bad = compare_client.request({"op": "compare", "ios": "/nonexistent.png", "android": DARK},
+                                 daemon)
+    assert bad["status"] == "ERROR"
+    assert "error" in compare_client.request({"op": "nope"}, daemon)
+    assert "JSON object" in compare_client.request([], daemon)["error"]
+    assert compare_client.request({"op": "ping"}, daemon)["ok"]
+
+
+def test_socket_is_owner_only(daemon):
+    assert stat.S_IMODE(daemon.stat().st_mode) == 0o600
+
+
+def test_client_falls_back_without_daemon(tmp_path):
+    if not Path(LIGHT).exists():
+        pytest.skip("baseline not present")
+    message = {"op": "pixel-diff", "before": LIGHT, "after": LIGHT}
+    with pytest.raises(compare_client.DaemonUnavailable):
+        compare_client.submit(message, tmp_path / "none.sock", fallback=False)
+    assert compare_client.submit(message, tmp_path / "none.sock", cache=False)["diff_percent"] == 0
+
+
+def test_threshold_defaults_to_the_metric():
+    if not Path(LIGHT).exists():
+        pytest.skip("baseline not present")
+    engine = compare_client._engine()
+    for metric, threshold in engine.DEFAULT_THRESHOLDS.items():
+        message = {"op": "compare", "ios": LIGHT, "android": DARK, "metric": metric}
+        result = compare_client.run_local(message, cache=False)
+        assert result["threshold"] == threshold
+        assert compare_client.run_local(dict(message, threshold=0.9), cache=False)["threshold"] == 0.9
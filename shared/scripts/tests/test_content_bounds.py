@@ -0,0 +1,93 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+content_bounds.py must strip status / nav bars whatever their height, and
+never cut card content that merely sits near an edge.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import content_bounds
+
+WHITE = (255, 255, 255)
+
+
+def frame(h=1200, w=600, colour=WHITE):
+    arr = np.empty((h, w, 3), dtype=np.uint8)
+    arr[:] = colour
+    return arr
+
+
+def card(arr, y0, y1, x0=40, x1=560):
+    arr[y0:y1, x0:x1] = (235, 235, 240)
+    arr[y0 + 20:y0 + 40, x0 + 20:x0 + 300] = (20, 20, 20)    # a line of "text"
+
+
+def test_page_coloured_status_bar_and_home_indicator():
+    arr = frame()
+    arr[20:44, 30:90] = 0        # clock
+    arr[22:40, 500:570] = 0      # signal / battery
+    arr[1182:1188, 240:360] = 0  # home indicator
+    card(arr, 200, 700)
+
+    assert content_bounds.content_bounds(arr, 0.07, 0.05) == (40, 200, 560, 700)
+
+
+def test_tinted_bars_of_any_height():
+    for status_h, nav_h in ((50, 100), (120, 160)):
+        arr = frame()
+        arr[:status_h] = (30, 90, 200)
+        arr[10:30, 20:60] = WHITE           # glyphs on the tinted bar
+        arr[-nav_h:] = 0
+        arr[-nav_h + 20:-20, 280:320] = WHITE
+        card(arr, 300, 600)
+
+        assert content_bounds.content_bounds(arr, 0.05, 0.12) == (40, 300, 560, 600)
+
+
+def test_card_content_near_the_edge_is_kept():
+    arr = frame(h=1000, w=562, colour=(48, 48, 48))
+    arr[5:25, 0:180] = (200, 200, 200)      # left-aligned card title in the top 5%
+    card(arr, 44, 300, 20, 540)
+
+    assert content_bounds.content_bounds(arr, 0.05, 0.12) == (0, 5, 540, 300)
+
+
+def test_status_bar_glyph_changes_keep_the_crop():
+    arr = frame()
+    arr[20:44, 30:90] = 0
+    arr[22:40, 500:570] = 0
+    card(arr, 200, 700)
+    assert content_bounds.content_bounds(arr, 0.07, 0.05)[1] == 200
+
+    # Different clock glyphs are still detected as chrome
+    arr[20:44, 30:90] = WHITE
+    arr[30:44, 30:120] = 0
+    assert content_bounds.content_bounds(arr, 0.07, 0.05)[1] == 200
+
+
+def test_result_does_not_depend_on_earlier_frames():
+    with_chrome = frame(h=1000, w=600)
+    with_chrome[20:44, 30:90] = 0
+    with_chrome[22:40, 500:570] = 0
+    card(with_chrome, 100, 700)
+
+    titled = frame(h=1000, w=600)
+    titled[5:30, 0:200] = (20, 20, 20)      # card title right at the top edge
+    card(titled, 100, 700)
+
+    fresh = content_bounds.content_bounds(titled, 0.07, 0.05)
+    assert fresh[1] == 5
+    # Same-size frame with a status bar first, then the titled card, and back
+    content_bounds.content_bounds(with_chrome, 0.07, 0.05)
+    assert content_bounds.content_bounds(titled, 0.07, 0.05) == fresh
+    assert content_bounds.content_bounds(with_chrome, 0.07, 0.05) == (40, 100, 560, 700)
+
+
+def test_no_solid_rows_falls_back_to_windows():
+    arr = np.tile(np.arange(600, dtype=np.uint8)[None, :, None], (1000, 1, 3))
+    assert content_bounds.content_bounds(arr, 0.07, 0.05) == (0, 70, 600, 950)
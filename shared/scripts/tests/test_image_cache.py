@@ -0,0 +1,98 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+image_cache.py must serve unchanged files from disk, recompute when a
+file's bytes change, evict least-recently-used entries past its size cap,
+and hash each screenshot only once per normalization.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import image_cache
+from image_cache import ImageCache
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+LIGHT = REPO_ROOT / "ios/Tests/VisualTests/Snapshots/Baselines/table_iPhone_15_Pro.png"
+FILE_DIGEST = image_cache.file_digest
+
+
+def counting(monkeypatch, module, calls):
+    def digest(path):
+        calls.append(Path(path))
+        return FILE_DIGEST(path)
+    monkeypatch.setattr(module, "file_digest", digest)
+
+
+def test_hit_after_miss_and_recompute_when_the_source_changes(tmp_path):
+    src = tmp_path / "shot.png"
+    src.write_bytes(b"first")
+    cache = ImageCache(tmp_path / "cache")
+    computed = []
+
+    def compute():
+        computed.append(src.read_bytes())
+        return np.frombuffer(src.read_bytes(), dtype=np.uint8)
+
+    assert bytes(cache.get_or_compute(src, ("p",), compute)) == b"first"
+    assert bytes(cache.get_or_compute(src, ("p",), compute)) == b"first"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    src.write_bytes(b"second")
+    assert bytes(cache.get_or_compute(src, ("p",), compute)) == b"second"
+    assert computed == [b"first", b"second"]
+    # Other parameters are a separate entry for the same bytes
+    cache.get_or_compute(src, ("q",), compute)
+    assert cache.misses == 3
+
+
+def test_evicts_least_recently_used_past_the_cap(tmp_path):
+    entry_bytes = 1000
+    cache = ImageCache(tmp_path, max_bytes=int(entry_bytes * 3.5))
+    for i, key in enumerate(["a0", "b0", "c0"]):
+        cache.put(key, np.zeros(entry_bytes, dtype=np.uint8))
+        os.utime(cache._entry(key), (1000 + i, 1000 + i))
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get("a0") is not None
+
+    cache.put("d0", np.zeros(entry_bytes, dtype=np.uint8))
+    assert cache.get("b0") is None
+    assert all(cache.get(key) is not None for key in ("a0", "c0", "d0"))
+    assert sum(p.stat().st_size for p in tmp_path.glob("*/*.npy")) <= cache.max_bytes
+
+
+def test_a_given_digest_is_not_recomputed(tmp_path, monkeypatch):
+    src = tmp_path / "shot.png"
+    src.write_bytes(b"pixels")
+    cache = ImageCache(tmp_path / "cache")
+    digest = image_cache.file_digest(src)
+    calls = []
+    counting(monkeypatch, image_cache, calls)
+    assert cache.key(src, ("p",), digest) == cache.key(src, ("p",))
+    assert len(calls) == 1
+    cache.get_or_compute(src, ("p",), lambda: np.zeros(3), digest)
+    assert len(calls) == 1
+
+
+def test_normalize_hashes_each_file_once(tmp_path, monkeypatch):
+    if not LIGHT.exists():
+        pytest.skip("baseline not present")
+    pytest.importorskip("PIL.Image")
+    import compare_client
+
+    engine = compare_client._engine()
+    cache = ImageCache(tmp_path)
+    calls = []
+    counting(monkeypatch, image_cache, calls)
+    counting(monkeypatch, engine, calls)
+    cold, _ = engine.normalize_screenshot(LIGHT, "ios", cache=cache)
+    warm, _ = engine.normalize_screenshot(LIGHT, "ios", cache=cache)
+    assert calls == [LIGHT, LIGHT]
+    assert np.array_equal(cold, warm)
+    assert cache.hits == 2
@@ -0,0 +1,76 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+impact_resolver.py is the one changed-file -> card resolver for both
+design-review-loop.sh and visual-diff-gate.sh: exact paths, directory
+prefixes on component boundaries, and globs.
+"""
+
+import json
+
+import impact_resolver
+
+MAP = {"file_patterns": {
+    "ios/Sources/Views/TableView.swift": {"test_cards": ["table"], "risk": "high"},
+    "ios/Sources/ACMarkdown/": {"test_cards": ["markdown"], "risk": "medium"},
+    "ios/SampleApp": {"test_cards": ["catalog"], "risk": "low"},
+    "android/**/charts/*Chart.kt": {"test_cards": ["charts"], "risk": "low"},
+    "ios/Sources/Views/Chart?View.swift": {"test_cards": ["chart-single"]},
+}}
+
+
+def resolver():
+    return impact_resolver.ImpactResolver(impact_resolver.compile_map(MAP))
+
+
+def test_pattern_forms():
+    r = resolver()
+    assert r.resolve(["ios/Sources/Views/TableView.swift"])["cards"] == ["table"]
+    assert r.resolve(["ios/Sources/ACMarkdown/Parser/Inline.swift"])["cards"] == ["markdown"]
+    # A plain path that names a directory covers what is below it ...
+    assert r.resolve(["ios/SampleApp/ContentView.swift"])["cards"] == ["catalog"]
+    # ... but prefixes only match whole path components
+    assert r.resolve(["ios/SampleAppTests/Foo.swift",
+                      "ios/Sources/Views/TableView.swift.orig"])["cards"] == []
+    assert r.resolve(["android/ac-charts/src/charts/BarChart.kt",
+                      "android/charts/PieChart.kt"])["cards"] == ["charts"]
+    assert r.resolve(["android/charts/nested/BarChart.kt"])["cards"] == []
+    assert r.resolve(["ios/Sources/Views/ChartXView.swift"])["cards"] == ["chart-single"]
+
+
+def test_resolve_reports_matches_and_risk():
+    result = resolver().resolve(["ios/Sources/ACMarkdown/A.swift", "README.md",
+                                 "ios/Sources/Views/TableView.swift", ""])
+    assert result["cards"] == ["markdown", "table"]
+    assert result["unmatched"] == ["README.md"]
+    assert result["risk"] == "high"
+    assert result["matches"]["ios/Sources/ACMarkdown/A.swift"] == ["ios/Sources/ACMarkdown/"]
+
+
+def test_compiled_map_is_cached_by_content(tmp_path, monkeypatch):
+    map_path = tmp_path / "impact-map.json"
+    map_path.write_text(json.dumps(MAP))
+    monkeypatch.setattr(impact_resolver, "_compiled", {})
+
+    first = impact_resolver.load_resolver(map_path, tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("impact-*.json"))) == 1
+    impact_resolver._compiled.clear()
+    # Served from the on-disk cache
+    again = impact_resolver.load_resolver(map_path, tmp_path / "cache")
+    assert again.patterns == first.patterns
+
+    # An edited map gets a new compiled entry
+    map_path.write_text(json.dumps({"file_patterns": {"a/": {"test_cards": ["x"]}}}))
+    edited = impact_resolver.load_resolver(map_path, tmp_path / "cache")
+    assert edited.resolve(["a/b.swift"])["cards"] == ["x"]
+    assert len(list((tmp_path / "cache").glob("impact-*.json"))) == 2
+
+
+def test_committed_map_matches_exact_and_directory_entries():
+    r = impact_resolver.load_resolver()
+    patterns = json.loads(impact_resolver.DEFAULT_MAP.read_text())["file_patterns"]
+    for pattern, info in patterns.items():
+        path = pattern + "Some.swift" if pattern.endswith("/") else pattern
+        assert set(info["test_cards"]) <= set(r.resolve([path])["cards"]), pattern
@@ -0,0 +1,146 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+phash_index.py must give near-identical images nearby hashes, refresh its
+index incrementally, answer nearest-first queries and duplicate groups, and
+write a --remaining manifest that resolves from any directory.
+"""
+
+import argparse
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+import phash_index
+
+
+def blocks(seed, size=(120, 200)):
+    """A blocky random picture, upscaled so it survives resizing."""
+    small = np.random.default_rng(seed).integers(0, 256, (10, 6), dtype=np.uint8)
+    return Image.fromarray(small).resize(size, Image.NEAREST).convert("RGB")
+
+
+def save(img, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    img.save(path)
+    return path
+
+
+def test_hashes_tolerate_small_changes_only():
+    img = blocks(0)
+    p, d = phash_index.phash(img), phash_index.dhash(img)
+    assert 0 <= p < 2 ** 64 and 0 <= d < 2 ** 64
+
+    tinted = Image.fromarray(np.clip(np.asarray(img, dtype=np.int16) + 4, 0, 255).astype(np.uint8))
+    assert bin(p ^ phash_index.phash(tinted)).count("1") <= 4
+    assert bin(p ^ phash_index.phash(blocks(1))).count("1") > 16
+
+    hashes = np.array([p, phash_index.phash(blocks(1))], dtype=np.uint64)
+    assert phash_index.hamming(hashes, p).tolist() == [0, bin(p ^ int(hashes[1])).count("1")]
+
+
+def test_incremental_build_query_and_duplicates(tmp_path):
+    root = tmp_path / "baselines"
+    a = save(blocks(0), root / "a.png")
+    save(blocks(0), root / "nested" / "a-copy.png")
+    b = save(blocks(1), root / "b.png")
+
+    index = phash_index.PHashIndex()
+    assert index.update([root]) == (3, 0, 0)
+    index_path = tmp_path / "index.json"
+    index.save(index_path)
+
+    index = phash_index.PHashIndex.load(index_path)
+    assert index.update([root]) == (0, 3, 0)
+    save(blocks(2), b)
+    st = b.stat()
+    os.utime(b, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    (root / "nested" / "a-copy.png").unlink()
+    save(blocks(0), root / "a-copy.png")
+    assert index.update([root]) == (2, 1, 1)
+
+    hits = index.query(index.lookup(a), max_distance=64)
+    assert [dist for _, dist in hits][:2] == [0, 0]
+    assert {path for path, _ in hits[:2]} == {str(a), str(root / "a-copy.png")}
+    assert hits[2] == (str(b), bin(index.lookup(a) ^ index.lookup(b)).count("1"))
+    assert index.query(index.lookup(a), max_distance=64, limit=1) == hits[:1]
+
+    assert index.duplicates() == [sorted([str(a), str(root / "a-copy.png")])]
+
+
+def test_check_pairs_writes_resolved_remaining_manifest(tmp_path, monkeypatch, capsys):
+    shots = tmp_path / "run"
+    save(blocks(0), shots / "ios" / "same.png")
+    save(blocks(0), shots / "android" / "same.png")
+    save(blocks(0), shots / "ios" / "other.png")
+    save(blocks(1), shots / "android" / "other.png")
+    manifest = shots / "pairs.jsonl"
+    manifest.write_text(
+        json.dumps({"name": "same", "ios": "ios/same.png", "android": "android/same.png"}) + "\n"
+        + json.dumps(["ios/other.png", "android/other.png"]) + "\n"
+        + json.dumps({"ios": "ios/missing.png", "android": "android/same.png"}) + "\n")
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    args = argparse.Namespace(manifest=str(manifest), kind="phash", suspect_distance=8,
+                              remaining="todo.jsonl")
+    phash_index.cmd_check_pairs(phash_index.PHashIndex(), args)
+
+    lines = [json.loads(l) for l in capsys.readouterr().out.splitlines()]
+    assert [l.get("verdict") for l in lines[:3]] == ["identical", "suspect", "error"]
+    assert lines[3] == {"summary": {"identical": 1, "similar": 0, "suspect": 1, "error": 1}}
+
+    remaining = [json.loads(l) for l in (elsewhere / "todo.jsonl").read_text().splitlines()]
+    assert remaining[0] == {"ios": str(shots / "ios" / "other.png"),
+                            "android": str(shots / "android" / "other.png")}
+    assert remaining[1]["ios"] == str(shots / "ios" / "missing.png")
+    assert all(os.path.isabs(pair[k]) for pair in remaining for k in ("ios", "android"))
+
+
+def test_check_pairs_rehashes_files_changed_since_build(tmp_path, capsys):
+    ios = save(blocks(0), tmp_path / "ios" / "card.png")
+    android = save(blocks(0), tmp_path / "android" / "card.png")
+    index = phash_index.PHashIndex()
+    index.update([tmp_path])
+    assert index.lookup(android) == index.lookup(ios)
+
+    # A different card replaces the baseline after the build
+    save(blocks(1), android)
+    st = android.stat()
+    os.utime(android, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert index.lookup(android) is None
+
+    manifest = tmp_path / "pairs.jsonl"
+    manifest.write_text(json.dumps({"ios": str(ios), "android": str(android)}) + "\n")
+    args = argparse.Namespace(manifest=str(manifest), kind="phash", suspect_distance=64,
+                              remaining=str(tmp_path / "todo.jsonl"))
+    phash_index.cmd_check_pairs(index, args)
+    verdict = json.loads(capsys.readouterr().out.splitlines()[0])
+    assert verdict["verdict"] == "similar" and verdict["distance"] > 0
+    assert (tmp_path / "todo.jsonl").read_text().strip()
+
+
+def test_build_resolves_directories_against_the_cwd(tmp_path, monkeypatch):
+    save(blocks(0), tmp_path / "d" / "a.png")
+    (tmp_path / "empty").mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    def build(*dirs):
+        args = argparse.Namespace(dirs=list(dirs), pattern="*.png", workers=1,
+                                  index=tmp_path / "index.json")
+        index = phash_index.PHashIndex()
+        phash_index.cmd_build(index, args)
+        return index
+
+    assert list(build("d").entries) == [str(tmp_path / "d" / "a.png")]
+    for bad in ("missing", "empty"):
+        with pytest.raises(SystemExit) as exit_info:
+            build("d", bad)
+        assert exit_info.value.code == 2
@@ -0,0 +1,116 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Regression test: the vectorized pixel_diff must report exactly the same
+percentage as the per-pixel loop visual-diff-gate.sh used to generate.
+"""
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+import pixel_diff
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+IOS_BASELINES = REPO_ROOT / "ios/Tests/VisualTests/Snapshots/Baselines"
+LEGACY_BASELINES = REPO_ROOT / "shared/golden-baselines/legacy"
+
+PAIRS = [
+    # Identical image
+    (LEGACY_BASELINES / "parity-table.png", LEGACY_BASELINES / "parity-table.png"),
+    # Different heights — exercises the LANCZOS resize path
+    (LEGACY_BASELINES / "parity-actions.png", LEGACY_BASELINES / "parity-factset.png"),
+    (LEGACY_BASELINES / "parity-richtext.png", LEGACY_BASELINES / "parity-image-sizes.png"),
+    # Same card, light vs dark theme
+    (IOS_BASELINES / "table_iPhone_15_Pro.png", IOS_BASELINES / "table_iPhone_15_Pro_Dark.png"),
+    # Phone vs iPad width
+    (IOS_BASELINES / "table_iPhone_15_Pro.png", IOS_BASELINES / "table_iPad_Portrait.png"),
+]
+
+
+def reference_pixel_diff_percent(img1_path, img2_path):
+    """The original nested-loop implementation from visual-diff-gate.sh."""
+    img1 = Image.open(img1_path).convert('RGB')
+    img2 = Image.open(img2_path).convert('RGB')
+
+    if img1.size != img2.size:
+        img2 = img2.resize(img1.size, Image.LANCZOS)
+
+    pixels1 = img1.load()
+    pixels2 = img2.load()
+    w, h = img1.size
+    diff_count = 0
+    channel_threshold = 30
+
+    for y in range(h):
+        for x in range(w):
+            r1, g1, b1 = pixels1[x, y]
+            r2, g2, b2 = pixels2[x, y]
+            if (abs(r1 - r2) > channel_threshold or
+                abs(g1 - g2) > channel_threshold or
+                abs(b1 - b2) > channel_threshold):
+                diff_count += 1
+
+    return (diff_count / (w * h)) * 100
+
+
+@pytest.mark.parametrize("before,after", PAIRS, ids=lambda p: p.stem)
+def test_matches_reference_loop(before, after):
+    if not before.exists() or not after.exists():
+        pytest.skip("baseline not present")
+    assert pixel_diff.pixel_diff_percent(before, after) == reference_pixel_diff_percent(before, after)
+
+
+def test_mask_and_heatmap_shapes():
+    before = LEGACY_BASELINES / "parity-actions.png"
+    after = LEGACY_BASELINES / "parity-factset.png"
+    arr1, arr2 = pixel_diff.load_pair(before, after)
+    mask = pixel_diff.diff_mask(arr1, arr2)
+
+    assert mask.shape == arr1.shape[:2]
+    assert pixel_diff.mask_image(mask).size == (arr1.shape[1], arr1.shape[0])
+    heat = pixel_diff.heatmap_image(arr1, arr2)
+    assert heat.mode == "RGB" and heat.size == (arr1.shape[1], arr1.shape[0])
+
+
+def test_changed_regions_finds_thin_lines():
+    mask = np.zeros((200, 120), dtype=bool)
+    mask[50, 10:110] = True         # 1-px horizontal border
+    mask[150:160, 20:30] = True     # small block far away
+
+    boxes = pixel_diff.changed_regions(mask)
+
+    assert boxes == [(10, 50, 110, 51), (20, 150, 30, 160)]
+
+
+@pytest.mark.parametrize("tile", [pixel_diff.TILE_SIZE, 50])
+def test_tiled_diff_matches_full_frame(tmp_path, tile):
+    before = IOS_BASELINES / "table_iPhone_15_Pro.png"
+    if not before.exists():
+        pytest.skip("baseline not present")
+    arr = pixel_diff.decode(before).copy()
+    arr[100:103, 40:400] = 255 - arr[100:103, 40:400]   # thin changed band
+    arr[-5:, -5:] = 0                                   # clipped corner tile
+    after = tmp_path / "after.png"
+    Image.fromarray(arr).save(after)
+
+    cache = pixel_diff.ImageCache(tmp_path / "cache")
+    for _ in range(2):  # cold, then with the baseline's hashes cached
+        mask, changed, total, _, _ = pixel_diff.tiled_diff(before, after, tile=tile, cache=cache)
+        arr1, arr2 = pixel_diff.load_pair(before, after)
+        assert np.array_equal(mask, pixel_diff.diff_mask(arr1, arr2))
+        assert 0 < len(changed) < total
+    assert cache.hits == 1
+
+    # The cached hashes alone show nothing changed; the baseline isn't decoded
+    Image.fromarray(pixel_diff.decode(before)).save(after)
+    mask, changed, _, arr1, _ = pixel_diff.tiled_diff(before, after, tile=tile, cache=cache)
+    assert changed == [] and not mask.any() and arr1 is None
+
+    # Different sizes are left to the full-frame diff
+    assert pixel_diff.tiled_diff(before, IOS_BASELINES / "table_iPad_Portrait.png") is None
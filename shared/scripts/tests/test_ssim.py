@@ -0,0 +1,97 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+ssim.py must score identical images 1, degrade smoothly under small
+perturbations, agree with a per-window reference, and refuse images of
+different shapes.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import ssim
+
+
+def card_like(h=96, w=64, seed=0):
+    """A light page with a few dark 'text' bars and a grey panel."""
+    rng = np.random.default_rng(seed)
+    arr = np.full((h, w), 0.97)
+    arr[10:h - 10, 6:w - 6] = 0.9
+    for y in range(16, h - 16, 12):
+        arr[y:y + 4, 10:10 + int(rng.integers(20, w - 20))] = 0.1
+    return arr
+
+
+def test_identical_images_score_one():
+    a = card_like()
+    score, tiles = ssim.ssim(a, a.copy())
+    assert score == pytest.approx(1.0)
+    assert np.allclose(tiles, 1.0)
+    assert tiles.shape == (ssim.TILE_GRID[1], ssim.TILE_GRID[0])
+    assert ssim.ms_ssim(a, a.copy()) == pytest.approx(1.0)
+
+
+def test_rgb_input_matches_its_luma():
+    rgb = np.random.default_rng(1).random((40, 30, 3))
+    luma = ssim.to_luma(rgb)
+    assert ssim.ssim(rgb, rgb * 0.9)[0] == pytest.approx(ssim.ssim(luma, luma * 0.9)[0])
+
+
+def test_small_perturbations_stay_close_and_order_by_size():
+    a = card_like()
+    rng = np.random.default_rng(2)
+    noise = rng.standard_normal(a.shape)
+    scores = [ssim.ssim(a, np.clip(a + sigma * noise, 0, 1))[0] for sigma in (0.005, 0.02, 0.08)]
+    assert scores[0] > 0.95
+    assert scores[0] > scores[1] > scores[2]
+
+    shifted = np.roll(a, 1, axis=1)
+    assert 0.5 < ssim.ssim(a, shifted)[0] < 1.0
+    other = card_like(seed=7)[::-1]
+    assert ssim.ssim(a, other)[0] < ssim.ssim(a, shifted)[0]
+
+
+def test_box_filter_ssim_matches_per_window_reference():
+    rng = np.random.default_rng(3)
+    a, b = rng.random((12, 10)), rng.random((12, 10))
+    win = 7
+    c1, c2 = (ssim.K1 ** 2), (ssim.K2 ** 2)
+    expected = np.empty((12 - win + 1, 10 - win + 1))
+    for i in range(expected.shape[0]):
+        for j in range(expected.shape[1]):
+            x, y = a[i:i + win, j:j + win].ravel(), b[i:i + win, j:j + win].ravel()
+            mx, my = x.mean(), y.mean()
+            vx, vy = x.var(ddof=1), y.var(ddof=1)
+            cov = np.cov(x, y, ddof=1)[0, 1]
+            expected[i, j] = ((2 * mx * my + c1) * (2 * cov + c2)
+                              / ((mx * mx + my * my + c1) * (vx + vy + c2)))
+    # float32 arithmetic: agrees to ~1e-6
+    assert np.allclose(ssim.ssim_map(a, b, win), expected, atol=1e-5)
+
+
+def test_shape_mismatch_is_rejected():
+    a = card_like()
+    with pytest.raises(ValueError, match="shapes differ"):
+        ssim.ssim(a, a[:-1])
+    with pytest.raises(ValueError, match="shapes differ"):
+        ssim.ms_ssim(a, a[:, :-1])
+
+
+def test_strips_match_a_single_pass(monkeypatch):
+    rng = np.random.default_rng(4)
+    a = card_like(h=150)
+    b = np.clip(a + 0.05 * rng.standard_normal(a.shape), 0, 1)
+    stripped = ssim.ssim_map(a, b)
+    monkeypatch.setattr(ssim, "STRIP_ROWS", 10_000)
+    assert np.array_equal(stripped, ssim.ssim_map(a, b))
+    assert stripped.shape == (150 - ssim.WIN_SIZE + 1, 64 - ssim.WIN_SIZE + 1)
+
+
+def test_tile_scores_split_like_array_split():
+    score_map = np.random.default_rng(5).random((101, 37)).astype(np.float32)
+    expected = [[tile.mean() for tile in np.array_split(band, 4, axis=1)]
+                for band in np.array_split(score_map, 8, axis=0)]
+    assert np.allclose(ssim.tile_scores(score_map, (4, 8)), expected)
@@ -0,0 +1,96 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+compare-screenshots.py --profile: nested stage times add up to the pair's
+total, the profiled result scores the same as an unprofiled one, and a
+batch summarizes the stages and keeps only the slowest pairs' dumps.
+"""
+
+import io
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL.Image")
+
+import compare_client
+from stage_profile import StageHistogram, StageProfile
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+IOS_BASELINES = REPO_ROOT / "ios/Tests/VisualTests/Snapshots/Baselines"
+LIGHT = str(IOS_BASELINES / "table_iPhone_15_Pro.png")
+DARK = str(IOS_BASELINES / "table_iPhone_15_Pro_Dark.png")
+
+
+def test_nested_stages_are_exclusive():
+    profile = StageProfile()
+    with profile:
+        with profile.stage("outer"):
+            time.sleep(0.02)
+            with profile.stage("inner"):
+                buf = np.ones(1 << 20, dtype=np.uint8)
+                time.sleep(0.02)
+            del buf
+        profile.count("decoded_pixels", 10)
+    report = profile.report()
+    stages = report["stages"]
+    assert stages["outer"]["ms"] < 35 and stages["inner"]["ms"] >= 20
+    assert stages["outer"]["ms"] + stages["inner"]["ms"] <= report["total_ms"]
+    # The inner allocation counts towards both stages' peaks
+    assert stages["inner"]["peak_alloc_bytes"] >= 1 << 20
+    assert stages["outer"]["peak_alloc_bytes"] >= 1 << 20
+    assert report["decoded_pixels"] == 10
+    assert report["peak_alloc_bytes"] >= 1 << 20
+
+    histogram = StageHistogram(buckets_ms=(10, 30))
+    histogram.add(report)
+    summary = histogram.summary()
+    assert summary["stages"]["inner"]["histogram"] == [0, 1, 0]
+    assert summary["counters"] == {"decoded_pixels": 10}
+
+
+def test_total_peak_covers_earlier_stages():
+    profile = StageProfile()
+    with profile:
+        with profile.stage("big"):
+            buf = np.ones(50 << 20, dtype=np.uint8)
+            del buf
+        with profile.stage("small"):
+            buf = np.ones(8 << 10, dtype=np.uint8)
+            del buf
+    report = profile.report()
+    assert report["stages"]["big"]["peak_alloc_bytes"] >= 50 << 20
+    assert report["stages"]["small"]["peak_alloc_bytes"] < 1 << 20
+    assert report["peak_alloc_bytes"] >= 50 << 20
+
+
+def test_profiled_compare_matches_plain():
+    engine = compare_client._engine()
+    plain = engine.compute_diff(LIGHT, DARK)
+    profiled = engine.compute_diff(LIGHT, DARK, profile=StageProfile())
+    report = profiled.pop("profile")
+    assert profiled == plain
+    assert {"header", "decode", "crop", "resize", "tile_hash", "diff"} <= set(report["stages"])
+    assert report["stages"]["decode"]["calls"] == 2
+    assert report["decoded_pixels"] > report["resize_input_pixels"] > 0
+    assert sum(s["ms"] for s in report["stages"].values()) <= report["total_ms"]
+
+
+def test_batch_keeps_slowest_dumps(tmp_path):
+    engine = compare_client._engine()
+    pairs = [{"name": f"p{i}", "ios": LIGHT, "android": DARK if i % 2 else LIGHT}
+             for i in range(3)]
+    out = io.StringIO()
+    summary = engine.run_batch(pairs, out=out, profile_dir=tmp_path, profile_top=1)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()[:-1]]
+    assert all("profile" in r and "cprofile" not in r["profile"] for r in records)
+    profile = summary["profile"]
+    assert profile["stages"]["total"]["pairs"] == 3
+    assert len(profile["slowest"]) == 1
+    assert [p.name for p in tmp_path.glob("*.prof")] == [Path(profile["slowest"][0]["cprofile"]).name]
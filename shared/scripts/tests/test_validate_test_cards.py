@@ -0,0 +1,55 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+validate_test_cards.py must accept every committed test card and report
+the same problems the old per-file shell checks caught, whichever JSON
+backend or worker count is used.
+"""
+
+import json
+
+import pytest
+
+import validate_test_cards as vtc
+
+
+def write(root, name, content):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content if isinstance(content, str) else json.dumps(content))
+
+
+def test_committed_test_cards_are_valid():
+    results = vtc.validate_all(vtc.DEFAULT_CARDS_DIR)
+    summary = vtc.summarize(results)
+    assert summary["invalid"] == 0, [r for r in results if not r["valid"]]
+    assert summary["kinds"]["card"] > 0
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reports_invalid_files(tmp_path, workers):
+    write(tmp_path, "good.json", {"type": "AdaptiveCard", "version": "1.5",
+                                  "body": [{"type": "TextBlock", "text": "hi"}]})
+    write(tmp_path, "broken.json", '{"type": "AdaptiveCard",')
+    write(tmp_path, "no-version.json", {"type": "AdaptiveCard", "body": []})
+    write(tmp_path, "wrong-type.json", {"type": "Card", "version": "1.5"})
+    write(tmp_path, "untyped.json", {"type": "AdaptiveCard", "version": "1.5",
+                                     "body": [{"type": "Container", "items": [{"text": "x"}]}]})
+    write(tmp_path, "dupes.json", {"type": "AdaptiveCard", "version": "1.5", "body": [
+        {"type": "Input.Text", "id": "name"}, {"type": "Input.Text", "id": "name"}]})
+    write(tmp_path, "basic.data.json", {"name": "no card fields needed"})
+    write(tmp_path, "host-configs/light.json", {"spacing": {}})
+
+    results = {r["path"]: r for r in vtc.validate_all(tmp_path, workers=workers)}
+
+    assert [p for p, r in sorted(results.items()) if not r["valid"]] == [
+        "broken.json", "no-version.json", "untyped.json", "wrong-type.json"]
+    assert results["broken.json"]["errors"][0].startswith("invalid JSON")
+    assert results["untyped.json"]["errors"] == ["/body[0]/items[0]: element without a 'type'"]
+    assert results["dupes.json"]["valid"]
+    assert results["dupes.json"]["warnings"] == ["input id 'name' used 2 times"]
+    assert results["basic.data.json"]["kind"] == "template-data"
+    assert results["host-configs/light.json"]["kind"] == "host-config"
+    assert results["good.json"]["version"] == "1.5"
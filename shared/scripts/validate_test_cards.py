@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Author: Vikrant Singh (github.com/VikrantSingh01)
+# Licensed under the MIT License.
+
+"""
+Validate every shared test card JSON file in one process.
+
+Walks shared/test-cards/**/*.json, parses each file once and checks it
+according to what it is:
+  - Cards: valid JSON object, "type": "AdaptiveCard", a "<major>.<minor>"
+    "version", list-valued "body"/"actions", and a string "type" on every
+    element and action in body, items and actions lists. Duplicate input
+    ids are reported as warnings.
+  - Template data (*.data.json), host configs (host-configs/) and the
+    sample catalog (sample-catalog.json): valid JSON.
+
+validate-test-cards.sh is a wrapper around this script.
+
+Usage:
+    python3 validate_test_cards.py                          # shared/test-cards
+    python3 validate_test_cards.py path/to/cards --verbose  # list valid files too
+    python3 validate_test_cards.py --json report.json       # + machine-readable report
+    python3 validate_test_cards.py --json - --quiet         # JSON report on stdout only
+    python3 validate_test_cards.py --workers 0              # one process per CPU
+
+orjson is used for parsing when installed (--json-backend auto); the
+standard json module otherwise.
+
+Exit codes:
+    0 = all files valid (warnings allowed)
+    1 = at least one file invalid
+    2 = ERROR (directory not found, etc.)
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional fast parser
+    orjson = None
+
+DEFAULT_CARDS_DIR = Path(__file__).resolve().parent.parent / "test-cards"
+
+VERSION_RE = re.compile(r"^\d+\.\d+$")
+
+# List-valued properties whose members are typed elements or actions
+ELEMENT_LISTS = ("body", "items", "actions")
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+
+def classify(path: Path, root: Path) -> str:
+    """What kind of file a test-cards JSON file is: card, template-data, host-config or catalog."""
+    if path.name.endswith(".data.json"):
+        return "template-data"
+    if "host-configs" in path.relative_to(root).parts:
+        return "host-config"
+    if path.name == "sample-catalog.json":
+        return "catalog"
+    return "card"
+
+
+def parse_json(data: bytes, backend: str = "json"):
+    if backend == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def check_card(card) -> tuple[list[str], list[str]]:
+    """(errors, warnings) for a parsed Adaptive Card."""
+    if not isinstance(card, dict):
+        return [f"expected a JSON object, got {type(card).__name__}"], []
+    errors = []
+    warnings = []
+
+    card_type = card.get("type", "missing")
+    if card_type != "AdaptiveCard":
+        errors.append(f"missing or invalid 'type' field (expected 'AdaptiveCard', got {card_type!r})")
+    version = card.get("version")
+    if version is None:
+        errors.append("missing 'version' field")
+    elif not isinstance(version, str) or not VERSION_RE.match(version):
+        errors.append(f"malformed 'version' {version!r} (expected e.g. '1.5')")
+
+    for key in ("body", "actions"):
+        if key in card and not isinstance(card[key], list):
+            errors.append(f"'{key}' must be a list")
+
+    # Every element / action must say what it is; input ids must be unique
+    ids = {}
+    stack = [("", card)]
+    while stack:
+        where, node = stack.pop()
+        if isinstance(node, dict):
+            if "type" in node and not isinstance(node["type"], str):
+                errors.append(f"{where or 'card'}: 'type' must be a string")
+            # Templated ids ("${id}") are only distinct after expansion
+            if isinstance(node.get("type"), str) and node["type"].startswith("Input.") \
+                    and isinstance(node.get("id"), str) and "${" not in node["id"]:
+                ids.setdefault(node["id"], []).append(where)
+            for key, value in node.items():
+                if key in ELEMENT_LISTS and isinstance(value, list):
+                    for i, item in enumerate(value):
+                        if isinstance(item, dict) and not isinstance(item.get("type"), str):
+                            errors.append(f"{where}/{key}[{i}]: element without a 'type'")
+                stack.append((f"{where}/{key}", value))
+        elif isinstance(node, list):
+            stack.extend((f"{where}[{i}]", item) for i, item in enumerate(node))
+
+    for input_id, places in sorted(ids.items()):
+        if len(places) > 1:
+            warnings.append(f"input id {input_id!r} used {len(places)} times")
+    return errors, warnings
+
+
+def validate_file(path: str, root: str, backend: str = "json") -> dict:
+    """Read, parse and check one file. Picklable, for the process pool."""
+    file_path = Path(path)
+    kind = classify(file_path, Path(root))
+    result = {"path": file_path.relative_to(root).as_posix(), "kind": kind,
+              "valid": False, "version": None, "errors": [], "warnings": []}
+    try:
+        data = parse_json(file_path.read_bytes(), backend)
+    except OSError as e:
+        result["errors"].append(f"unreadable: {e.strerror}")
+        return result
+    except ValueError as e:
+        result["errors"].append(f"invalid JSON: {e}")
+        return result
+
+    if kind == "card":
+        result["errors"], result["warnings"] = check_card(data)
+        if isinstance(data, dict) and isinstance(data.get("version"), str):
+            result["version"] = data["version"]
+    elif kind == "host-config" and not isinstance(data, dict):
+        result["errors"].append("host config must be a JSON object")
+    result["valid"] = not result["errors"]
+    return result
+
+
+def find_files(root: Path) -> list[Path]:
+    return sorted(p for p in root.rglob("*.json") if p.is_file())
+
+
+def validate_all(root, workers: int = 1, backend: str = "json") -> list[dict]:
+    """Validate every JSON file under root; results are in path order."""
+    root = Path(root)
+    paths = [str(p) for p in find_files(root)]
+    if workers <= 1 or len(paths) < 2:
+        return [validate_file(p, str(root), backend) for p in paths]
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(validate_file, paths, [str(root)] * len(paths),
+                             [backend] * len(paths), chunksize=chunksize))
+
+
+def summarize(results: list[dict]) -> dict:
+    kinds = {}
+    for r in results:
+        kinds[r["kind"]] = kinds.get(r["kind"], 0) + 1
+    return {
+        "total": len(results),
+        "valid": sum(r["valid"] for r in results),
+        "invalid": sum(not r["valid"] for r in results),
+        "warnings": sum(len(r["warnings"]) for r in results),
+        "kinds": dict(sorted(kinds.items())),
+    }
+
+
+def print_report(results: list[dict], summary: dict, verbose: bool = False):
+    for r in results:
+        if not r["valid"]:
+            print(f"❌ INVALID: {r['path']} — {'; '.join(r['errors'])}")
+        elif verbose:
+            version = f" (version: {r['version']})" if r["version"] else f" ({r['kind']})"
+            print(f"✅ VALID: {r['path']}{version}")
+        for warning in r["warnings"]:
+            print(f"⚠️  WARNING: {r['path']} — {warning}")
+
+    print("")
+    print("========================================")
+    print("Validation Summary")
+    print("========================================")
+    print(f"Total files: {summary['total']} "
+          f"({', '.join(f'{n} {kind}' for kind, n in summary['kinds'].items())})")
+    print(f"Valid: {summary['valid']}")
+    print(f"Invalid: {summary['invalid']}")
+    if summary["warnings"]:
+        print(f"Warnings: {summary['warnings']}")
+    print("")
+    print("❌ Validation FAILED" if summary["invalid"] else "✅ All test cards are valid!")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Validate shared test card JSON files in a single process")
+    parser.add_argument("cards_dir", nargs="?", default=str(DEFAULT_CARDS_DIR),
+                        help="Directory to walk (default: shared/test-cards)")
+    parser.add_argument("--json", dest="json_out", metavar="FILE",
+                        help="Write a machine-readable report to FILE ('-' for stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    parser.add_argument("--json-backend", choices=JSON_BACKENDS, default="auto",
+                        help="JSON parser (default: orjson if installed, else json)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List valid files too")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No text report")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    root = Path(args.cards_dir)
+    if not root.is_dir():
+        print(f"Error: test cards directory not found: {root}", file=sys.stderr)
+        sys.exit(2)
+
+    backend = args.json_backend
+    if backend == "auto":
+        backend = "orjson" if orjson is not None else "json"
+    elif backend == "orjson" and orjson is None:
+        print("Error: --json-backend orjson requires the orjson package", file=sys.stderr)
+        sys.exit(2)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    results = validate_all(root, workers, backend)
+    summary = summarize(results)
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        print(f"Validating test cards in: {root.resolve()}")
+        print("----------------------------------------")
+        print_report(results, summary, args.verbose)
+        print(f"({elapsed:.2f}s, {backend}, {workers} worker{'s' if workers != 1 else ''})")
+
+    if args.json_out:
+        report = {"root": str(root.resolve()), "backend": backend, "workers": workers,
+                  "elapsed_s": round(elapsed, 4), **summary, "files": results}
+        text = json.dumps(report, indent=2)
+        if args.json_out == "-":
+            print(text)
+        else:
+            Path(args.json_out).write_text(text + "\n", encoding="utf-8")
+
+    sys.exit(1 if summary["invalid"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -105,52 +105,12 @@ file_card_lookup() {
 }
 
 # =============================================================================
-# Python pixel-diff script (written to temp file)
+# Pixel-diff engine (vectorized, see pixel_diff.py), served by a warm
+# comparison daemon for the whole run (see compare_client.py)
 # =============================================================================
-PYTHON_DIFF_SCRIPT="$RESULTS_DIR/pixel_diff.py"
-
-write_python_script() {
-    cat <<'PYEOF' > "$PYTHON_DIFF_SCRIPT"
-#!/usr/bin/env python3
-"""Pixel diff between two screenshots. Prints diff percentage to stdout."""
-
-from PIL import Image
-import sys
-
-def pixel_diff_percent(img1_path, img2_path):
-    img1 = Image.open(img1_path).convert('RGB')
-    img2 = Image.open(img2_path).convert('RGB')
-
-    # Resize to same dimensions if different
-    if img1.size != img2.size:
-        img2 = img2.resize(img1.size, Image.LANCZOS)
-
-    pixels1 = img1.load()
-    pixels2 = img2.load()
-    w, h = img1.size
-    diff_count = 0
-    channel_threshold = 30  # per-channel tolerance for anti-aliasing
-
-    for y in range(h):
-        for x in range(w):
-            r1, g1, b1 = pixels1[x, y]
-            r2, g2, b2 = pixels2[x, y]
-            if (abs(r1 - r2) > channel_threshold or
-                abs(g1 - g2) > channel_threshold or
-                abs(b1 - b2) > channel_threshold):
-                diff_count += 1
-
-    return (diff_count / (w * h)) * 100
-
-if __name__ == '__main__':
-    if len(sys.argv) != 3:
-        print("Usage: pixel_diff.py <before.png> <after.png>", file=sys.stderr)
-        sys.exit(2)
-    pct = pixel_diff_percent(sys.argv[1], sys.argv[2])
-    print(f"{pct:.2f}")
-PYEOF
-    chmod +x "$PYTHON_DIFF_SCRIPT"
-}
+COMPARE_CLIENT="$SCRIPT_DIR/compare_client.py"
+COMPARE_SOCKET="${TMPDIR:-/tmp}/ac-visual-diff-gate-$$.sock"
+COMPARE_DAEMON_PID=""
 
 # =============================================================================
 # Helper functions
@@ -169,22 +129,9 @@ resolve_cards_from_impact_map() {
         return 1
     fi
 
-    # Extract card lists for each changed file from impact-map.json
-    while IFS= read -r file; do
-        local map_cards
-        map_cards=$(python3 -c "
-import json, sys
-with open('$impact_map') as f:
-    data = json.load(f)
-patterns = data.get('file_patterns', {})
-file_path = '$file'
-if file_path in patterns:
-    print(','.join(patterns[file_path].get('test_cards', [])))
-" 2>/dev/null || true)
-        if [[ -n "$map_cards" ]]; then
-            cards="${cards:+$cards,}$map_cards"
-        fi
-    done <<< "$changed_files"
+    # Resolve every changed file in one call (same resolver as design-review-loop.sh)
+    cards=$(printf '%s\n' "$changed_files" | \
+        python3 "$SCRIPT_DIR/impact_resolver.py" --map "$impact_map" --format csv - 2>/dev/null || true)
 
     if [[ -n "$cards" ]]; then
         echo "$cards"
@@ -272,9 +219,8 @@ needs_android() {
 log "Starting visual diff gate (threshold=${THRESHOLD}%, platform=${PLATFORM})"
 
 mkdir -p "$RESULTS_DIR/before/ios" "$RESULTS_DIR/before/android" \
-         "$RESULTS_DIR/after/ios" "$RESULTS_DIR/after/android"
-
-write_python_script
+         "$RESULTS_DIR/after/ios" "$RESULTS_DIR/after/android" \
+         "$RESULTS_DIR/diff/ios" "$RESULTS_DIR/diff/android"
 
 # ---- Step 1: Determine impacted cards ----
 if [[ -n "$EXPLICIT_CARDS" ]]; then
@@ -373,6 +319,12 @@ done
 log "Running pixel diff comparison..."
 echo ""
 
+# The client diffs in-process until (or if never) the daemon is listening
+python3 "$SCRIPT_DIR/compare-screenshots.py" serve --socket "$COMPARE_SOCKET" \
+    --idle-timeout 900 2>/dev/null &
+COMPARE_DAEMON_PID=$!
+trap 'kill "$COMPARE_DAEMON_PID" 2>/dev/null || true' EXIT
+
 # Report header
 REPORT_FILE="$RESULTS_DIR/report.txt"
 HEADER=$(printf "%-45s %-10s %-10s %s" "Card" "Platform" "Diff %" "Status")
@@ -406,7 +358,9 @@ compare_pair() {
     fi
 
     local diff_pct
-    diff_pct=$(python3 "$PYTHON_DIFF_SCRIPT" "$before_img" "$after_img" 2>/dev/null || echo "-1")
+    diff_pct=$(python3 "$COMPARE_CLIENT" --socket "$COMPARE_SOCKET" pixel-diff \
+        "$before_img" "$after_img" --tiles \
+        --heatmap "$RESULTS_DIR/diff/$plat/${safe_name}.png" 2>/dev/null || echo "-1")
 
     if [[ "$diff_pct" == "-1" ]]; then
         printf "%-45s %-10s %-10s %s\n" "$card" "$plat" "ERR" "ERROR" | tee -a "$REPORT_FILE"